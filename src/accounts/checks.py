@@ -0,0 +1,28 @@
+"""Vérifications de la configuration (``manage.py check``)."""
+from django.conf import settings
+from django.core.checks import Warning, register
+
+# caches propres à chaque processus
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register()
+def check_mail_cache(app_configs, **kwargs):
+    """Le jeton OAuth Gmail doit être dans un cache commun aux workers."""
+    if settings.EMAIL_BACKEND != "accounts.email_backends.GmailOAuth2Backend":
+        return []
+    alias = getattr(settings, "MAIL_CACHE_ALIAS", "default")
+    backend = settings.CACHES.get(alias, {}).get("BACKEND")
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [
+        Warning(
+            f"Le cache {alias!r} ({backend}) n'est pas partagé entre les processus : "
+            "chaque worker demandera son propre access token Gmail.",
+            hint="Utilise Redis ou Memcached (DJANGO_MAIL_CACHE_BACKEND, DJANGO_MAIL_CACHE_LOCATION).",
+            id="accounts.W001",
+        )
+    ]
@@ -1,10 +1,11 @@
-# pour la recherche de pays avec pycountry
-# il contient la base de données ISO de tous les pays du monde
-import gettext
-import pycountry
+# noms de pays pour la recherche et les formulaires
+# la table vient de accounts/country_data.py, généré depuis pycountry par
+# « manage.py build_country_data » : les workers ne chargent ni la base ISO
+# de pycountry ni son catalogue de traduction
+import functools
+from types import MappingProxyType
 
-# traduction française intégrée à pycountry
-french = gettext.translation('iso3166-1', pycountry.LOCALES_DIR, languages=['fr'])
+from .text import normalise
 
 # pays avec des abréviations connues
 EXTRA_ALIASES = {
@@ -14,48 +15,122 @@ EXTRA_ALIASES = {
 }
 
 
-def get_country_search_names(code):
-    code = code.upper()
-    names = [code.lower()]
-    
-    country = pycountry.countries.get(alpha_2=code)
-    if country:
+def load_from_pycountry():
+    """
+    Lit pycountry (base ISO + traduction française) : code -> noms
+    normalisés, et (code, nom français) triés par nom.
+    """
+    import gettext
+
+    import pycountry
+
+    # traduction française intégrée à pycountry
+    french = gettext.translation('iso3166-1', pycountry.LOCALES_DIR, languages=['fr'])
+
+    names = {}
+    choices = []
+    for country in pycountry.countries:
+        code = country.alpha_2
+        country_names = [code.lower()]
         # nom en anglais
-        names.append(country.name.lower())
+        country_names.append(country.name)
         # nom en français (traduction automatique)
         french_name = french.gettext(country.name)
         if french_name != country.name:
-            names.append(french_name.lower())
+            country_names.append(french_name)
         # nom courant si différent
         if hasattr(country, "common_name"):
-            names.append(country.common_name.lower())
+            country_names.append(country.common_name)
             french_common = french.gettext(country.common_name)
             if french_common != country.common_name:
-                names.append(french_common.lower())
+                country_names.append(french_common)
         if hasattr(country, "official_name"):
-            names.append(country.official_name.lower())
-    
-    if code in EXTRA_ALIASES:
-        names.extend(EXTRA_ALIASES[code])
-    
-    return names
+            country_names.append(country.official_name)
+        country_names.extend(EXTRA_ALIASES.get(code, ()))
+        # sans doublons, dans l'ordre
+        names[code] = tuple(dict.fromkeys(normalise(name) for name in country_names))
+
+        name = getattr(country, "common_name", None) or country.name
+        # traduit en français
+        choices.append((code, french.gettext(name)))
+
+    choices.sort(key=lambda x: x[1])
+    return dict(sorted(names.items())), tuple(choices)
+
+
+def _load():
+    try:
+        from . import country_data
+    except ImportError:
+        # module pas encore généré : lecture directe, plus lente
+        return load_from_pycountry()
+    return country_data.NAMES, country_data.CHOICES
+
+
+@functools.lru_cache(maxsize=1)
+def get_country_table():
+    """
+    Table figée des pays, construite une fois par processus :
+
+    - ``names`` : code -> noms normalisés (code, anglais, français, courant,
+      officiel, alias) ;
+    - ``by_name`` : nom -> codes ;
+    - ``by_token`` : mot d'un nom -> codes ;
+    - ``choices`` : (code, nom français) triés par nom.
+    """
+    names, choices = _load()
+
+    by_name = {}
+    by_token = {}
+    for code, country_names in names.items():
+        for name in country_names:
+            by_name.setdefault(name, set()).add(code)
+            for token in name.split():
+                by_token.setdefault(token, set()).add(code)
+
+    return MappingProxyType({
+        "names": MappingProxyType(dict(names)),
+        "by_name": MappingProxyType({name: frozenset(codes) for name, codes in by_name.items()}),
+        "by_token": MappingProxyType({token: frozenset(codes) for token, codes in by_token.items()}),
+        "choices": tuple(choices),
+        "labels": MappingProxyType(dict(choices)),
+    })
+
+
+def get_country_search_names(code):
+    code = code.upper()
+    names = get_country_table()["names"].get(code)
+    if names is None:
+        # code inconnu de la norme : seul le code lui-même est cherchable
+        names = (code.lower(), *(normalise(alias) for alias in EXTRA_ALIASES.get(code, ())))
+    return list(names)
+
+
+def get_country_name_index():
+    """
+    Retourne un dict nom de pays (normalisé) -> codes ISO alpha-2.
+    Calculé une seule fois, sert à reconnaître un pays dans un texte libre.
+    """
+    return get_country_table()["by_name"]
+
+
+def get_country_token_index():
+    """Mot d'un nom de pays (« arabes », « unis »...) -> codes ISO alpha-2."""
+    return get_country_table()["by_token"]
 
 
 def get_all_country_codes():
     """Retourne l'ensemble de tous les codes ISO alpha-2 valides (250+ pays)."""
-    return {country.alpha_2 for country in pycountry.countries}
+    return frozenset(get_country_table()["names"])
 
 
 def get_country_choices():
     """
-    Retourne une liste de tuples (code, nom en français) pour les formulaires.
+    Retourne un tuple trié de (code, nom en français) pour les formulaires.
     """
-    choices = []
-    for country in pycountry.countries:
-        name = getattr(country, "common_name", None) or country.name
-        # traduit en français
-        french_name = french.gettext(name)
-        choices.append((country.alpha_2, french_name))
-    
-    choices.sort(key=lambda x: x[1])
-    return choices
+    return get_country_table()["choices"]
+
+
+def get_country_label(code):
+    """Nom français d'un pays, ou le code lui-même s'il est inconnu."""
+    return get_country_table()["labels"].get(code, code)
@@ -0,0 +1,509 @@
+"""Table des pays générée par « manage.py build_country_data » : ne pas modifier.
+
+NAMES : code -> noms normalisés (code, anglais, français, courant, officiel,
+alias). CHOICES : (code, nom français) triés par nom.
+"""
+
+NAMES = {
+    'AD': ('ad', 'andorra', 'andorre', 'principality of andorra'),
+    'AE': ('ae', 'united arab emirates', 'emirats arabes unis', 'dubai', 'emirats'),
+    'AF': ('af', 'afghanistan', 'islamic republic of afghanistan'),
+    'AG': ('ag', 'antigua and barbuda', 'antigua-et-barbuda'),
+    'AI': ('ai', 'anguilla'),
+    'AL': ('al', 'albania', 'albanie', 'republic of albania'),
+    'AM': ('am', 'armenia', 'armenie', 'republic of armenia'),
+    'AO': ('ao', 'angola', 'republic of angola'),
+    'AQ': ('aq', 'antarctica', 'antarctique'),
+    'AR': ('ar', 'argentina', 'argentine', 'argentine republic'),
+    'AS': ('as', 'american samoa', 'samoa americaines'),
+    'AT': ('at', 'austria', 'autriche', 'republic of austria'),
+    'AU': ('au', 'australia', 'australie'),
+    'AW': ('aw', 'aruba'),
+    'AX': ('ax', 'aland islands', 'aland, iles'),
+    'AZ': ('az', 'azerbaijan', 'azerbaidjan', 'republic of azerbaijan'),
+    'BA': ('ba', 'bosnia and herzegovina', 'bosnie-herzegovine', 'republic of bosnia and herzegovina'),
+    'BB': ('bb', 'barbados', 'barbade'),
+    'BD': ('bd', 'bangladesh', "people's republic of bangladesh"),
+    'BE': ('be', 'belgium', 'belgique', 'kingdom of belgium'),
+    'BF': ('bf', 'burkina faso'),
+    'BG': ('bg', 'bulgaria', 'bulgarie', 'republic of bulgaria'),
+    'BH': ('bh', 'bahrain', 'bahrein', 'kingdom of bahrain'),
+    'BI': ('bi', 'burundi', 'republic of burundi'),
+    'BJ': ('bj', 'benin', 'republic of benin'),
+    'BL': ('bl', 'saint barthelemy', 'saint-barthelemy'),
+    'BM': ('bm', 'bermuda', 'bermudes'),
+    'BN': ('bn', 'brunei darussalam'),
+    'BO': ('bo', 'bolivia, plurinational state of', 'bolivie, etat plurinational de', 'bolivia', 'bolivie', 'plurinational state of bolivia'),
+    'BQ': ('bq', 'bonaire, sint eustatius and saba', 'bonaire, saint-eustache et saba'),
+    'BR': ('br', 'brazil', 'bresil', 'federative republic of brazil'),
+    'BS': ('bs', 'bahamas', 'commonwealth of the bahamas'),
+    'BT': ('bt', 'bhutan', 'bhoutan', 'kingdom of bhutan'),
+    'BV': ('bv', 'bouvet island', 'ile bouvet'),
+    'BW': ('bw', 'botswana', 'republic of botswana'),
+    'BY': ('by', 'belarus', 'republic of belarus'),
+    'BZ': ('bz', 'belize'),
+    'CA': ('ca', 'canada'),
+    'CC': ('cc', 'cocos (keeling) islands', 'cocos (keeling), iles'),
+    'CD': ('cd', 'congo, the democratic republic of the', 'republique democratique du congo'),
+    'CF': ('cf', 'central african republic', 'republique centrafricaine'),
+    'CG': ('cg', 'congo', 'republique du congo', 'republic of the congo'),
+    'CH': ('ch', 'switzerland', 'suisse', 'swiss confederation'),
+    'CI': ('ci', "cote d'ivoire", "republic of cote d'ivoire"),
+    'CK': ('ck', 'cook islands', 'iles cook'),
+    'CL': ('cl', 'chile', 'chili', 'republic of chile'),
+    'CM': ('cm', 'cameroon', 'cameroun', 'republic of cameroon'),
+    'CN': ('cn', 'china', 'chine', "people's republic of china"),
+    'CO': ('co', 'colombia', 'colombie', 'republic of colombia'),
+    'CR': ('cr', 'costa rica', 'republic of costa rica'),
+    'CU': ('cu', 'cuba', 'republic of cuba'),
+    'CV': ('cv', 'cabo verde', 'cap-vert', 'republic of cabo verde'),
+    'CW': ('cw', 'curacao'),
+    'CX': ('cx', 'christmas island', 'christmas, ile'),
+    'CY': ('cy', 'cyprus', 'chypre', 'republic of cyprus'),
+    'CZ': ('cz', 'czechia', 'tchequie', 'czech republic'),
+    'DE': ('de', 'germany', 'allemagne', 'federal republic of germany'),
+    'DJ': ('dj', 'djibouti', 'republic of djibouti'),
+    'DK': ('dk', 'denmark', 'danemark', 'kingdom of denmark'),
+    'DM': ('dm', 'dominica', 'dominique', 'commonwealth of dominica'),
+    'DO': ('do', 'dominican republic', 'republique dominicaine'),
+    'DZ': ('dz', 'algeria', 'algerie', "people's democratic republic of algeria"),
+    'EC': ('ec', 'ecuador', 'equateur', 'republic of ecuador'),
+    'EE': ('ee', 'estonia', 'estonie', 'republic of estonia'),
+    'EG': ('eg', 'egypt', 'egypte', 'arab republic of egypt'),
+    'EH': ('eh', 'western sahara', 'sahara occidental'),
+    'ER': ('er', 'eritrea', 'erythree', 'the state of eritrea'),
+    'ES': ('es', 'spain', 'espagne', 'kingdom of spain'),
+    'ET': ('et', 'ethiopia', 'ethiopie', 'federal democratic republic of ethiopia'),
+    'FI': ('fi', 'finland', 'finlande', 'republic of finland'),
+    'FJ': ('fj', 'fiji', 'fidji', 'republic of fiji'),
+    'FK': ('fk', 'falkland islands (malvinas)', 'malouines, iles (falkland)'),
+    'FM': ('fm', 'micronesia, federated states of', 'micronesie, etats federes de', 'federated states of micronesia'),
+    'FO': ('fo', 'faroe islands', 'iles feroe'),
+    'FR': ('fr', 'france', 'french republic'),
+    'GA': ('ga', 'gabon', 'gabonese republic'),
+    'GB': ('gb', 'united kingdom', 'royaume-uni', 'united kingdom of great britain and northern ireland', 'uk', 'angleterre'),
+    'GD': ('gd', 'grenada', 'grenade'),
+    'GE': ('ge', 'georgia', 'georgie'),
+    'GF': ('gf', 'french guiana', 'guyane francaise'),
+    'GG': ('gg', 'guernsey', 'guernesey'),
+    'GH': ('gh', 'ghana', 'republic of ghana'),
+    'GI': ('gi', 'gibraltar'),
+    'GL': ('gl', 'greenland', 'groenland'),
+    'GM': ('gm', 'gambia', 'gambie', 'republic of the gambia'),
+    'GN': ('gn', 'guinea', 'guinee', 'republic of guinea'),
+    'GP': ('gp', 'guadeloupe'),
+    'GQ': ('gq', 'equatorial guinea', 'guinee equatoriale', 'republic of equatorial guinea'),
+    'GR': ('gr', 'greece', 'grece', 'hellenic republic'),
+    'GS': ('gs', 'south georgia and the south sandwich islands', 'georgie du sud et les iles sandwich du sud'),
+    'GT': ('gt', 'guatemala', 'republic of guatemala'),
+    'GU': ('gu', 'guam'),
+    'GW': ('gw', 'guinea-bissau', 'guinee-bissau', 'republic of guinea-bissau'),
+    'GY': ('gy', 'guyana', 'republic of guyana'),
+    'HK': ('hk', 'hong kong', 'hong kong special administrative region of china'),
+    'HM': ('hm', 'heard island and mcdonald islands', 'iles heard-et-macdonald'),
+    'HN': ('hn', 'honduras', 'republic of honduras'),
+    'HR': ('hr', 'croatia', 'croatie', 'republic of croatia'),
+    'HT': ('ht', 'haiti', 'republic of haiti'),
+    'HU': ('hu', 'hungary', 'hongrie'),
+    'ID': ('id', 'indonesia', 'indonesie', 'republic of indonesia'),
+    'IE': ('ie', 'ireland', 'irlande'),
+    'IL': ('il', 'israel', 'state of israel'),
+    'IM': ('im', 'isle of man', 'ile de man'),
+    'IN': ('in', 'india', 'inde', 'republic of india'),
+    'IO': ('io', 'british indian ocean territory', "territoire britannique de l'ocean indien"),
+    'IQ': ('iq', 'iraq', 'irak', 'republic of iraq'),
+    'IR': ('ir', 'iran, islamic republic of', "iran, republique islamique d'", 'iran', 'islamic republic of iran'),
+    'IS': ('is', 'iceland', 'islande', 'republic of iceland'),
+    'IT': ('it', 'italy', 'italie', 'italian republic'),
+    'JE': ('je', 'jersey'),
+    'JM': ('jm', 'jamaica', 'jamaique'),
+    'JO': ('jo', 'jordan', 'jordanie', 'hashemite kingdom of jordan'),
+    'JP': ('jp', 'japan', 'japon'),
+    'KE': ('ke', 'kenya', 'republic of kenya'),
+    'KG': ('kg', 'kyrgyzstan', 'kirghizistan', 'kyrgyz republic'),
+    'KH': ('kh', 'cambodia', 'cambodge', 'kingdom of cambodia'),
+    'KI': ('ki', 'kiribati', 'republic of kiribati'),
+    'KM': ('km', 'comoros', 'comores', 'union of the comoros'),
+    'KN': ('kn', 'saint kitts and nevis', 'saint-christophe-et-nieves'),
+    'KP': ('kp', "korea, democratic people's republic of", 'coree, republique populaire democratique de', 'north korea', 'coree du nord', "democratic people's republic of korea"),
+    'KR': ('kr', 'korea, republic of', 'coree, republique de', 'south korea', 'coree du sud'),
+    'KW': ('kw', 'kuwait', 'koweit', 'state of kuwait'),
+    'KY': ('ky', 'cayman islands', 'iles caimans'),
+    'KZ': ('kz', 'kazakhstan', 'republic of kazakhstan'),
+    'LA': ('la', "lao people's democratic republic", 'lao, republique democratique populaire', 'laos'),
+    'LB': ('lb', 'lebanon', 'liban', 'lebanese republic'),
+    'LC': ('lc', 'saint lucia', 'sainte-lucie'),
+    'LI': ('li', 'liechtenstein', 'principality of liechtenstein'),
+    'LK': ('lk', 'sri lanka', 'democratic socialist republic of sri lanka'),
+    'LR': ('lr', 'liberia', 'republic of liberia'),
+    'LS': ('ls', 'lesotho', 'kingdom of lesotho'),
+    'LT': ('lt', 'lithuania', 'lituanie', 'republic of lithuania'),
+    'LU': ('lu', 'luxembourg', 'grand duchy of luxembourg'),
+    'LV': ('lv', 'latvia', 'lettonie', 'republic of latvia'),
+    'LY': ('ly', 'libya', 'libye'),
+    'MA': ('ma', 'morocco', 'maroc', 'kingdom of morocco'),
+    'MC': ('mc', 'monaco', 'principality of monaco'),
+    'MD': ('md', 'moldova, republic of', 'moldova, republique de', 'moldova', 'moldavie', 'republic of moldova'),
+    'ME': ('me', 'montenegro'),
+    'MF': ('mf', 'saint martin (french part)', 'saint-martin (partie francaise)'),
+    'MG': ('mg', 'madagascar', 'republic of madagascar'),
+    'MH': ('mh', 'marshall islands', 'iles marshall', 'republic of the marshall islands'),
+    'MK': ('mk', 'north macedonia', 'macedoine du nord', 'republic of north macedonia'),
+    'ML': ('ml', 'mali', 'republic of mali'),
+    'MM': ('mm', 'myanmar', 'birmanie', 'republic of myanmar'),
+    'MN': ('mn', 'mongolia', 'mongolie'),
+    'MO': ('mo', 'macao', 'macau', 'macao special administrative region of china'),
+    'MP': ('mp', 'northern mariana islands', 'iles mariannes du nord', 'commonwealth of the northern mariana islands'),
+    'MQ': ('mq', 'martinique'),
+    'MR': ('mr', 'mauritania', 'mauritanie', 'islamic republic of mauritania'),
+    'MS': ('ms', 'montserrat'),
+    'MT': ('mt', 'malta', 'malte', 'republic of malta'),
+    'MU': ('mu', 'mauritius', 'maurice', 'republic of mauritius'),
+    'MV': ('mv', 'maldives', 'republic of maldives'),
+    'MW': ('mw', 'malawi', 'republic of malawi'),
+    'MX': ('mx', 'mexico', 'mexique', 'united mexican states'),
+    'MY': ('my', 'malaysia', 'malaisie'),
+    'MZ': ('mz', 'mozambique', 'republic of mozambique'),
+    'NA': ('na', 'namibia', 'namibie', 'republic of namibia'),
+    'NC': ('nc', 'new caledonia', 'nouvelle-caledonie'),
+    'NE': ('ne', 'niger', 'republic of the niger'),
+    'NF': ('nf', 'norfolk island', 'ile norfolk'),
+    'NG': ('ng', 'nigeria', 'federal republic of nigeria'),
+    'NI': ('ni', 'nicaragua', 'republic of nicaragua'),
+    'NL': ('nl', 'netherlands', 'pays-bas', 'kingdom of the netherlands'),
+    'NO': ('no', 'norway', 'norvege', 'kingdom of norway'),
+    'NP': ('np', 'nepal', 'federal democratic republic of nepal'),
+    'NR': ('nr', 'nauru', 'republic of nauru'),
+    'NU': ('nu', 'niue', 'nioue'),
+    'NZ': ('nz', 'new zealand', 'nouvelle-zelande'),
+    'OM': ('om', 'oman', 'sultanate of oman'),
+    'PA': ('pa', 'panama', 'republic of panama'),
+    'PE': ('pe', 'peru', 'perou', 'republic of peru'),
+    'PF': ('pf', 'french polynesia', 'polynesie francaise'),
+    'PG': ('pg', 'papua new guinea', 'papouasie-nouvelle-guinee', 'independent state of papua new guinea'),
+    'PH': ('ph', 'philippines', 'republic of the philippines'),
+    'PK': ('pk', 'pakistan', 'islamic republic of pakistan'),
+    'PL': ('pl', 'poland', 'pologne', 'republic of poland'),
+    'PM': ('pm', 'saint pierre and miquelon', 'saint-pierre-et-miquelon'),
+    'PN': ('pn', 'pitcairn', 'iles pitcairn'),
+    'PR': ('pr', 'puerto rico', 'porto rico'),
+    'PS': ('ps', 'palestine, state of', 'palestine, etat de', 'the state of palestine'),
+    'PT': ('pt', 'portugal', 'portuguese republic'),
+    'PW': ('pw', 'palau', 'palaos', 'republic of palau'),
+    'PY': ('py', 'paraguay', 'republic of paraguay'),
+    'QA': ('qa', 'qatar', 'state of qatar'),
+    'RE': ('re', 'reunion', 'reunion, ile de la'),
+    'RO': ('ro', 'romania', 'roumanie'),
+    'RS': ('rs', 'serbia', 'serbie', 'republic of serbia'),
+    'RU': ('ru', 'russian federation', 'russie, federation de'),
+    'RW': ('rw', 'rwanda', 'rwandese republic'),
+    'SA': ('sa', 'saudi arabia', 'arabie saoudite', 'kingdom of saudi arabia'),
+    'SB': ('sb', 'solomon islands', 'salomon, iles'),
+    'SC': ('sc', 'seychelles', 'republic of seychelles'),
+    'SD': ('sd', 'sudan', 'soudan', 'republic of the sudan'),
+    'SE': ('se', 'sweden', 'suede', 'kingdom of sweden'),
+    'SG': ('sg', 'singapore', 'singapour', 'republic of singapore'),
+    'SH': ('sh', 'saint helena, ascension and tristan da cunha', 'sainte-helene, ascension et tristan da cunha'),
+    'SI': ('si', 'slovenia', 'slovenie', 'republic of slovenia'),
+    'SJ': ('sj', 'svalbard and jan mayen', 'svalbard et ile jan mayen'),
+    'SK': ('sk', 'slovakia', 'slovaquie', 'slovak republic'),
+    'SL': ('sl', 'sierra leone', 'republic of sierra leone'),
+    'SM': ('sm', 'san marino', 'saint-marin', 'republic of san marino'),
+    'SN': ('sn', 'senegal', 'republic of senegal'),
+    'SO': ('so', 'somalia', 'somalie', 'federal republic of somalia'),
+    'SR': ('sr', 'suriname', 'surinam', 'republic of suriname'),
+    'SS': ('ss', 'south sudan', 'soudan du sud', 'republic of south sudan'),
+    'ST': ('st', 'sao tome and principe', 'sao tome-et-principe', 'democratic republic of sao tome and principe'),
+    'SV': ('sv', 'el salvador', 'salvador', 'republic of el salvador'),
+    'SX': ('sx', 'sint maarten (dutch part)', 'saint-martin (partie neerlandaise)'),
+    'SY': ('sy', 'syrian arab republic', 'syrienne, republique arabe', 'syria', 'syrie'),
+    'SZ': ('sz', 'eswatini', 'kingdom of eswatini'),
+    'TC': ('tc', 'turks and caicos islands', 'iles turques-et-caiques'),
+    'TD': ('td', 'chad', 'tchad', 'republic of chad'),
+    'TF': ('tf', 'french southern territories', 'terres australes francaises'),
+    'TG': ('tg', 'togo', 'togolese republic'),
+    'TH': ('th', 'thailand', 'thailande', 'kingdom of thailand'),
+    'TJ': ('tj', 'tajikistan', 'tadjikistan', 'republic of tajikistan'),
+    'TK': ('tk', 'tokelau'),
+    'TL': ('tl', 'timor-leste', 'timor oriental', 'democratic republic of timor-leste'),
+    'TM': ('tm', 'turkmenistan'),
+    'TN': ('tn', 'tunisia', 'tunisie', 'republic of tunisia'),
+    'TO': ('to', 'tonga', 'kingdom of tonga'),
+    'TR': ('tr', 'turkiye', 'turquie', 'republic of turkiye'),
+    'TT': ('tt', 'trinidad and tobago', 'trinite-et-tobago', 'republic of trinidad and tobago'),
+    'TV': ('tv', 'tuvalu'),
+    'TW': ('tw', 'taiwan, province of china', 'taiwan, province de chine', 'taiwan'),
+    'TZ': ('tz', 'tanzania, united republic of', 'tanzanie, republique unie de', 'tanzania', 'tanzanie', 'united republic of tanzania'),
+    'UA': ('ua', 'ukraine'),
+    'UG': ('ug', 'uganda', 'ouganda', 'republic of uganda'),
+    'UM': ('um', 'united states minor outlying islands', 'iles mineures eloignees des etats-unis'),
+    'US': ('us', 'united states', 'etats-unis', 'united states of america', 'usa', 'amerique'),
+    'UY': ('uy', 'uruguay', 'eastern republic of uruguay'),
+    'UZ': ('uz', 'uzbekistan', 'ouzbekistan', 'republic of uzbekistan'),
+    'VA': ('va', 'holy see (vatican city state)', 'saint-siege (etat de la cite du vatican)'),
+    'VC': ('vc', 'saint vincent and the grenadines', 'saint-vincent-et-les-grenadines'),
+    'VE': ('ve', 'venezuela, bolivarian republic of', 'venezuela, republique bolivarienne du', 'venezuela', 'bolivarian republic of venezuela'),
+    'VG': ('vg', 'virgin islands, british', 'iles vierges britanniques', 'british virgin islands'),
+    'VI': ('vi', 'virgin islands, u.s.', 'iles vierges, etats-unis', 'virgin islands of the united states'),
+    'VN': ('vn', 'viet nam', 'vietnam', 'socialist republic of viet nam'),
+    'VU': ('vu', 'vanuatu', 'republic of vanuatu'),
+    'WF': ('wf', 'wallis and futuna', 'wallis et futuna'),
+    'WS': ('ws', 'samoa', 'independent state of samoa'),
+    'YE': ('ye', 'yemen', 'republic of yemen'),
+    'YT': ('yt', 'mayotte'),
+    'ZA': ('za', 'south africa', 'afrique du sud', 'republic of south africa'),
+    'ZM': ('zm', 'zambia', 'zambie', 'republic of zambia'),
+    'ZW': ('zw', 'zimbabwe', 'republic of zimbabwe'),
+}
+
+CHOICES = (
+    ('AF', 'Afghanistan'),
+    ('ZA', 'Afrique du Sud'),
+    ('AL', 'Albanie'),
+    ('DZ', 'Algérie'),
+    ('DE', 'Allemagne'),
+    ('AD', 'Andorre'),
+    ('AO', 'Angola'),
+    ('AI', 'Anguilla'),
+    ('AQ', 'Antarctique'),
+    ('AG', 'Antigua-et-Barbuda'),
+    ('SA', 'Arabie saoudite'),
+    ('AR', 'Argentine'),
+    ('AM', 'Arménie'),
+    ('AW', 'Aruba'),
+    ('AU', 'Australie'),
+    ('AT', 'Autriche'),
+    ('AZ', 'Azerbaïdjan'),
+    ('BS', 'Bahamas'),
+    ('BH', 'Bahreïn'),
+    ('BD', 'Bangladesh'),
+    ('BB', 'Barbade'),
+    ('BE', 'Belgique'),
+    ('BZ', 'Belize'),
+    ('BM', 'Bermudes'),
+    ('BT', 'Bhoutan'),
+    ('MM', 'Birmanie'),
+    ('BO', 'Bolivie'),
+    ('BQ', 'Bonaire, Saint-Eustache et Saba'),
+    ('BA', 'Bosnie-Herzégovine'),
+    ('BW', 'Botswana'),
+    ('BN', 'Brunéi Darussalam'),
+    ('BR', 'Brésil'),
+    ('BG', 'Bulgarie'),
+    ('BF', 'Burkina Faso'),
+    ('BI', 'Burundi'),
+    ('BY', 'Bélarus'),
+    ('BJ', 'Bénin'),
+    ('KH', 'Cambodge'),
+    ('CM', 'Cameroun'),
+    ('CA', 'Canada'),
+    ('CV', 'Cap-Vert'),
+    ('CL', 'Chili'),
+    ('CN', 'Chine'),
+    ('CX', 'Christmas, Île'),
+    ('CY', 'Chypre'),
+    ('CC', 'Cocos (Keeling), Îles'),
+    ('CO', 'Colombie'),
+    ('KM', 'Comores'),
+    ('KP', 'Corée du Nord'),
+    ('KR', 'Corée du Sud'),
+    ('CR', 'Costa Rica'),
+    ('HR', 'Croatie'),
+    ('CU', 'Cuba'),
+    ('CW', 'Curaçao'),
+    ('CI', "Côte d'Ivoire"),
+    ('DK', 'Danemark'),
+    ('DJ', 'Djibouti'),
+    ('DM', 'Dominique'),
+    ('ES', 'Espagne'),
+    ('EE', 'Estonie'),
+    ('SZ', 'Eswatini'),
+    ('FJ', 'Fidji'),
+    ('FI', 'Finlande'),
+    ('FR', 'France'),
+    ('GA', 'Gabon'),
+    ('GM', 'Gambie'),
+    ('GH', 'Ghana'),
+    ('GI', 'Gibraltar'),
+    ('GD', 'Grenade'),
+    ('GL', 'Groënland'),
+    ('GR', 'Grèce'),
+    ('GP', 'Guadeloupe'),
+    ('GU', 'Guam'),
+    ('GT', 'Guatemala'),
+    ('GG', 'Guernesey'),
+    ('GN', 'Guinée'),
+    ('GQ', 'Guinée Équatoriale'),
+    ('GW', 'Guinée-Bissau'),
+    ('GY', 'Guyana'),
+    ('GF', 'Guyane française'),
+    ('GE', 'Géorgie'),
+    ('GS', 'Géorgie du Sud et les îles Sandwich du Sud'),
+    ('HT', 'Haïti'),
+    ('HN', 'Honduras'),
+    ('HK', 'Hong Kong'),
+    ('HU', 'Hongrie'),
+    ('IN', 'Inde'),
+    ('ID', 'Indonésie'),
+    ('IQ', 'Irak'),
+    ('IR', 'Iran'),
+    ('IE', 'Irlande'),
+    ('IS', 'Islande'),
+    ('IL', 'Israël'),
+    ('IT', 'Italie'),
+    ('JM', 'Jamaïque'),
+    ('JP', 'Japon'),
+    ('JE', 'Jersey'),
+    ('JO', 'Jordanie'),
+    ('KZ', 'Kazakhstan'),
+    ('KE', 'Kenya'),
+    ('KG', 'Kirghizistan'),
+    ('KI', 'Kiribati'),
+    ('KW', 'Koweït'),
+    ('LA', 'Laos'),
+    ('LS', 'Lesotho'),
+    ('LV', 'Lettonie'),
+    ('LB', 'Liban'),
+    ('LY', 'Libye'),
+    ('LR', 'Libéria'),
+    ('LI', 'Liechtenstein'),
+    ('LT', 'Lituanie'),
+    ('LU', 'Luxembourg'),
+    ('MO', 'Macau'),
+    ('MK', 'Macédoine du Nord'),
+    ('MG', 'Madagascar'),
+    ('MY', 'Malaisie'),
+    ('MW', 'Malawi'),
+    ('MV', 'Maldives'),
+    ('ML', 'Mali'),
+    ('FK', 'Malouines, Îles (Falkland)'),
+    ('MT', 'Malte'),
+    ('MA', 'Maroc'),
+    ('MQ', 'Martinique'),
+    ('MU', 'Maurice'),
+    ('MR', 'Mauritanie'),
+    ('YT', 'Mayotte'),
+    ('MX', 'Mexique'),
+    ('FM', 'Micronésie, États fédérés de'),
+    ('MD', 'Moldavie'),
+    ('MC', 'Monaco'),
+    ('MN', 'Mongolie'),
+    ('MS', 'Montserrat'),
+    ('ME', 'Monténégro'),
+    ('MZ', 'Mozambique'),
+    ('NA', 'Namibie'),
+    ('NR', 'Nauru'),
+    ('NI', 'Nicaragua'),
+    ('NE', 'Niger'),
+    ('NG', 'Nigeria'),
+    ('NU', 'Nioue'),
+    ('NO', 'Norvège'),
+    ('NC', 'Nouvelle-Calédonie'),
+    ('NZ', 'Nouvelle-Zélande'),
+    ('NP', 'Népal'),
+    ('OM', 'Oman'),
+    ('UG', 'Ouganda'),
+    ('UZ', 'Ouzbékistan'),
+    ('PK', 'Pakistan'),
+    ('PW', 'Palaos'),
+    ('PS', 'Palestine, État de'),
+    ('PA', 'Panama'),
+    ('PG', 'Papouasie-Nouvelle-Guinée'),
+    ('PY', 'Paraguay'),
+    ('NL', 'Pays-Bas'),
+    ('PH', 'Philippines'),
+    ('PL', 'Pologne'),
+    ('PF', 'Polynésie française'),
+    ('PR', 'Porto Rico'),
+    ('PT', 'Portugal'),
+    ('PE', 'Pérou'),
+    ('QA', 'Qatar'),
+    ('RO', 'Roumanie'),
+    ('GB', 'Royaume-Uni'),
+    ('RU', 'Russie, Fédération de'),
+    ('RW', 'Rwanda'),
+    ('CF', 'République centrafricaine'),
+    ('DO', 'République dominicaine'),
+    ('CG', 'République du Congo'),
+    ('CD', 'République démocratique du Congo'),
+    ('RE', 'Réunion, Île de la'),
+    ('EH', 'Sahara occidental'),
+    ('BL', 'Saint-Barthélemy'),
+    ('KN', 'Saint-Christophe-et-Niévès'),
+    ('SM', 'Saint-Marin'),
+    ('MF', 'Saint-Martin (partie française)'),
+    ('SX', 'Saint-Martin (partie néerlandaise)'),
+    ('PM', 'Saint-Pierre-et-Miquelon'),
+    ('VA', 'Saint-Siège (état de la cité du Vatican)'),
+    ('VC', 'Saint-Vincent-et-les-Grenadines'),
+    ('SH', 'Sainte-Hélène, Ascension et Tristan da Cunha'),
+    ('LC', 'Sainte-Lucie'),
+    ('SB', 'Salomon, Îles'),
+    ('SV', 'Salvador'),
+    ('WS', 'Samoa'),
+    ('AS', 'Samoa américaines'),
+    ('ST', 'Sao Tomé-et-Principe'),
+    ('RS', 'Serbie'),
+    ('SC', 'Seychelles'),
+    ('SL', 'Sierra Leone'),
+    ('SG', 'Singapour'),
+    ('SK', 'Slovaquie'),
+    ('SI', 'Slovénie'),
+    ('SO', 'Somalie'),
+    ('SD', 'Soudan'),
+    ('SS', 'Soudan du Sud'),
+    ('LK', 'Sri Lanka'),
+    ('CH', 'Suisse'),
+    ('SR', 'Surinam'),
+    ('SE', 'Suède'),
+    ('SJ', 'Svalbard et île Jan Mayen'),
+    ('SY', 'Syrie'),
+    ('SN', 'Sénégal'),
+    ('TJ', 'Tadjikistan'),
+    ('TZ', 'Tanzanie'),
+    ('TW', 'Taïwan'),
+    ('TD', 'Tchad'),
+    ('CZ', 'Tchéquie'),
+    ('TF', 'Terres australes françaises'),
+    ('IO', "Territoire britannique de l'océan Indien"),
+    ('TH', 'Thaïlande'),
+    ('TL', 'Timor oriental'),
+    ('TG', 'Togo'),
+    ('TK', 'Tokelau'),
+    ('TO', 'Tonga'),
+    ('TT', 'Trinité-et-Tobago'),
+    ('TN', 'Tunisie'),
+    ('TM', 'Turkménistan'),
+    ('TR', 'Turquie'),
+    ('TV', 'Tuvalu'),
+    ('UA', 'Ukraine'),
+    ('UY', 'Uruguay'),
+    ('VU', 'Vanuatu'),
+    ('VN', 'Viêt Nam'),
+    ('VE', 'Vénézuela'),
+    ('WF', 'Wallis et Futuna'),
+    ('YE', 'Yémen'),
+    ('ZM', 'Zambie'),
+    ('ZW', 'Zimbabwe'),
+    ('AX', 'Åland, Îles'),
+    ('EG', 'Égypte'),
+    ('AE', 'Émirats arabes unis'),
+    ('EC', 'Équateur'),
+    ('ER', 'Érythrée'),
+    ('US', 'États-Unis'),
+    ('ET', 'Éthiopie'),
+    ('BV', 'Île Bouvet'),
+    ('NF', 'Île Norfolk'),
+    ('IM', 'Île de Man'),
+    ('KY', 'Îles Caïmans'),
+    ('CK', 'Îles Cook'),
+    ('FO', 'Îles Féroé'),
+    ('HM', 'Îles Heard-et-MacDonald'),
+    ('MP', 'Îles Mariannes du Nord'),
+    ('MH', 'Îles Marshall'),
+    ('PN', 'Îles Pitcairn'),
+    ('TC', 'Îles Turques-et-Caïques'),
+    ('VG', 'Îles Vierges britanniques'),
+    ('VI', 'Îles Vierges, États-Unis'),
+    ('UM', 'Îles mineures éloignées des États-Unis'),
+)
@@ -0,0 +1,188 @@
+"""Détection du format des fichiers CSV, commune à la prévisualisation et à l'import.
+
+``sniff(uploaded)`` parcourt le fichier, sans le garder en mémoire, pour
+calculer son empreinte (SHA-256) ; encodage, séparateur, en-tête et
+premières lignes sont déduits des ``PREFIX_SIZE`` premiers octets, puis les
+enregistrements CSV sont comptés (un champ entre guillemets peut contenir
+des retours à la ligne). Le résultat est mis en cache
+``CSV_SNIFF_CACHE_TIMEOUT`` secondes sous cette empreinte : l'import d'un
+fichier déjà prévisualisé reprend l'analyse faite par la prévisualisation.
+
+``iter_rows(uploaded, sniffed)`` relit ensuite le fichier en flux avec ce
+format ; comme pour la prévisualisation, l'en-tête est le premier
+enregistrement non vide. Les exports où chaque ligne est entourée de guillemets
+(``"email,nom"``) sont détectés (``wrapped``) et dépliés.
+"""
+import codecs
+import csv
+import hashlib
+import io
+
+from django.conf import settings
+from django.core.cache import caches
+
+PREFIX_SIZE = 64 * 1024
+PREVIEW_ROWS = 6
+# caractères improbables en cp1252 : fichier DOS (cp850) plutôt que Windows
+CP850_HINTS = ("\u201a", "\u2026", "\u2021")
+
+
+def get_cache():
+    return caches[getattr(settings, "CSV_SNIFF_CACHE_ALIAS", "default")]
+
+
+def detect_encoding(raw, complete=True):
+    """(encodage, texte) d'un début de fichier ; ne lève jamais d'erreur."""
+    candidates = ("utf-8-sig", "cp1252") if raw.startswith(codecs.BOM_UTF8) else ("utf-8", "cp1252")
+    for encoding in candidates:
+        try:
+            # final=False : un caractère coupé en fin de préfixe n'est pas une erreur
+            text = codecs.getincrementaldecoder(encoding)().decode(raw, final=complete)
+        except UnicodeDecodeError:
+            continue
+        if encoding == "cp1252" and any(hint in text for hint in CP850_HINTS):
+            return "cp850", raw.decode("cp850")
+        return encoding, text
+    return "latin-1", raw.decode("latin-1")
+
+
+def detect_delimiter(text):
+    first_line = text.splitlines()[0] if text else ""
+    delimiter = ","
+    if first_line:
+        semi = first_line.count(";")
+        comma = first_line.count(",")
+        tab = first_line.count("\t")
+        if semi > comma and semi > tab:
+            delimiter = ";"
+        elif tab > comma and tab > semi:
+            delimiter = "\t"
+    return delimiter
+
+
+def unwrap_row(row, delimiter):
+    """Déplie une ligne lue comme une seule cellule (``"a,b"``) en ses colonnes."""
+    if len(row) != 1:
+        return row
+    content = row[0]
+    if content.startswith('"') and content.endswith('"'):
+        content = content[1:-1]
+    return next(csv.reader([content], delimiter=delimiter), row)
+
+
+def is_wrapped(header, delimiter):
+    return len(header) == 1 and delimiter in header[0]
+
+
+def parse_rows(text, delimiter, limit=PREVIEW_ROWS):
+    """Premières lignes non vides de ``text`` (listes de cellules), BOM retiré."""
+    rows = []
+    if text:
+        reader = csv.reader(text.splitlines(), delimiter=delimiter)
+        try:
+            for i, row in enumerate(reader):
+                if i >= limit:
+                    break
+                if row:
+                    if i == 0 and row[0].startswith("\ufeff"):
+                        row[0] = row[0].replace("\ufeff", "")
+                    rows.append(row)
+        except csv.Error:
+            pass
+    return rows
+
+
+def _digest(uploaded):
+    """Empreinte du fichier, lu par morceaux."""
+    digest = hashlib.sha256()
+    for chunk in uploaded.chunks():
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _records(uploaded, encoding, delimiter):
+    """Enregistrements CSV non vides du fichier entier, lus en flux."""
+    uploaded.seek(0)
+    # errors="replace" : l'encodage vient du préfixe, un octet invalide plus
+    # loin donne un caractère de remplacement au lieu d'interrompre l'import
+    text = io.TextIOWrapper(uploaded.file, encoding=encoding, errors="replace", newline="")
+    try:
+        for row in csv.reader(text, delimiter=delimiter):
+            if row:
+                yield row
+    finally:
+        # rend le fichier sans le fermer
+        text.detach()
+
+
+def _count_records(uploaded, encoding, delimiter):
+    count = 0
+    try:
+        for _row in _records(uploaded, encoding, delimiter):
+            count += 1
+    except csv.Error:
+        # fichier illisible plus loin : l'import signalera l'erreur
+        pass
+    return count
+
+
+def sniff(uploaded):
+    """
+    Format d'un fichier téléversé, en cache par empreinte :
+
+    - ``encoding``, ``delimiter``, ``wrapped`` (lignes entre guillemets) ;
+    - ``header`` : noms de colonnes en minuscules, ``columns`` : nom -> indice ;
+    - ``rows`` : lignes de données non vides ;
+    - ``preview`` : premières lignes (en-tête compris) pour l'affichage.
+    """
+    digest = _digest(uploaded)
+    cache = get_cache()
+    key = f"csv:sniff:{digest}"
+    sniffed = cache.get(key)
+    if sniffed is not None:
+        return sniffed
+
+    uploaded.seek(0)
+    prefix = uploaded.read(PREFIX_SIZE)
+    uploaded.seek(0)
+    encoding, text = detect_encoding(prefix, complete=len(prefix) < PREFIX_SIZE)
+    delimiter = detect_delimiter(text)
+    preview = parse_rows(text, delimiter)
+    wrapped = bool(preview) and is_wrapped(preview[0], delimiter)
+    if wrapped:
+        preview = [unwrap_row(row, delimiter) for row in preview]
+    header = [name.strip().lower() for name in preview[0]] if preview else []
+    sniffed = {
+        "digest": digest,
+        "encoding": encoding,
+        "delimiter": delimiter,
+        "wrapped": wrapped,
+        "header": header,
+        "columns": {name: index for index, name in enumerate(header)},
+        "rows": max(_count_records(uploaded, encoding, delimiter) - 1, 0),
+        "preview": preview,
+    }
+    cache.set(key, sniffed, timeout=getattr(settings, "CSV_SNIFF_CACHE_TIMEOUT", 600))
+    return sniffed
+
+
+def iter_rows(uploaded, sniffed, chunk_size=1000):
+    """Lignes de données (dicts indexés par ``header``) par paquets de ``chunk_size``."""
+    delimiter = sniffed["delimiter"]
+    header = sniffed["header"]
+    records = _records(uploaded, sniffed["encoding"], delimiter)
+    try:
+        # en-tête : premier enregistrement non vide, comme dans ``parse_rows``
+        next(records, None)
+        chunk = []
+        for row in records:
+            if sniffed["wrapped"]:
+                row = unwrap_row(row, delimiter)
+            chunk.append(dict(zip(header, row)))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    finally:
+        records.close()
@@ -1,27 +1,207 @@
 import base64
+import smtplib
+import threading
+import time
+import zlib
 
 import requests
 from django.conf import settings
+from django.core.cache import caches
+from django.db import connection as db_connection
 from django.core.mail.backends.smtp import EmailBackend
 from django.core.mail.utils import DNS_NAME
 
 """Pour envoyer des mails avec gmail en oauth2
 On demande un access token à Google
 Puis on se connecte au server smtp.
+
+L'access token (valable environ une heure) est gardé dans le cache
+``MAIL_CACHE_ALIAS`` jusqu'à ``GMAIL_TOKEN_EXPIRY_MARGIN`` secondes avant
+son expiration : avec Redis ou Memcached, tous les workers partagent le même
+(voir le check ``accounts.W001``). Un verrou consultatif PostgreSQL fait
+qu'un seul processus le renouvelle à la fois, les autres attendent le
+nouveau jeton. Si XOAUTH2 refuse le jeton, il est renouvelé et
+l'authentification retentée.
+
+Les deux backends gardent leur connexion SMTP ouverte entre deux envois
+(une par thread) : elle est vérifiée par un NOOP avant d'être réutilisée,
+et refaite (connexion, STARTTLS, authentification) si le serveur l'a
+coupée ou si elle est restée inutilisée plus de
+``MAIL_CONNECTION_IDLE_TIMEOUT`` secondes. ``get_connection_stats()``
+compte les connexions ouvertes, réutilisées et abandonnées.
 """
-class GmailOAuth2Backend(EmailBackend):
+TOKEN_KEY = "gmail:access_token"
+# identifiant du verrou consultatif (pg_advisory_lock) du renouvellement
+REFRESH_LOCK_ID = zlib.crc32(TOKEN_KEY.encode())
+# attente maximale du jeton renouvelé par un autre processus
+LOCK_WAIT = 10
+
+
+_parked = threading.local()
+_stats_lock = threading.Lock()
+CONNECTION_STATS = {"opened": 0, "reused": 0, "dropped": 0}
+
+
+def _count(name):
+    with _stats_lock:
+        CONNECTION_STATS[name] += 1
+
+
+def get_connection_stats():
+    with _stats_lock:
+        return dict(CONNECTION_STATS)
+
+
+def close_parked_connections():
+    """Ferme les connexions gardées par le thread courant (fin d'un worker)."""
+    for connection, _parked_at in getattr(_parked, "connections", {}).values():
+        try:
+            connection.quit()
+        except (smtplib.SMTPException, OSError):
+            connection.close()
+    _parked.connections = {}
+
+
+def get_token_cache():
+    return caches[getattr(settings, "MAIL_CACHE_ALIAS", "default")]
+
+
+def _lock_refresh():
+    """Prend le verrou du renouvellement sans attendre ; False s'il est déjà pris."""
+    with db_connection.cursor() as cursor:
+        cursor.execute("SELECT pg_try_advisory_lock(%s)", [REFRESH_LOCK_ID])
+        return cursor.fetchone()[0]
+
+
+def _unlock_refresh():
+    with db_connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_unlock(%s)", [REFRESH_LOCK_ID])
+
+
+class PersistentSMTPBackend(EmailBackend):
+    """Backend SMTP qui garde sa connexion pour les envois suivants du même thread."""
+
+    # True quand open() a repris une connexion mise de côté
+    reused = False
+
+    def _key(self):
+        return (type(self), self.host, self.port, self.username)
+
+    def _slots(self):
+        if not hasattr(_parked, "connections"):
+            _parked.connections = {}
+        return _parked.connections
+
+    def _close_quietly(self, connection):
+        try:
+            self._close_connection(connection)
+        except Exception:
+            # connexion déjà coupée côté serveur
+            pass
+
+    def _take_parked(self):
+        parked = self._slots().pop(self._key(), None)
+        if parked is None:
+            return None
+        connection, parked_at = parked
+        if time.monotonic() - parked_at < getattr(settings, "MAIL_CONNECTION_IDLE_TIMEOUT", 60):
+            try:
+                if connection.noop()[0] == 250:
+                    return connection
+            except (smtplib.SMTPException, OSError):
+                pass
+        _count("dropped")
+        self._close_quietly(connection)
+        return None
+
+    def open(self):
+        if self.connection:
+            return False
+        connection = self._take_parked()
+        self.reused = connection is not None
+        if connection is not None:
+            self.connection = connection
+            _count("reused")
+            # True : send_messages appelle close(), qui la remet de côté
+            return True
+        opened = self.connect()
+        if opened:
+            _count("opened")
+        return opened
+
+    def connect(self):
+        return super().open()
+
+    def close(self):
+        """Remet la connexion de côté au lieu de la fermer."""
+        if self.connection is not None:
+            slots = self._slots()
+            previous = slots.get(self._key())
+            slots[self._key()] = (self.connection, time.monotonic())
+            self.connection = None
+            if previous is not None:
+                self._close_quietly(previous[0])
+        super().close()
+
+    def discard(self):
+        """Ferme vraiment la connexion."""
+        super().close()
+
+
+class GmailOAuth2Backend(PersistentSMTPBackend):
     token_url = "https://oauth2.googleapis.com/token"
 
-    def open(self) -> bool:
+    def connect(self) -> bool:
         #Connexion au serveur SMTP et login xoauth
-        if not super().open():
-            return False
+        opened = super().connect()
+        if not opened:
+            return opened
+
+        fqdn = DNS_NAME.get_fqdn()
+        self.connection.ehlo(fqdn)
 
         access_token = self._get_access_token()
-        self._login_with_token(access_token)
+        code, text = self._login_with_token(access_token)
+        if code != 235:
+            # jeton révoqué ou expiré plus tôt que prévu : on en redemande un
+            access_token = self._get_access_token(rejected=access_token)
+            code, text = self._login_with_token(access_token)
+        if code != 235:
+            self.discard()
+            raise RuntimeError(f"Google OAuth2: XOAUTH2 a échoué ({code} {text}).")
         return True
 
-    def _get_access_token(self) -> str:
+    def _get_access_token(self, rejected=None) -> str:
+        cache = get_token_cache()
+        token = cache.get(TOKEN_KEY)
+        if token and token != rejected:
+            return token
+
+        deadline = time.monotonic() + LOCK_WAIT
+        locked = _lock_refresh()
+        while not locked:
+            # un autre processus renouvelle le jeton
+            time.sleep(0.1)
+            token = cache.get(TOKEN_KEY)
+            if token and token != rejected:
+                return token
+            if time.monotonic() > deadline:
+                # renouvellement bloqué ailleurs : on renouvelle nous-mêmes
+                break
+            locked = _lock_refresh()
+        try:
+            token, expires_in = self._fetch_access_token()
+            timeout = expires_in - getattr(settings, "GMAIL_TOKEN_EXPIRY_MARGIN", 300)
+            if timeout > 0:
+                cache.set(TOKEN_KEY, token, timeout=timeout)
+            else:
+                cache.delete(TOKEN_KEY)
+        finally:
+            if locked:
+                _unlock_refresh()
+        return token
+
+    def _fetch_access_token(self):
         client_id = getattr(settings, "GMAIL_CLIENT_ID", "")
         client_secret = getattr(settings, "GMAIL_CLIENT_SECRET", "")
         refresh_token = getattr(settings, "GMAIL_REFRESH_TOKEN", "")
@@ -46,19 +226,17 @@ class GmailOAuth2Backend(EmailBackend):
         token = data.get("access_token")
         if not token:
             raise RuntimeError("Google OAuth2: la réponse ne contient pas d’access_token.")
-        return token
+        return token, int(data.get("expires_in", 3600))
 
-    def _login_with_token(self, token: str) -> None:
+    def _login_with_token(self, token: str):
         if not self.connection:
             raise RuntimeError("Google OAuth2: la connexion SMTP n’est pas ouverte.")
 
-        fqdn = DNS_NAME.get_fqdn()
-        self.connection.ehlo(fqdn)
-
         raw_auth = f"user={self.username}\x01auth=Bearer {token}\x01\x01"
         encoded_auth = base64.b64encode(raw_auth.encode("utf-8")).decode("utf-8")
 
         code, response = self.connection.docmd("AUTH", "XOAUTH2 " + encoded_auth)
-        if code != 235:
-            text = response.decode("utf-8", errors="ignore")
-            raise RuntimeError(f"Google OAuth2: XOAUTH2 a échoué ({code} {text}).")
+        if code == 334:
+            # Gmail détaille l'erreur puis attend une réponse vide avant le 535
+            code, response = self.connection.docmd("")
+        return code, response.decode("utf-8", errors="ignore")
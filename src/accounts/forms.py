@@ -1,5 +1,3 @@
-import csv
-import io
 import re
 
 from django import forms
@@ -7,6 +5,7 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import AuthenticationForm
 from django.core.validators import RegexValidator, validate_email
 
+from . import csv_sniff
 from .countries import get_country_search_names, get_all_country_codes
 
 User = get_user_model()
@@ -224,56 +223,51 @@ class TwoFactorForm(forms.Form):
 
 
 class InvitationUploadForm(forms.Form):
+    """
+    Import CSV lu en flux : le format (encodage, séparateur, en-tête) vient de
+    ``accounts.csv_sniff``, le même moteur que la prévisualisation, dont
+    l'analyse est reprise du cache si le fichier vient d'être prévisualisé.
+    ``iter_rows`` rend ensuite les lignes par paquets ; la mémoire utilisée
+    ne dépend pas de la taille du fichier (au-delà de 2,5 Mo, Django le garde
+    sur disque).
+    """
     csv_file = forms.FileField(label="Fichier CSV (UTF-8)")
 
-    MAX_ROWS = 500
+    MAX_SIZE = 20_000_000
+    MAX_ROWS = 50_000
+    CHUNK_ROWS = 1000
+    REQUIRED_COLUMNS = {
+        "email",
+        "prenom",
+        "nom",
+        "filiere_ou_parcours",
+        "niveau",
+        "annee_academique",
+    }
 
     def clean_csv_file(self):
         uploaded = self.cleaned_data["csv_file"]
         #on limite la taille pour pas faire planter le serveur
-        if uploaded.size > 1_000_000:
-            raise forms.ValidationError("Fichier trop volumineux (max 1 Mo).")
+        if uploaded.size > self.MAX_SIZE:
+            raise forms.ValidationError(f"Fichier trop volumineux (max {self.MAX_SIZE // 1_000_000} Mo).")
         if not uploaded.name.lower().endswith(".csv"):
             raise forms.ValidationError("Le fichier doit être au format .csv")
-        return uploaded
 
-    def read_rows(self):
-        file = self.cleaned_data["csv_file"]
-        raw = file.read()
-        text = None
-        for encoding in ("utf-8-sig", "utf-8", "cp1252", "latin-1", "cp437"):
-            try:
-                text = raw.decode(encoding)
-                break
-            except UnicodeDecodeError:
-                continue
-        if text is None:
-            raise forms.ValidationError("Encodage non supporté. Exportez le CSV en UTF-8.")
-        
-        first_line = text.split("\n")[0] if text else ""
-        delimiter = ";" if first_line.count(";") > first_line.count(",") else ","
-        
-        reader = csv.DictReader(io.StringIO(text), delimiter=delimiter)
-        fieldnames = [f.strip().lower() for f in (reader.fieldnames or [])]
-        reader.fieldnames = fieldnames
-        
-        required = {
-            "email",
-            "prenom",
-            "nom",
-            "filiere_ou_parcours",
-            "niveau",
-            "annee_academique",
-        }
-        missing = required - set(fieldnames)
+        self.sniffed = csv_sniff.sniff(uploaded)
+        missing = self.REQUIRED_COLUMNS - set(self.sniffed["columns"])
         if missing:
             raise forms.ValidationError(f"Colonnes manquantes : {', '.join(sorted(missing))}")
-        rows = list(reader)
-        if not rows:
+        if not self.sniffed["rows"]:
             raise forms.ValidationError("Le fichier est vide.")
-        if len(rows) > self.MAX_ROWS:
+        if self.sniffed["rows"] > self.MAX_ROWS:
             raise forms.ValidationError(f"Limité à {self.MAX_ROWS} lignes par import.")
-        return rows
+        return uploaded
+
+    def iter_rows(self, chunk_size=None):
+        """Lignes du fichier (dicts, colonnes en minuscules) par paquets de ``chunk_size``."""
+        return csv_sniff.iter_rows(
+            self.cleaned_data["csv_file"], self.sniffed, chunk_size or self.CHUNK_ROWS
+        )
 
 
 class InvitationAcceptForm(forms.Form):
@@ -0,0 +1,194 @@
+"""File de tâches en base pour les effets de bord lents (mails, fichiers).
+
+Les vues appellent ``enqueue(nom, **payload)`` et répondent tout de suite ;
+la ligne ``Job`` est écrite dans la transaction de la requête, donc une
+tâche n'existe que si la requête a abouti. ``manage.py run_worker`` réserve
+les tâches avec ``SELECT ... FOR UPDATE SKIP LOCKED`` : plusieurs workers,
+sur une ou plusieurs machines, se partagent la file sans exécuter deux fois
+la même tâche.
+
+Une tâche en échec est reprogrammée avec un délai exponentiel
+(``JOBS_BACKOFF_BASE`` x 2^(essai - 1), plafonné à ``JOBS_BACKOFF_MAX``),
+puis passe à l'état ``dead`` après ``max_attempts`` essais. Une tâche
+réservée par un worker disparu est remise en file après
+``JOBS_LOCK_TIMEOUT`` secondes. Les tâches finies ou abandonnées sont
+supprimées après ``JOBS_RETENTION_DAYS`` jours par ``run_worker`` ; une
+tâche déclarée avec ``clear_payload`` (mails) perd ses paramètres dès
+qu'elle réussit.
+
+Les fonctions exécutées sont déclarées avec ``@register("nom")`` dans les
+modules ``<app>/jobs.py``, chargés automatiquement. Avec ``JOBS_EAGER``
+(développement), ``enqueue`` exécute la tâche immédiatement. Une tâche qui
+lève ``Defer`` (quota de mails atteint...) est reprogrammée sans compter
+d'essai ; une tâche longue fait un lot par exécution et lève ``Defer(0)``
+pour repasser par la file, derrière les tâches plus prioritaires.
+"""
+import logging
+import os
+import socket
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# priorités de la file : les codes de connexion passent avant tout le reste
+PRIORITY_TRANSACTIONAL = 0
+PRIORITY_NOTICE = 50
+PRIORITY_BULK = 100
+
+HANDLERS = {}
+CLEARED_PAYLOADS = set()
+_discovered = False
+
+# colonnes écrites à la fin d'une exécution
+RESULT_FIELDS = ("status", "run_at", "attempts", "finished_at", "last_error", "locked_by", "payload")
+
+
+class Defer(Exception):
+    """À lever dans une tâche pour la relancer dans ``seconds`` secondes, sans échec."""
+
+    def __init__(self, seconds):
+        super().__init__(f"reportée de {seconds:.0f} s")
+        self.seconds = seconds
+
+
+def register(name, clear_payload=False):
+    """``clear_payload`` : les paramètres (code de connexion...) sont effacés une fois la tâche faite."""
+    def decorator(func):
+        HANDLERS[name] = func
+        if clear_payload:
+            CLEARED_PAYLOADS.add(name)
+        return func
+
+    return decorator
+
+
+def get_handler(name):
+    global _discovered
+    if not _discovered:
+        autodiscover_modules("jobs")
+        _discovered = True
+    return HANDLERS[name]
+
+
+def enqueue(name, priority=PRIORITY_BULK, run_at=None, max_attempts=None, **payload):
+    if getattr(settings, "JOBS_EAGER", False):
+        while True:
+            try:
+                get_handler(name)(**payload)
+                return None
+            except Defer as exc:
+                # Defer(0) : la suite de la tâche, exécutée tout de suite
+                if exc.seconds > 0:
+                    run_at = timezone.now() + timedelta(seconds=exc.seconds)
+                    break
+    return Job.objects.create(
+        name=name,
+        payload=payload,
+        priority=priority,
+        run_at=run_at or timezone.now(),
+        max_attempts=max_attempts or getattr(settings, "JOBS_MAX_ATTEMPTS", 5),
+    )
+
+
+def worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim(worker, limit=1):
+    """Réserve jusqu'à ``limit`` tâches prêtes ; les tâches déjà réservées sont sautées."""
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status=Job.Status.QUEUED, run_at__lte=now)
+            .order_by("priority", "run_at", "id")[:limit]
+        )
+        for job in jobs:
+            job.status = Job.Status.RUNNING
+            job.locked_by = worker
+            job.locked_at = now
+            job.attempts += 1
+        Job.objects.bulk_update(jobs, ["status", "locked_by", "locked_at", "attempts"])
+    return jobs
+
+
+def backoff(attempts):
+    base = getattr(settings, "JOBS_BACKOFF_BASE", 30)
+    return timedelta(seconds=min(base * 2 ** (attempts - 1), getattr(settings, "JOBS_BACKOFF_MAX", 3600)))
+
+
+def run(job):
+    try:
+        get_handler(job.name)(**job.payload)
+    except Defer as exc:
+        job.status = Job.Status.QUEUED
+        job.run_at = timezone.now() + timedelta(seconds=exc.seconds)
+        # pas un échec : l'essai n'est pas compté
+        job.attempts -= 1
+        logger.info("tâche %s reportée à %s", job, job.run_at)
+    except Exception:
+        job.last_error = traceback.format_exc()[-4000:]
+        if job.attempts >= job.max_attempts:
+            job.status = Job.Status.DEAD
+            job.finished_at = timezone.now()
+            logger.error("tâche %s abandonnée après %s essais", job, job.attempts)
+        else:
+            job.status = Job.Status.QUEUED
+            job.run_at = timezone.now() + backoff(job.attempts)
+            logger.warning("tâche %s en échec, nouvel essai à %s", job, job.run_at)
+    else:
+        job.status = Job.Status.DONE
+        job.finished_at = timezone.now()
+        job.last_error = ""
+        if job.name in CLEARED_PAYLOADS:
+            job.payload = {}
+    # la tâche a pu être rendue à la file (JOBS_LOCK_TIMEOUT) et reprise par un
+    # autre worker : seul le worker qui la détient encore enregistre le résultat
+    owner, job.locked_by = job.locked_by, ""
+    saved = Job.objects.filter(pk=job.pk, status=Job.Status.RUNNING, locked_by=owner).update(
+        **{name: getattr(job, name) for name in RESULT_FIELDS}
+    )
+    if not saved:
+        logger.warning("tâche %s reprise par un autre worker : résultat de %s ignoré", job, owner)
+    return job.status
+
+
+def requeue_stale():
+    """Remet en file les tâches d'un worker arrêté en pleine exécution."""
+    timeout = getattr(settings, "JOBS_LOCK_TIMEOUT", 600)
+    return Job.objects.filter(
+        status=Job.Status.RUNNING, locked_at__lt=timezone.now() - timedelta(seconds=timeout)
+    ).update(status=Job.Status.QUEUED, locked_by="")
+
+
+def purge_finished(days=None):
+    """Supprime les tâches finies ou abandonnées depuis plus de ``JOBS_RETENTION_DAYS`` jours."""
+    if days is None:
+        days = getattr(settings, "JOBS_RETENTION_DAYS", 7)
+    deleted, _counts = Job.objects.filter(
+        status__in=(Job.Status.DONE, Job.Status.DEAD),
+        finished_at__lt=timezone.now() - timedelta(days=days),
+    ).delete()
+    return deleted
+
+
+def run_pending(worker=None, limit=None):
+    """Exécute les tâches prêtes jusqu'à vider la file (ou ``limit`` tâches)."""
+    worker = worker or worker_id()
+    done = 0
+    while limit is None or done < limit:
+        jobs = claim(worker)
+        if not jobs:
+            break
+        for job in jobs:
+            run(job)
+            done += 1
+    return done
@@ -0,0 +1,42 @@
+"""Tâches différées du compte : mails et logos (voir accounts.jobqueue)."""
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.base import File
+from django.core.files.storage import default_storage
+from django.core.mail import send_mail as django_send_mail
+
+from . import mail_limiter
+from .jobqueue import Defer, register
+from .models import CompanyProfile, InstitutionProfile
+
+# le contenu du mail (code de connexion) n'est pas gardé en base une fois envoyé
+@register("send_mail", clear_payload=True)
+def send_mail(subject, message, recipient_list, from_email=None, transactional=False):
+    lane = mail_limiter.TRANSACTIONAL if transactional else mail_limiter.BULK
+    if not mail_limiter.acquire(lane=lane):
+        raise Defer(mail_limiter.retry_after(lane))
+    try:
+        django_send_mail(
+            subject,
+            message,
+            from_email or getattr(settings, "DEFAULT_FROM_EMAIL", None),
+            recipient_list,
+        )
+    except Exception:
+        # mail non parti : le jeton est rendu, l'erreur remonte et la tâche est retentée plus tard
+        mail_limiter.release(1, lane)
+        raise
+
+
+@register("attach_logo")
+def attach_logo(role, user_id, path):
+    """Déplace un logo téléversé à l'inscription vers le profil de l'organisation."""
+    profile_model = CompanyProfile if role == "company" else InstitutionProfile
+    profile = profile_model.objects.filter(user_id=user_id).first()
+    if profile is None or not default_storage.exists(path):
+        return
+    with default_storage.open(path, "rb") as logo_file:
+        profile.logo.save(Path(path).name.split("/")[-1], File(logo_file), save=False)
+    profile.save(update_fields=["logo"])
+    default_storage.delete(path)
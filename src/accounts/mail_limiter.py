@@ -0,0 +1,98 @@
+"""Quotas d'envoi de mails partagés par tous les workers.
+
+Un relais SMTP limite le nombre de mails par minute et par jour (Gmail :
+quelques milliers par jour). Chaque fenêtre (``MAIL_RATE_PER_MINUTE``,
+``MAIL_RATE_PER_DAY`` ; 0 = sans limite) est un seau de jetons rempli au
+début de la fenêtre : une ligne ``MailQuota`` en base, verrouillée
+(``select_for_update``) le temps de prendre les jetons de toutes les
+fenêtres, donc un seul budget pour tous les processus et tous les serveurs.
+Les lignes des fenêtres terminées sont supprimées par ``purge_expired``,
+appelé par ``manage.py run_worker`` avec la purge des tâches finies.
+
+Deux voies : ``TRANSACTIONAL`` (codes de connexion) peut utiliser tout le
+seau, ``BULK`` (invitations, notifications) s'arrête avant la part
+``MAIL_TRANSACTIONAL_RESERVE`` gardée pour les codes. Un envoi refusé lève
+``jobqueue.Defer`` dans les tâches : elles reprennent à la fenêtre suivante.
+"""
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+
+from .models import MailQuota
+
+TRANSACTIONAL = "transactional"
+BULK = "bulk"
+
+WINDOWS = (
+    ("minute", 60, "MAIL_RATE_PER_MINUTE"),
+    ("day", 86400, "MAIL_RATE_PER_DAY"),
+)
+
+
+def _windows(lane):
+    """(fenêtre courante, jetons utilisables, secondes avant la recharge, fin) par fenêtre limitée."""
+    now = time.time()
+    reserve = 0 if lane == TRANSACTIONAL else getattr(settings, "MAIL_TRANSACTIONAL_RESERVE", 0.2)
+    windows = []
+    for name, seconds, setting in WINDOWS:
+        limit = getattr(settings, setting, 0)
+        if not limit:
+            continue
+        allowed = limit - int(limit * reserve)
+        index = int(now // seconds)
+        windows.append((f"{name}:{index}", allowed, seconds - now % seconds, (index + 1) * seconds))
+    return windows
+
+
+def _at(timestamp):
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+
+def acquire(count=1, lane=BULK):
+    """Prend jusqu'à ``count`` jetons ; retourne le nombre accordé (0 si un seau est vide)."""
+    windows = _windows(lane)
+    if not windows or count <= 0:
+        return count
+    keys = [key for key, _allowed, _wait, _end in windows]
+    with transaction.atomic():
+        MailQuota.objects.bulk_create(
+            [MailQuota(window=key, expires_at=_at(end)) for key, _allowed, _wait, end in windows],
+            ignore_conflicts=True,
+        )
+        # verrous pris dans le même ordre par tous les workers
+        rows = MailQuota.objects.select_for_update().filter(window__in=keys).order_by("window")
+        used = {row.window: row.used for row in rows}
+        granted = max(min([count] + [allowed - used[key] for key, allowed, _wait, _end in windows]), 0)
+        if granted:
+            MailQuota.objects.filter(window__in=keys).update(used=F("used") + granted)
+    return granted
+
+
+def release(count, lane=BULK):
+    """Rend des jetons pris mais pas utilisés."""
+    if count <= 0:
+        return
+    keys = [key for key, _allowed, _wait, _end in _windows(lane)]
+    # une fenêtre déjà terminée n'a plus de ligne à mettre à jour
+    MailQuota.objects.filter(window__in=keys).update(used=Greatest(F("used") - count, 0))
+
+
+def retry_after(lane=BULK):
+    """Secondes avant que la voie ``lane`` ait de nouveau des jetons."""
+    windows = _windows(lane)
+    used = dict(
+        MailQuota.objects.filter(window__in=[key for key, _allowed, _wait, _end in windows])
+        .values_list("window", "used")
+    )
+    waits = [wait for key, allowed, wait, _end in windows if used.get(key, 0) >= allowed]
+    return max(waits, default=0)
+
+
+def purge_expired():
+    """Supprime les compteurs des fenêtres terminées."""
+    deleted, _counts = MailQuota.objects.filter(expires_at__lte=_at(time.time())).delete()
+    return deleted
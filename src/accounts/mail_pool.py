@@ -0,0 +1,172 @@
+"""Envoi de mails en masse sur un petit nombre de connexions SMTP.
+
+``send_mail`` ouvre et authentifie une connexion par message (TLS, jeton
+OAuth et AUTH avec Gmail). ``SMTPSenderPool`` garde au plus ``size``
+connexions ouvertes, une par thread, et envoie les messages par lots de
+``batch_size`` sur chacune :
+
+    with SMTPSenderPool() as pool:
+        report = pool.send(messages)
+
+Une connexion en erreur est fermée puis rouverte, et le message est
+retenté ``retries`` fois ; un message toujours en échec est signalé par son
+indice dans ``report["failed"]`` au lieu de lever une exception. Le rapport
+donne aussi le débit (``per_second``) et le nombre de connexions ouvertes.
+
+Avec un backend persistant (``accounts.email_backends``), la connexion est
+rendue au backend à la fin de chaque lot : le lot suivant la reprend après
+un NOOP, ou en ouvre une autre si elle est restée inutilisée plus de
+``MAIL_CONNECTION_IDLE_TIMEOUT`` secondes. ``close()`` ferme aussi les
+connexions SMTP et à la base ouvertes par les threads du pool.
+
+``worker_pool()`` garde un pool pour toutes les tâches d'un thread de
+``run_worker`` : les lots d'invitations successifs (``current_pool()``)
+réutilisent ses threads et ses connexions.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db import connections
+
+from .email_backends import close_parked_connections
+
+logger = logging.getLogger(__name__)
+# attente maximale des threads du pool à sa fermeture
+CLOSE_TIMEOUT = 30
+
+_current = threading.local()
+
+
+@contextmanager
+def worker_pool(**kwargs):
+    """Pool partagé par les tâches du thread courant, fermé à la sortie du bloc."""
+    with SMTPSenderPool(**kwargs) as pool:
+        _current.pool = pool
+        try:
+            yield pool
+        finally:
+            _current.pool = None
+
+
+def current_pool():
+    """Pool ouvert par ``worker_pool()`` dans ce thread, ou None."""
+    return getattr(_current, "pool", None)
+
+
+class SMTPSenderPool:
+    def __init__(self, size=None, batch_size=None, retries=None, backend=None):
+        self.size = size or getattr(settings, "MAIL_POOL_SIZE", 4)
+        self.batch_size = batch_size or getattr(settings, "MAIL_POOL_BATCH_SIZE", 20)
+        self.retries = getattr(settings, "MAIL_POOL_RETRIES", 2) if retries is None else retries
+        self.backend = backend
+        self.opened = 0
+        self.reconnects = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._connections = []
+        self._started = False
+        self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="smtp")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _get_connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = get_connection(self.backend, fail_silently=False)
+            connection.open()
+            with self._lock:
+                if not getattr(connection, "reused", False):
+                    self.opened += 1
+                self._connections.append(connection)
+            self._local.connection = connection
+        return connection
+
+    def _discard_connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            return
+        self._local.connection = None
+        with self._lock:
+            self.reconnects += 1
+            self._connections.remove(connection)
+        try:
+            # un backend persistant garderait la connexion en erreur pour plus tard
+            getattr(connection, "discard", connection.close)()
+        except Exception:
+            # connexion déjà coupée côté serveur
+            pass
+
+    def _send_one(self, message):
+        for attempt in range(self.retries + 1):
+            try:
+                return bool(self._get_connection().send_messages([message]))
+            except Exception as exc:
+                logger.warning("envoi à %s en échec (essai %s) : %s", message.to, attempt + 1, exc)
+                self._discard_connection()
+        return False
+
+    def _release_connection(self):
+        """Fin de lot : un backend persistant met sa connexion de côté pour le lot suivant."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None or not hasattr(connection, "discard"):
+            return
+        self._local.connection = None
+        with self._lock:
+            self._connections.remove(connection)
+        connection.close()
+
+    def _send_batch(self, start, batch):
+        try:
+            return [start + offset for offset, message in enumerate(batch) if not self._send_one(message)]
+        finally:
+            self._release_connection()
+
+    def _close_thread(self, barrier):
+        # la barrière retient chaque thread : un appel par thread du pool
+        barrier.wait(timeout=CLOSE_TIMEOUT)
+        close_parked_connections()
+        connections.close_all()
+
+    def send(self, messages):
+        """Envoie ``messages`` (EmailMessage) ; retourne le rapport de l'envoi."""
+        messages = list(messages)
+        self._started = self._started or bool(messages)
+        started = time.perf_counter()
+        opened, reconnects = self.opened, self.reconnects
+        futures = [
+            self._executor.submit(self._send_batch, start, messages[start:start + self.batch_size])
+            for start in range(0, len(messages), self.batch_size)
+        ]
+        failed = sorted(index for future in futures for index in future.result())
+        seconds = time.perf_counter() - started
+        sent = len(messages) - len(failed)
+        return {
+            "sent": sent,
+            "failed": failed,
+            "seconds": round(seconds, 3),
+            "per_second": round(sent / seconds, 1) if seconds else 0.0,
+            "connections_opened": self.opened - opened,
+            "reconnects": self.reconnects - reconnects,
+        }
+
+    def close(self):
+        if self._started:
+            barrier = threading.Barrier(self.size)
+            for _thread in range(self.size):
+                self._executor.submit(self._close_thread, barrier)
+        self._executor.shutdown(wait=True)
+        for connection in self._connections:
+            try:
+                getattr(connection, "discard", connection.close)()
+            except Exception:
+                pass
+        self._connections = []
@@ -0,0 +1,63 @@
+"""Mesure le débit d'envoi en masse (accounts.mail_pool) selon le nombre de connexions.
+
+À lancer contre un serveur SMTP local qui accepte tout, par exemple :
+
+    python -m aiosmtpd -n -l 127.0.0.1:1025
+    DJANGO_EMAIL_BACKEND=django.core.mail.backends.smtp.EmailBackend \\
+    DJANGO_EMAIL_HOST=127.0.0.1 DJANGO_EMAIL_PORT=1025 DJANGO_EMAIL_USE_TLS=False \\
+        python manage.py benchmark_mail --count 500 --connections 1,4,8
+
+``baseline`` envoie avec ``send_mail`` (une connexion par message) pour
+comparaison.
+"""
+import json
+import time
+
+from django.conf import settings
+from django.core.mail import EmailMessage, send_mail
+from django.core.management.base import BaseCommand
+
+from accounts.mail_pool import SMTPSenderPool
+
+
+class Command(BaseCommand):
+    help = "Compare le débit d'envoi de mails : une connexion par message puis pool de connexions."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=200)
+        parser.add_argument("--connections", default="1,4,8", help="tailles de pool, séparées par des virgules")
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument("--to", default="benchmark@mosifra.local")
+        parser.add_argument("--skip-baseline", action="store_true")
+        parser.add_argument("--output", help="fichier JSON ; sortie standard sinon")
+
+    def messages(self, count, to):
+        from_email = getattr(settings, "DEFAULT_FROM_EMAIL", None)
+        return [
+            EmailMessage(f"Benchmark {index}", "Message de test.", from_email, [to])
+            for index in range(count)
+        ]
+
+    def handle(self, *args, **options):
+        count = options["count"]
+        report = {"backend": settings.EMAIL_BACKEND, "count": count}
+
+        if not options["skip_baseline"]:
+            started = time.perf_counter()
+            for message in self.messages(count, options["to"]):
+                send_mail(message.subject, message.body, message.from_email, message.to)
+            seconds = time.perf_counter() - started
+            report["baseline"] = {"seconds": round(seconds, 3), "per_second": round(count / seconds, 1)}
+
+        for size in [int(size) for size in options["connections"].split(",")]:
+            with SMTPSenderPool(size=size, batch_size=options["batch_size"]) as pool:
+                result = pool.send(self.messages(count, options["to"]))
+            result["failed"] = len(result["failed"])
+            report[f"pool_{size}"] = result
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as handle:
+                handle.write(output)
+        else:
+            self.stdout.write(output)
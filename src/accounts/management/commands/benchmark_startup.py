@@ -0,0 +1,83 @@
+"""Mesure le démarrage d'un worker : temps d'import et mémoire (RSS).
+
+Chaque mesure tourne dans un processus neuf (Linux, RSS lu dans /proc) :
+django.setup() puis import de accounts.forms, qui construit la table des
+pays ; ``countries_*`` isole cette dernière étape. Deux variantes : la table
+générée (accounts/country_data.py) et la lecture directe de pycountry.
+"""
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+SOURCE_DIR = Path(__file__).resolve().parents[3]
+PROBE = """
+import json, os, sys, time
+sys.path.insert(0, {source_dir!r})
+
+def rss_kib():
+    # RSS courant (Linux) ; ru_maxrss survit à l'exec et reprendrait celui du parent
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+
+if {pycountry!r}:
+    sys.modules["accounts.country_data"] = None
+os.environ["DJANGO_SETTINGS_MODULE"] = {settings_module!r}
+started = time.perf_counter()
+import django
+django.setup()
+setup_done = time.perf_counter()
+rss_before = rss_kib()
+import accounts.forms
+print(json.dumps({{
+    "import_ms": (time.perf_counter() - started) * 1000,
+    "countries_ms": (time.perf_counter() - setup_done) * 1000,
+    "rss_kib": rss_kib(),
+    "countries_rss_kib": rss_kib() - rss_before,
+    "pycountry_loaded": "pycountry" in sys.modules,
+}}))
+"""
+
+
+class Command(BaseCommand):
+    help = "Compare le démarrage avec la table des pays générée et avec pycountry."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--output", help="fichier JSON ; sortie standard sinon")
+
+    def probe(self, pycountry):
+        code = PROBE.format(
+            source_dir=str(SOURCE_DIR),
+            pycountry=pycountry,
+            settings_module=settings.SETTINGS_MODULE,
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def handle(self, *args, **options):
+        report = {}
+        for name, pycountry in (("pycountry", True), ("generated", False)):
+            runs = [self.probe(pycountry) for _run in range(options["repeat"])]
+            report[name] = {
+                "import_ms": round(statistics.median(run["import_ms"] for run in runs), 1),
+                "countries_ms": round(statistics.median(run["countries_ms"] for run in runs), 1),
+                "rss_kib": statistics.median(run["rss_kib"] for run in runs),
+                "countries_rss_kib": statistics.median(run["countries_rss_kib"] for run in runs),
+                "pycountry_loaded": runs[0]["pycountry_loaded"],
+            }
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as handle:
+                handle.write(output + "\n")
+        else:
+            self.stdout.write(output)
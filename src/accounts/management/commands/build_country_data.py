@@ -0,0 +1,45 @@
+"""Génère accounts/country_data.py depuis pycountry.
+
+À relancer après une mise à jour de pycountry ou de EXTRA_ALIASES ;
+``--check`` échoue si le fichier n'est plus à jour (pour la CI).
+"""
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts import countries
+
+OUTPUT = Path(countries.__file__).with_name("country_data.py")
+HEADER = '''"""Table des pays générée par « manage.py build_country_data » : ne pas modifier.
+
+NAMES : code -> noms normalisés (code, anglais, français, courant, officiel,
+alias). CHOICES : (code, nom français) triés par nom.
+"""
+'''
+
+
+def render():
+    names, choices = countries.load_from_pycountry()
+    lines = [HEADER, "NAMES = {"]
+    lines += [f"    {code!r}: {country_names!r}," for code, country_names in names.items()]
+    lines += ["}", "", "CHOICES = ("]
+    lines += [f"    {choice!r}," for choice in choices]
+    lines += [")", ""]
+    return "\n".join(lines)
+
+
+class Command(BaseCommand):
+    help = "Génère la table compacte des pays utilisée à l'exécution."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--check", action="store_true", help="vérifie sans écrire")
+
+    def handle(self, *args, **options):
+        content = render()
+        if options["check"]:
+            if not OUTPUT.exists() or OUTPUT.read_text(encoding="utf-8") != content:
+                raise CommandError(f"{OUTPUT.name} n'est pas à jour : lancez build_country_data")
+            self.stdout.write(f"{OUTPUT.name} est à jour")
+            return
+        OUTPUT.write_text(content, encoding="utf-8")
+        self.stdout.write(f"{OUTPUT.name} : {content.count(chr(10))} lignes")
@@ -0,0 +1,88 @@
+"""Worker de la file de tâches (accounts.jobqueue).
+
+    python manage.py run_worker                  # JOBS_CONCURRENCY threads, en continu
+    python manage.py run_worker --concurrency 4
+    python manage.py run_worker --once           # vide la file puis s'arrête
+
+Plusieurs workers peuvent tourner sur des machines différentes. Le worker
+supprime aussi les tâches finies depuis plus de ``JOBS_RETENTION_DAYS`` jours
+et les compteurs de quotas de mails périmés, au démarrage puis toutes les
+heures.
+"""
+import signal
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from accounts import jobqueue, mail_limiter
+from accounts.email_backends import close_parked_connections
+from accounts.mail_pool import worker_pool
+
+PURGE_INTERVAL = 3600
+
+
+class Command(BaseCommand):
+    help = "Exécute les tâches différées (mails, invitations, logos)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=None)
+        parser.add_argument("--once", action="store_true", help="s'arrête quand la file est vide")
+        parser.add_argument("--sleep", type=float, default=None, help="attente quand la file est vide")
+
+    def handle(self, *args, **options):
+        concurrency = options["concurrency"] or getattr(settings, "JOBS_CONCURRENCY", 1)
+        sleep = options["sleep"] if options["sleep"] is not None else getattr(settings, "JOBS_POLL_INTERVAL", 2)
+        self.stop = threading.Event()
+        if not options["once"] and threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                signal.signal(signum, lambda *_args: self.stop.set())
+
+        jobqueue.requeue_stale()
+        self.purge()
+        counts = [0] * concurrency
+        if concurrency == 1:
+            self.loop(0, counts, options["once"], sleep)
+            close_parked_connections()
+        else:
+            threads = [
+                threading.Thread(target=self.thread_loop, args=(number, counts, options["once"], sleep))
+                for number in range(concurrency)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.stdout.write(f"{sum(counts)} tâche(s) exécutée(s)")
+
+    def purge(self):
+        jobqueue.purge_finished()
+        mail_limiter.purge_expired()
+
+    def thread_loop(self, *args):
+        try:
+            self.loop(*args)
+        finally:
+            # chaque thread a ses propres connexions à la base et au serveur SMTP
+            connections.close_all()
+            close_parked_connections()
+
+    def loop(self, number, counts, once, sleep):
+        worker = f"{jobqueue.worker_id()}:{number}"
+        purged_at = time.monotonic()
+        # un pool SMTP par thread, gardé d'une tâche à l'autre
+        with worker_pool():
+            while not self.stop.is_set():
+                done = jobqueue.run_pending(worker, limit=100)
+                counts[number] += done
+                if done:
+                    continue
+                if once:
+                    break
+                jobqueue.requeue_stale()
+                if number == 0 and time.monotonic() - purged_at >= PURGE_INTERVAL:
+                    self.purge()
+                    purged_at = time.monotonic()
+                self.stop.wait(sleep)
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:38
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import Value
+
+
+def fill_search_vectors(apps, schema_editor):
+    # une requête UPDATE par organisation, le nom est le seul champ joint
+    Offer = apps.get_model("accounts", "Offer")
+    CompanyProfile = apps.get_model("accounts", "CompanyProfile")
+    InstitutionProfile = apps.get_model("accounts", "InstitutionProfile")
+    names = dict(InstitutionProfile.objects.values_list("user_id", "organisation_name"))
+    names.update(CompanyProfile.objects.values_list("user_id", "organisation_name"))
+    for company_id in Offer.objects.values_list("company_id", flat=True).distinct():
+        Offer.objects.filter(company_id=company_id).update(
+            search_vector=(
+                SearchVector("title", weight="A", config="french")
+                + SearchVector("skills", "contract_type", weight="B", config="french")
+                + SearchVector(Value(names.get(company_id) or ""), weight="C", config="french")
+                + SearchVector("description", weight="D", config="french")
+            )
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_alter_offer_company'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offer',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='offer',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='offer_search_vector_gin'),
+        ),
+        migrations.RunPython(fill_search_vectors, migrations.RunPython.noop),
+    ]
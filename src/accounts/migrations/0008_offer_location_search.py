@@ -0,0 +1,301 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:38
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+from django.db.models import Value
+from django.db.models.functions import Concat, Lower
+
+# noms cherchables de chaque pays tels qu'à cette migration (pycountry en
+# minuscules + alias), sans le code qui est ajouté devant : copie figée pour
+# que les modifications de accounts.countries ne changent pas la migration
+COUNTRY_NAMES = {
+    'AD': 'andorra andorre principality of andorra',
+    'AE': 'united arab emirates émirats arabes unis dubai émirats',
+    'AF': 'afghanistan islamic republic of afghanistan',
+    'AG': 'antigua and barbuda antigua-et-barbuda',
+    'AI': 'anguilla',
+    'AL': 'albania albanie republic of albania',
+    'AM': 'armenia arménie republic of armenia',
+    'AO': 'angola republic of angola',
+    'AQ': 'antarctica antarctique',
+    'AR': 'argentina argentine argentine republic',
+    'AS': 'american samoa samoa américaines',
+    'AT': 'austria autriche republic of austria',
+    'AU': 'australia australie',
+    'AW': 'aruba',
+    'AX': 'åland islands åland, îles',
+    'AZ': 'azerbaijan azerbaïdjan republic of azerbaijan',
+    'BA': 'bosnia and herzegovina bosnie-herzégovine republic of bosnia and herzegovina',
+    'BB': 'barbados barbade',
+    'BD': "bangladesh people's republic of bangladesh",
+    'BE': 'belgium belgique kingdom of belgium',
+    'BF': 'burkina faso',
+    'BG': 'bulgaria bulgarie republic of bulgaria',
+    'BH': 'bahrain bahreïn kingdom of bahrain',
+    'BI': 'burundi republic of burundi',
+    'BJ': 'benin bénin republic of benin',
+    'BL': 'saint barthélemy saint-barthélemy',
+    'BM': 'bermuda bermudes',
+    'BN': 'brunei darussalam brunéi darussalam',
+    'BO': 'bolivia, plurinational state of bolivie, état plurinational de bolivia bolivie plurinational state of bolivia',
+    'BQ': 'bonaire, sint eustatius and saba bonaire, saint-eustache et saba bonaire, sint eustatius and saba',
+    'BR': 'brazil brésil federative republic of brazil',
+    'BS': 'bahamas commonwealth of the bahamas',
+    'BT': 'bhutan bhoutan kingdom of bhutan',
+    'BV': 'bouvet island île bouvet',
+    'BW': 'botswana republic of botswana',
+    'BY': 'belarus bélarus republic of belarus',
+    'BZ': 'belize',
+    'CA': 'canada',
+    'CC': 'cocos (keeling) islands cocos (keeling), îles',
+    'CD': 'congo, the democratic republic of the république démocratique du congo',
+    'CF': 'central african republic république centrafricaine',
+    'CG': 'congo république du congo republic of the congo',
+    'CH': 'switzerland suisse swiss confederation',
+    'CI': "côte d'ivoire republic of côte d'ivoire",
+    'CK': 'cook islands îles cook',
+    'CL': 'chile chili republic of chile',
+    'CM': 'cameroon cameroun republic of cameroon',
+    'CN': "china chine people's republic of china",
+    'CO': 'colombia colombie republic of colombia',
+    'CR': 'costa rica republic of costa rica',
+    'CU': 'cuba republic of cuba',
+    'CV': 'cabo verde cap-vert republic of cabo verde',
+    'CW': 'curaçao curaçao',
+    'CX': 'christmas island christmas, île',
+    'CY': 'cyprus chypre republic of cyprus',
+    'CZ': 'czechia tchéquie czech republic',
+    'DE': 'germany allemagne federal republic of germany',
+    'DJ': 'djibouti republic of djibouti',
+    'DK': 'denmark danemark kingdom of denmark',
+    'DM': 'dominica dominique commonwealth of dominica',
+    'DO': 'dominican republic république dominicaine',
+    'DZ': "algeria algérie people's democratic republic of algeria",
+    'EC': 'ecuador équateur republic of ecuador',
+    'EE': 'estonia estonie republic of estonia',
+    'EG': 'egypt égypte arab republic of egypt',
+    'EH': 'western sahara sahara occidental',
+    'ER': 'eritrea érythrée the state of eritrea',
+    'ES': 'spain espagne kingdom of spain',
+    'ET': 'ethiopia éthiopie federal democratic republic of ethiopia',
+    'FI': 'finland finlande republic of finland',
+    'FJ': 'fiji fidji republic of fiji',
+    'FK': 'falkland islands (malvinas) malouines, îles (falkland)',
+    'FM': 'micronesia, federated states of micronésie, états fédérés de federated states of micronesia',
+    'FO': 'faroe islands îles féroé',
+    'FR': 'france french republic',
+    'GA': 'gabon gabonese republic',
+    'GB': 'united kingdom royaume-uni united kingdom of great britain and northern ireland uk angleterre',
+    'GD': 'grenada grenade',
+    'GE': 'georgia géorgie',
+    'GF': 'french guiana guyane française',
+    'GG': 'guernsey guernesey',
+    'GH': 'ghana republic of ghana',
+    'GI': 'gibraltar',
+    'GL': 'greenland groënland',
+    'GM': 'gambia gambie republic of the gambia',
+    'GN': 'guinea guinée republic of guinea',
+    'GP': 'guadeloupe',
+    'GQ': 'equatorial guinea guinée équatoriale republic of equatorial guinea',
+    'GR': 'greece grèce hellenic republic',
+    'GS': 'south georgia and the south sandwich islands géorgie du sud et les îles sandwich du sud',
+    'GT': 'guatemala republic of guatemala',
+    'GU': 'guam',
+    'GW': 'guinea-bissau guinée-bissau republic of guinea-bissau',
+    'GY': 'guyana republic of guyana',
+    'HK': 'hong kong hong kong special administrative region of china',
+    'HM': 'heard island and mcdonald islands îles heard-et-macdonald',
+    'HN': 'honduras republic of honduras',
+    'HR': 'croatia croatie republic of croatia',
+    'HT': 'haiti haïti republic of haiti',
+    'HU': 'hungary hongrie hungary',
+    'ID': 'indonesia indonésie republic of indonesia',
+    'IE': 'ireland irlande',
+    'IL': 'israel israël state of israel',
+    'IM': 'isle of man île de man',
+    'IN': 'india inde republic of india',
+    'IO': "british indian ocean territory territoire britannique de l'océan indien",
+    'IQ': 'iraq irak republic of iraq',
+    'IR': "iran, islamic republic of iran, république islamique d' iran islamic republic of iran",
+    'IS': 'iceland islande republic of iceland',
+    'IT': 'italy italie italian republic',
+    'JE': 'jersey',
+    'JM': 'jamaica jamaïque',
+    'JO': 'jordan jordanie hashemite kingdom of jordan',
+    'JP': 'japan japon',
+    'KE': 'kenya republic of kenya',
+    'KG': 'kyrgyzstan kirghizistan kyrgyz republic',
+    'KH': 'cambodia cambodge kingdom of cambodia',
+    'KI': 'kiribati republic of kiribati',
+    'KM': 'comoros comores union of the comoros',
+    'KN': 'saint kitts and nevis saint-christophe-et-niévès',
+    'KP': "korea, democratic people's republic of corée, république populaire démocratique de north korea corée du nord democratic people's republic of korea",
+    'KR': 'korea, republic of corée, république de south korea corée du sud',
+    'KW': 'kuwait koweït state of kuwait',
+    'KY': 'cayman islands îles caïmans',
+    'KZ': 'kazakhstan republic of kazakhstan',
+    'LA': "lao people's democratic republic lao, république démocratique populaire laos",
+    'LB': 'lebanon liban lebanese republic',
+    'LC': 'saint lucia sainte-lucie',
+    'LI': 'liechtenstein principality of liechtenstein',
+    'LK': 'sri lanka democratic socialist republic of sri lanka',
+    'LR': 'liberia libéria republic of liberia',
+    'LS': 'lesotho kingdom of lesotho',
+    'LT': 'lithuania lituanie republic of lithuania',
+    'LU': 'luxembourg grand duchy of luxembourg',
+    'LV': 'latvia lettonie republic of latvia',
+    'LY': 'libya libye libya',
+    'MA': 'morocco maroc kingdom of morocco',
+    'MC': 'monaco principality of monaco',
+    'MD': 'moldova, republic of moldova, république de moldova moldavie republic of moldova',
+    'ME': 'montenegro monténégro montenegro',
+    'MF': 'saint martin (french part) saint-martin (partie française)',
+    'MG': 'madagascar republic of madagascar',
+    'MH': 'marshall islands îles marshall republic of the marshall islands',
+    'MK': 'north macedonia macédoine du nord republic of north macedonia',
+    'ML': 'mali republic of mali',
+    'MM': 'myanmar birmanie republic of myanmar',
+    'MN': 'mongolia mongolie',
+    'MO': 'macao macau macao special administrative region of china',
+    'MP': 'northern mariana islands îles mariannes du nord commonwealth of the northern mariana islands',
+    'MQ': 'martinique',
+    'MR': 'mauritania mauritanie islamic republic of mauritania',
+    'MS': 'montserrat',
+    'MT': 'malta malte republic of malta',
+    'MU': 'mauritius maurice republic of mauritius',
+    'MV': 'maldives republic of maldives',
+    'MW': 'malawi republic of malawi',
+    'MX': 'mexico mexique united mexican states',
+    'MY': 'malaysia malaisie',
+    'MZ': 'mozambique republic of mozambique',
+    'NA': 'namibia namibie republic of namibia',
+    'NC': 'new caledonia nouvelle-calédonie',
+    'NE': 'niger republic of the niger',
+    'NF': 'norfolk island île norfolk',
+    'NG': 'nigeria federal republic of nigeria',
+    'NI': 'nicaragua republic of nicaragua',
+    'NL': 'netherlands pays-bas kingdom of the netherlands',
+    'NO': 'norway norvège kingdom of norway',
+    'NP': 'nepal népal federal democratic republic of nepal',
+    'NR': 'nauru republic of nauru',
+    'NU': 'niue nioue niue',
+    'NZ': 'new zealand nouvelle-zélande',
+    'OM': 'oman sultanate of oman',
+    'PA': 'panama republic of panama',
+    'PE': 'peru pérou republic of peru',
+    'PF': 'french polynesia polynésie française',
+    'PG': 'papua new guinea papouasie-nouvelle-guinée independent state of papua new guinea',
+    'PH': 'philippines republic of the philippines',
+    'PK': 'pakistan islamic republic of pakistan',
+    'PL': 'poland pologne republic of poland',
+    'PM': 'saint pierre and miquelon saint-pierre-et-miquelon',
+    'PN': 'pitcairn îles pitcairn',
+    'PR': 'puerto rico porto rico',
+    'PS': 'palestine, state of palestine, état de the state of palestine',
+    'PT': 'portugal portuguese republic',
+    'PW': 'palau palaos republic of palau',
+    'PY': 'paraguay republic of paraguay',
+    'QA': 'qatar state of qatar',
+    'RE': 'réunion réunion, île de la',
+    'RO': 'romania roumanie',
+    'RS': 'serbia serbie republic of serbia',
+    'RU': 'russian federation russie, fédération de',
+    'RW': 'rwanda rwandese republic',
+    'SA': 'saudi arabia arabie saoudite kingdom of saudi arabia',
+    'SB': 'solomon islands salomon, îles',
+    'SC': 'seychelles republic of seychelles',
+    'SD': 'sudan soudan republic of the sudan',
+    'SE': 'sweden suède kingdom of sweden',
+    'SG': 'singapore singapour republic of singapore',
+    'SH': 'saint helena, ascension and tristan da cunha sainte-hélène, ascension et tristan da cunha',
+    'SI': 'slovenia slovénie republic of slovenia',
+    'SJ': 'svalbard and jan mayen svalbard et île jan mayen',
+    'SK': 'slovakia slovaquie slovak republic',
+    'SL': 'sierra leone republic of sierra leone',
+    'SM': 'san marino saint-marin republic of san marino',
+    'SN': 'senegal sénégal republic of senegal',
+    'SO': 'somalia somalie federal republic of somalia',
+    'SR': 'suriname surinam republic of suriname',
+    'SS': 'south sudan soudan du sud republic of south sudan',
+    'ST': 'sao tome and principe sao tomé-et-principe democratic republic of sao tome and principe',
+    'SV': 'el salvador salvador republic of el salvador',
+    'SX': 'sint maarten (dutch part) saint-martin (partie néerlandaise) sint maarten (dutch part)',
+    'SY': 'syrian arab republic syrienne, république arabe syria syrie',
+    'SZ': 'eswatini kingdom of eswatini',
+    'TC': 'turks and caicos islands îles turques-et-caïques',
+    'TD': 'chad tchad republic of chad',
+    'TF': 'french southern territories terres australes françaises',
+    'TG': 'togo togolese republic',
+    'TH': 'thailand thaïlande kingdom of thailand',
+    'TJ': 'tajikistan tadjikistan republic of tajikistan',
+    'TK': 'tokelau',
+    'TL': 'timor-leste timor oriental democratic republic of timor-leste',
+    'TM': 'turkmenistan turkménistan',
+    'TN': 'tunisia tunisie republic of tunisia',
+    'TO': 'tonga kingdom of tonga',
+    'TR': 'türkiye turquie republic of türkiye',
+    'TT': 'trinidad and tobago trinité-et-tobago republic of trinidad and tobago',
+    'TV': 'tuvalu',
+    'TW': 'taiwan, province of china taïwan, province de chine taiwan taïwan taiwan, province of china',
+    'TZ': 'tanzania, united republic of tanzanie, république unie de tanzania tanzanie united republic of tanzania',
+    'UA': 'ukraine',
+    'UG': 'uganda ouganda republic of uganda',
+    'UM': 'united states minor outlying islands îles mineures éloignées des états-unis',
+    'US': 'united states états-unis united states of america usa amérique',
+    'UY': 'uruguay eastern republic of uruguay',
+    'UZ': 'uzbekistan ouzbékistan republic of uzbekistan',
+    'VA': 'holy see (vatican city state) saint-siège (état de la cité du vatican)',
+    'VC': 'saint vincent and the grenadines saint-vincent-et-les-grenadines',
+    'VE': 'venezuela, bolivarian republic of vénézuela, république bolivarienne du venezuela vénézuela bolivarian republic of venezuela',
+    'VG': 'virgin islands, british îles vierges britanniques british virgin islands',
+    'VI': 'virgin islands, u.s. îles vierges, états-unis virgin islands of the united states',
+    'VN': 'viet nam viêt nam vietnam viêt nam socialist republic of viet nam',
+    'VU': 'vanuatu republic of vanuatu',
+    'WF': 'wallis and futuna wallis et futuna',
+    'WS': 'samoa independent state of samoa',
+    'YE': 'yemen yémen republic of yemen',
+    'YT': 'mayotte',
+    'ZA': 'south africa afrique du sud republic of south africa',
+    'ZM': 'zambia zambie republic of zambia',
+    'ZW': 'zimbabwe republic of zimbabwe',
+}
+
+
+def get_country_search_names(code):
+    return " ".join(filter(None, [code.lower(), COUNTRY_NAMES.get(code.upper(), "")]))
+
+
+def fill_location_search(apps, schema_editor):
+    Offer = apps.get_model("accounts", "Offer")
+    CompanyProfile = apps.get_model("accounts", "CompanyProfile")
+    InstitutionProfile = apps.get_model("accounts", "InstitutionProfile")
+    countries = dict(InstitutionProfile.objects.values_list("user_id", "country_code"))
+    countries.update(CompanyProfile.objects.values_list("user_id", "country_code"))
+    for company_id in Offer.objects.values_list("company_id", flat=True).distinct():
+        code = countries.get(company_id)
+        names = get_country_search_names(code) if code else ""
+        Offer.objects.filter(company_id=company_id).update(
+            location_search=Concat(Lower("location"), Value(" "), Value(names))
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_offer_search_vector'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='offer',
+            name='location_search',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='offer',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['location_search'], name='offer_location_search_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.RunPython(fill_location_search, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:42
+
+from django.db import migrations, models
+
+
+def fill_country_code(apps, schema_editor):
+    Offer = apps.get_model("accounts", "Offer")
+    CompanyProfile = apps.get_model("accounts", "CompanyProfile")
+    InstitutionProfile = apps.get_model("accounts", "InstitutionProfile")
+    for profile_model in (InstitutionProfile, CompanyProfile):
+        for user_id, country_code in profile_model.objects.values_list("user_id", "country_code"):
+            Offer.objects.filter(company_id=user_id).update(country_code=country_code)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_offer_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offer',
+            name='country_code',
+            field=models.CharField(blank=True, default='', editable=False, max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(fields=['contract_type', '-created_at'], name='offer_contract_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(fields=['remote', '-created_at'], name='offer_remote_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(fields=['country_code', '-created_at'], name='offer_country_created_idx'),
+        ),
+        migrations.RunPython(fill_country_code, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:44
+
+import re
+
+from django.db import migrations, models
+
+# copie figée de offers.query_parser.parse_duration_months à cette migration
+DURATION_UNITS = {
+    "mois": 1,
+    "month": 1,
+    "months": 1,
+    "semaine": 12 / 52,
+    "semaines": 12 / 52,
+    "sem": 12 / 52,
+    "week": 12 / 52,
+    "weeks": 12 / 52,
+    "an": 12,
+    "ans": 12,
+    "année": 12,
+    "années": 12,
+    "year": 12,
+    "years": 12,
+}
+DURATION_RE = re.compile(
+    r"(?<!\w)(\d{1,3})\s*(" + "|".join(sorted(DURATION_UNITS, key=len, reverse=True)) + r")(?!\w)",
+    re.IGNORECASE,
+)
+
+
+def parse_duration_months(text):
+    match = DURATION_RE.search(text or "")
+    if not match:
+        return None
+    months = round(int(match.group(1)) * DURATION_UNITS[match.group(2).lower()])
+    return max(months, 1)
+
+
+def fill_duration_months(apps, schema_editor):
+    Offer = apps.get_model("accounts", "Offer")
+    for duration in Offer.objects.exclude(duration="").values_list("duration", flat=True).distinct():
+        Offer.objects.filter(duration=duration).update(
+            duration_months=parse_duration_months(duration)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0010_offer_filters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offer',
+            name='duration_months',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(fields=['duration_months', '-created_at'], name='offer_duration_created_idx'),
+        ),
+        migrations.RunPython(fill_duration_months, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:45
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+from django.db.models import Value
+from django.db.models.functions import Concat, Lower
+
+
+def fill_fuzzy_search(apps, schema_editor):
+    Offer = apps.get_model("accounts", "Offer")
+    CompanyProfile = apps.get_model("accounts", "CompanyProfile")
+    InstitutionProfile = apps.get_model("accounts", "InstitutionProfile")
+    names = dict(InstitutionProfile.objects.values_list("user_id", "organisation_name"))
+    names.update(CompanyProfile.objects.values_list("user_id", "organisation_name"))
+    for company_id in Offer.objects.values_list("company_id", flat=True).distinct():
+        Offer.objects.filter(company_id=company_id).update(
+            fuzzy_search=Concat(
+                Lower("title"), Value(" "), Lower("skills"), Value(" "),
+                Value((names.get(company_id) or "").lower()),
+            )
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0011_offer_duration_months'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offer',
+            name='fuzzy_search',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='offer',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['fuzzy_search'], name='offer_fuzzy_search_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.RunPython(fill_fuzzy_search, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,100 @@
+import re
+import unicodedata
+
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import Value
+
+# copie figée de offers.search, offers.query_parser et accounts.text telles
+# qu'à cette migration : les modifier ensuite ne doit pas changer ce que la
+# migration écrit. Les noms de pays ne sont pas recopiés : location_search,
+# rempli par 0008, contient déjà le lieu et ces noms, il est seulement normalisé
+
+SEARCH_CONFIG = "french"
+SOURCE_FIELDS = ("id", "title", "skills", "contract_type", "description", "location_search", "duration")
+SEARCH_FIELDS = ("search_vector", "fuzzy_search", "location_search", "country_code", "duration_months")
+
+# nombre de mois par unité de durée (clés normalisées)
+DURATION_UNITS = {
+    "mois": 1,
+    "month": 1,
+    "months": 1,
+    "semaine": 12 / 52,
+    "semaines": 12 / 52,
+    "sem": 12 / 52,
+    "week": 12 / 52,
+    "weeks": 12 / 52,
+    "an": 12,
+    "ans": 12,
+    "annee": 12,
+    "annees": 12,
+    "year": 12,
+    "years": 12,
+}
+DURATION_RE = re.compile(
+    r"(?<!\w)(\d{1,3})\s*(" + "|".join(sorted(DURATION_UNITS, key=len, reverse=True)) + r")(?!\w)",
+    re.IGNORECASE,
+)
+
+
+def normalise(value):
+    decomposed = unicodedata.normalize("NFKD", value or "")
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split())
+
+
+def parse_duration_months(text):
+    match = DURATION_RE.search(normalise(text))
+    if not match:
+        return None
+    months = round(int(match.group(1)) * DURATION_UNITS[match.group(2)])
+    return max(months, 1)
+
+
+def build_search_fields(offer, profile):
+    country_code = (profile.country_code if profile else "").upper()
+    organisation_name = profile.organisation_name if profile else ""
+    return {
+        "search_vector": (
+            SearchVector(Value(normalise(offer.title)), weight="A", config=SEARCH_CONFIG)
+            + SearchVector(
+                Value(normalise(f"{offer.skills} {offer.contract_type}")), weight="B", config=SEARCH_CONFIG
+            )
+            + SearchVector(Value(normalise(organisation_name)), weight="C", config=SEARCH_CONFIG)
+            + SearchVector(Value(normalise(offer.description)), weight="D", config=SEARCH_CONFIG)
+        ),
+        "fuzzy_search": normalise(f"{offer.title} {offer.skills} {organisation_name}"),
+        "location_search": normalise(offer.location_search),
+        "country_code": country_code,
+        "duration_months": parse_duration_months(offer.duration),
+    }
+
+
+def normalise_search_fields(apps, schema_editor):
+    # les champs de recherche sont désormais stockés sans accents ni majuscules
+    Offer = apps.get_model("accounts", "Offer")
+    CompanyProfile = apps.get_model("accounts", "CompanyProfile")
+    InstitutionProfile = apps.get_model("accounts", "InstitutionProfile")
+    profiles = {profile.user_id: profile for profile in InstitutionProfile.objects.all()}
+    profiles.update({profile.user_id: profile for profile in CompanyProfile.objects.all()})
+    offers = Offer.objects.only("company_id", *SOURCE_FIELDS).order_by("pk")
+    batch = []
+    for offer in offers.iterator(chunk_size=500):
+        for name, value in build_search_fields(offer, profiles.get(offer.company_id)).items():
+            setattr(offer, name, value)
+        batch.append(offer)
+        if len(batch) == 500:
+            Offer.objects.bulk_update(batch, SEARCH_FIELDS)
+            batch = []
+    Offer.objects.bulk_update(batch, SEARCH_FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0012_offer_fuzzy_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalise_search_fields, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+OPEN_STATUSES = ["pending", "sent", "failed"]
+
+
+def expire_duplicate_invitations(apps, schema_editor):
+    # avant la contrainte : emails en minuscules (comme à l'import) et une
+    # seule invitation ouverte par (établissement, email), la plus récente
+    StudentInvitation = apps.get_model("accounts", "StudentInvitation")
+    open_invitations = StudentInvitation.objects.filter(status__in=OPEN_STATUSES)
+    open_invitations.update(email=Lower("email"))
+    duplicates = (
+        open_invitations.values("institution_id", "email")
+        .annotate(count=Count("pk"))
+        .filter(count__gt=1)
+    )
+    for group in list(duplicates):
+        ids = list(
+            open_invitations.filter(institution_id=group["institution_id"], email=group["email"])
+            .order_by("-created_at")
+            .values_list("pk", flat=True)
+        )
+        StudentInvitation.objects.filter(pk__in=ids[1:]).update(status="expired")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0015_job_queue'),
+    ]
+
+    operations = [
+        migrations.RunPython(expire_duplicate_invitations, migrations.RunPython.noop),
+    ]
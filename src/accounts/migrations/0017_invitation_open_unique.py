@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-16 21:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0016_expire_duplicate_invitations'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='invitationimport',
+            name='unchanged',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddConstraint(
+            model_name='studentinvitation',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['pending', 'sent', 'failed'])), fields=('institution', 'email'), name='invitation_open_unique'),
+        ),
+    ]
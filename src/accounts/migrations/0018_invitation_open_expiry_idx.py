@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-16 21:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0017_invitation_open_unique'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='studentinvitation',
+            index=models.Index(condition=models.Q(('status__in', ['pending', 'sent', 'failed'])), fields=['expires_at'], name='invitation_open_expiry_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-16 21:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0018_invitation_open_expiry_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentinvitation',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='studentinvitation',
+            name='max_attempts',
+            field=models.PositiveSmallIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='studentinvitation',
+            name='next_attempt_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:26
+
+import re
+import unicodedata
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+# copie figée de offers.query_parser.normalise_place à cette migration
+WORD_RE = re.compile(r"\w+")
+
+
+def normalise_place(text):
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(WORD_RE.findall(stripped.casefold().replace("_", " ")))
+
+
+def fill_place_search(apps, schema_editor):
+    Offer = apps.get_model("accounts", "Offer")
+    for location in Offer.objects.values_list("location", flat=True).distinct():
+        Offer.objects.filter(location=location).update(place_search=normalise_place(location))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0019_invitation_attempts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offer',
+            name='place_search',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='offer',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['place_search'], name='offer_place_search_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.RunPython(fill_place_search, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,8 @@
 import uuid
 
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
@@ -70,6 +72,55 @@ class InstitutionProfile(models.Model):
         return f"Profil établissement {self.organisation_name or self.user.email}"
 
 
+class InvitationImport(models.Model):
+    """Un import CSV : les invitations sont créées à l'envoi du fichier, puis
+    envoyées par lots par la tâche ``process_invitation_import`` (run_worker)."""
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "En attente"
+        RUNNING = "running", "En cours"
+        DONE = "done", "Terminé"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    institution = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="invitation_imports",
+        limit_choices_to={"role": User.Role.INSTITUTION},
+    )
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.QUEUED)
+    # racine du site (schéma + domaine) pour construire les liens hors requête
+    base_url = models.CharField(max_length=255)
+    # lignes refusées à l'import : [[ligne, message], ...]
+    errors = models.JSONField(default=list, blank=True)
+    # invitations déjà ouvertes et identiques : prolongées, pas renvoyées
+    unchanged = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def get_report(self):
+        counts = self.invitations.aggregate(
+            sent=models.Count("pk", filter=models.Q(status=StudentInvitation.Status.SENT)),
+            failed=models.Count("pk", filter=models.Q(status=StudentInvitation.Status.FAILED)),
+            pending=models.Count("pk", filter=models.Q(status=StudentInvitation.Status.PENDING)),
+        )
+        errors = [tuple(error) for error in self.errors]
+        if counts["failed"]:
+            failures = self.invitations.filter(status=StudentInvitation.Status.FAILED)
+            errors += [
+                (line, f"Ligne {line}: envoi impossible pour {email}.")
+                for line, email in failures.values_list("import_line", "email")
+            ]
+        return {
+            "sent": counts["sent"],
+            "failed": counts["failed"] + len(self.errors),
+            "pending": counts["pending"],
+            "unchanged": self.unchanged,
+            "errors": [message for _line, message in sorted(errors, key=lambda error: error[0] or 0)],
+            "done": self.status == self.Status.DONE,
+        }
+
+
 class StudentInvitation(models.Model):
     class Status(models.TextChoices):
         PENDING = "pending", "En attente"
@@ -78,6 +129,9 @@ class StudentInvitation(models.Model):
         USED = "used", "Utilisée"
         EXPIRED = "expired", "Expirée"
 
+    # une seule invitation ouverte par (établissement, email)
+    OPEN_STATUSES = (Status.PENDING, Status.SENT, Status.FAILED)
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     institution = models.ForeignKey(
         User,
@@ -97,12 +151,39 @@ class StudentInvitation(models.Model):
     sent_at = models.DateTimeField(null=True, blank=True)
     used_at = models.DateTimeField(null=True, blank=True)
     error_message = models.CharField(max_length=255, blank=True)
+    # essais d'envoi : un seul à l'import, plusieurs avec attente croissante
+    # quand l'établissement relance ses invitations (invitations.dispatch)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=1)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # import CSV d'origine et ligne du fichier, pour le rapport d'envoi
+    import_job = models.ForeignKey(
+        InvitationImport,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="invitations",
+    )
+    import_line = models.PositiveIntegerField(null=True, blank=True)
 
     class Meta:
         indexes = [
             models.Index(fields=["token"]),
             models.Index(fields=["email", "institution"]),
+            # invitations ouvertes par échéance, pour « manage.py expire_invitations »
+            models.Index(
+                fields=["expires_at"],
+                condition=models.Q(status__in=["pending", "sent", "failed"]),
+                name="invitation_open_expiry_idx",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["institution", "email"],
+                condition=models.Q(status__in=["pending", "sent", "failed"]),
+                name="invitation_open_unique",
+            ),
         ]
 
     def mark_sent(self) -> None:
@@ -140,6 +221,106 @@ class Offer(models.Model):
     duration = models.CharField(max_length=50, blank=True)
     description = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    # champs de recherche dénormalisés, tenus à jour par offers.signals
+    search_vector = SearchVectorField(null=True, editable=False)
+    # lieu de l'offre + noms du pays de l'organisation, en minuscules
+    location_search = models.TextField(blank=True, default="", editable=False)
+    # lieu de l'offre seule, en mots normalisés, pour les pays de la recherche
+    place_search = models.TextField(blank=True, default="", editable=False)
+    # pays de l'organisation, recopié pour filtrer sans jointure
+    country_code = models.CharField(max_length=10, blank=True, default="", editable=False)
+    # titre, compétences et nom de l'organisation pour la recherche approchée
+    fuzzy_search = models.TextField(blank=True, default="", editable=False)
+    # durée normalisée en mois, extraite du champ libre duration
+    duration_months = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"], name="offer_search_vector_gin"),
+            GinIndex(
+                fields=["location_search"],
+                name="offer_location_search_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+            GinIndex(
+                fields=["place_search"],
+                name="offer_place_search_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+            GinIndex(
+                fields=["fuzzy_search"],
+                name="offer_fuzzy_search_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+            # ordre de la liste publique et curseur de pagination
+            models.Index(fields=["-created_at", "-id"], name="offer_created_id_idx"),
+            # filtres de la liste, chacun suivi de l'ordre d'affichage
+            models.Index(fields=["contract_type", "-created_at"], name="offer_contract_created_idx"),
+            models.Index(fields=["remote", "-created_at"], name="offer_remote_created_idx"),
+            models.Index(fields=["country_code", "-created_at"], name="offer_country_created_idx"),
+            models.Index(fields=["duration_months", "-created_at"], name="offer_duration_created_idx"),
+        ]
 
     def __str__(self) -> str:
         return self.title
+
+
+class Job(models.Model):
+    """Tâche différée (mail, fichier...) exécutée par ``manage.py run_worker``.
+
+    Voir ``accounts.jobqueue`` pour la mise en file et l'exécution.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "En attente"
+        RUNNING = "running", "En cours"
+        DONE = "done", "Terminée"
+        DEAD = "dead", "Abandonnée"
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.QUEUED)
+    # les plus petites valeurs passent en premier
+    priority = models.PositiveSmallIntegerField(default=100)
+    run_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    locked_by = models.CharField(max_length=255, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # file d'attente : seules les tâches à exécuter sont indexées
+            models.Index(
+                fields=["priority", "run_at", "id"],
+                name="job_queued_idx",
+                condition=models.Q(status="queued"),
+            ),
+            models.Index(
+                fields=["locked_at"],
+                name="job_running_idx",
+                condition=models.Q(status="running"),
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.name} #{self.pk} ({self.status})"
+
+
+class MailQuota(models.Model):
+    """Jetons d'envoi consommés pendant une fenêtre de quota.
+
+    Une ligne par fenêtre en cours (``day:20570``, ``minute:30000000``),
+    verrouillée pendant la prise de jetons : voir ``accounts.mail_limiter``.
+    """
+
+    window = models.CharField(max_length=64, unique=True)
+    used = models.PositiveIntegerField(default=0)
+    # fin de la fenêtre, les lignes dépassées sont supprimées par run_worker
+    expires_at = models.DateTimeField()
+
+    def __str__(self) -> str:
+        return f"{self.window} ({self.used})"
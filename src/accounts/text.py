@@ -0,0 +1,14 @@
+"""Normalisation du texte cherché : une seule fonction pour l'écriture et la lecture.
+
+Les colonnes de recherche sont stockées normalisées et chaque requête est
+normalisée de la même façon avant d'être comparée : « Émirats », « emirats »
+et « ÉMIRATS » se retrouvent sans calcul par ligne en base.
+"""
+import unicodedata
+
+
+def normalise(value):
+    """Casse repliée, accents retirés, espaces réduits : « Émirats  Arabes » -> « emirats arabes »."""
+    decomposed = unicodedata.normalize("NFKD", value or "")
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split())
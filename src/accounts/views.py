@@ -1,4 +1,6 @@
+import logging
 import secrets
+import smtplib
 import uuid
 from datetime import timedelta
 from pathlib import Path
@@ -8,9 +10,7 @@ from django.contrib import messages
 from django.contrib.auth import login
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.views import LoginView
-from django.core.files.base import File
 from django.core.files.storage import default_storage
-from django.core.mail import send_mail
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse_lazy
 from django.utils import timezone
@@ -24,6 +24,7 @@ from .forms import (
     RegistrationForm,
     TwoFactorForm,
 )
+from .jobqueue import PRIORITY_TRANSACTIONAL, enqueue
 from .models import CompanyProfile, InstitutionProfile, StudentInvitation, StudentProfile, User
 
 SESSION_USER_KEY = "two_factor_user_id"
@@ -37,6 +38,8 @@ SESSION_SUBJECT_KEY = "two_factor_subject"
 SESSION_TEMPLATE_KEY = "two_factor_template"
 SESSION_RESET_EMAIL = "password_reset_email"
 
+logger = logging.getLogger(__name__)
+
 
 def _send_two_factor_code(session, email, subject, message_template):
     code = f"{secrets.SystemRandom().randint(0, 999999):06d}"
@@ -45,8 +48,18 @@ def _send_two_factor_code(session, email, subject, message_template):
     session[SESSION_EMAIL_KEY] = email
     session[SESSION_SUBJECT_KEY] = subject
     session[SESSION_TEMPLATE_KEY] = message_template
-    from_email = getattr(settings, "DEFAULT_FROM_EMAIL", None)
-    send_mail(subject, message_template.format(code=code), from_email, [email], fail_silently=True)
+    try:
+        enqueue(
+            "send_mail",
+            priority=PRIORITY_TRANSACTIONAL,
+            subject=subject,
+            message=message_template.format(code=code),
+            recipient_list=[email],
+            transactional=True,
+        )
+    except (smtplib.SMTPException, OSError):
+        # JOBS_EAGER : envoi dans la requête, un serveur SMTP en panne ne bloque pas la connexion
+        logger.exception("envoi du code de connexion à %s impossible", email)
 
 
 def _create_student_profile(user, invitation=None):
@@ -73,12 +86,11 @@ def _create_company_profile(user, data=None):
     profile.phone = data.get("phone") or profile.phone
     profile.website = data.get("site") or profile.website
     profile.description = data.get("description") or profile.description
-    logo_path = data.get("logo_path")
-    if logo_path and default_storage.exists(logo_path):
-        with default_storage.open(logo_path, "rb") as logo_file:
-            profile.logo.save(Path(logo_path).name.split("/")[-1], File(logo_file), save=False)
-        default_storage.delete(logo_path)
     profile.save()
+    logo_path = data.get("logo_path")
+    if logo_path:
+        # copie du fichier temporaire hors de la requête
+        enqueue("attach_logo", role=user.role, user_id=str(user.pk), path=logo_path)
     return profile
 
 
@@ -93,12 +105,11 @@ def _create_institution_profile(user, data=None):
     profile.phone = data.get("phone") or profile.phone
     profile.website = data.get("site") or profile.website
     profile.description = data.get("description") or profile.description
-    logo_path = data.get("logo_path")
-    if logo_path and default_storage.exists(logo_path):
-        with default_storage.open(logo_path, "rb") as logo_file:
-            profile.logo.save(Path(logo_path).name.split("/")[-1], File(logo_file), save=False)
-        default_storage.delete(logo_path)
     profile.save()
+    logo_path = data.get("logo_path")
+    if logo_path:
+        # copie du fichier temporaire hors de la requête
+        enqueue("attach_logo", role=user.role, user_id=str(user.pk), path=logo_path)
     return profile
 
 
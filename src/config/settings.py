@@ -26,6 +26,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "accounts",
     "profiles",
     "offers",
@@ -95,6 +96,75 @@ MEDIA_ROOT = BASE_DIR / "media"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # résultats de recherche des offres ; un backend partagé (fichier, Redis)
+    # permet à plusieurs serveurs d'utiliser le même cache
+    "offers": {
+        "BACKEND": os.environ.get(
+            "DJANGO_OFFERS_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("DJANGO_OFFERS_CACHE_LOCATION", "offers"),
+        "OPTIONS": {"MAX_ENTRIES": int(os.environ.get("DJANGO_OFFERS_CACHE_MAX_ENTRIES", "1000"))},
+    },
+    # jeton OAuth Gmail ; avec Redis ou Memcached il est commun à tous les
+    # workers (les quotas d'envoi sont en base, voir accounts.mail_limiter)
+    "mail": {
+        "BACKEND": os.environ.get(
+            "DJANGO_MAIL_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("DJANGO_MAIL_CACHE_LOCATION", "mail"),
+    },
+}
+OFFERS_CACHE_ALIAS = "offers"
+OFFERS_CACHE_TIMEOUT = int(os.environ.get("DJANGO_OFFERS_CACHE_TIMEOUT", "300"))
+
+OFFERS_PAGE_SIZE = 20
+# au-delà, le nombre de résultats affiché est l'estimation du planificateur
+OFFERS_EXACT_COUNT_LIMIT = 1000
+# recherche approchée (trigrammes) quand la recherche exacte trouve moins de
+# OFFERS_FUZZY_MIN_RESULTS offres
+OFFERS_FUZZY_MIN_RESULTS = 3
+OFFERS_FUZZY_THRESHOLD = 0.25
+# moteur de recherche des offres (offers.backends)
+OFFERS_SEARCH_BACKEND = os.environ.get(
+    "DJANGO_OFFERS_SEARCH_BACKEND", "offers.backends.DatabaseSearchBackend"
+)
+
+# analyse d'un CSV (accounts.csv_sniff) gardée entre la prévisualisation et l'import
+CSV_SNIFF_CACHE_TIMEOUT = 600
+# invitations envoyées par lot par la tâche process_invitation_import (run_worker)
+INVITATION_IMPORT_CHUNK_SIZE = 50
+# invitations expirées gardées avant « manage.py expire_invitations --purge »
+INVITATION_RETENTION_DAYS = int(os.environ.get("DJANGO_INVITATION_RETENTION_DAYS", 180))
+# relance des invitations en échec ou expirées : essais d'envoi par invitation,
+# espacés de INVITATION_RETRY_BACKOFF_BASE x 2^(essai - 1) secondes (plafonné)
+INVITATION_RETRY_MAX_ATTEMPTS = 5
+INVITATION_RETRY_BACKOFF_BASE = 60
+INVITATION_RETRY_BACKOFF_MAX = 3600
+
+# file de tâches (accounts.jobqueue), exécutée par « manage.py run_worker » ;
+# DJANGO_JOBS_EAGER=1 (ou true, yes) exécute les tâches dans la requête (développement)
+JOBS_EAGER = os.environ.get("DJANGO_JOBS_EAGER", "False").lower() in ("1", "true", "yes")
+JOBS_CONCURRENCY = int(os.environ.get("DJANGO_JOBS_CONCURRENCY", "1"))
+JOBS_POLL_INTERVAL = 2
+JOBS_MAX_ATTEMPTS = 5
+# délai avant un nouvel essai : 30 s, 60 s, 120 s... plafonné à 1 h
+JOBS_BACKOFF_BASE = 30
+JOBS_BACKOFF_MAX = 3600
+# une tâche réservée depuis plus longtemps est rendue à la file
+JOBS_LOCK_TIMEOUT = 600
+# tâches finies ou abandonnées gardées avant d'être supprimées par run_worker
+JOBS_RETENTION_DAYS = int(os.environ.get("DJANGO_JOBS_RETENTION_DAYS", 7))
+
+# envoi en masse (accounts.mail_pool) : connexions SMTP ouvertes en parallèle,
+# mails envoyés par connexion avant de passer au lot suivant, nouveaux essais
+MAIL_POOL_SIZE = int(os.environ.get("DJANGO_MAIL_POOL_SIZE", "4"))
+MAIL_POOL_BATCH_SIZE = 20
+MAIL_POOL_RETRIES = 2
+
 LOGIN_URL = "accounts:login"
 LOGIN_REDIRECT_URL = "home"
 
@@ -112,9 +182,27 @@ if EMAIL_BACKEND == "gmail_oauth":
     EMAIL_USE_TLS = True
     EMAIL_USE_SSL = False
     EMAIL_HOST_USER = os.environ.get("DJANGO_EMAIL_HOST_USER", "")
+    # jeton renouvelé 5 min avant son expiration
+    GMAIL_TOKEN_EXPIRY_MARGIN = 300
+    # quotas d'envoi de Gmail (Google Workspace)
+    MAIL_RATE_PER_MINUTE = int(os.environ.get("DJANGO_MAIL_RATE_PER_MINUTE", "60"))
+    MAIL_RATE_PER_DAY = int(os.environ.get("DJANGO_MAIL_RATE_PER_DAY", "2000"))
+else:
+    # quotas du relais SMTP (accounts.mail_limiter), 0 = sans limite
+    MAIL_RATE_PER_MINUTE = int(os.environ.get("DJANGO_MAIL_RATE_PER_MINUTE", "0"))
+    MAIL_RATE_PER_DAY = int(os.environ.get("DJANGO_MAIL_RATE_PER_DAY", "0"))
+# part de chaque quota réservée aux codes de connexion
+MAIL_TRANSACTIONAL_RESERVE = 0.2
+MAIL_CACHE_ALIAS = "mail"
+# connexion SMTP gardée entre deux envois (accounts.email_backends), refaite
+# au-delà de ce délai d'inactivité
+MAIL_CONNECTION_IDLE_TIMEOUT = 60
 DEFAULT_FROM_EMAIL = os.environ.get("DJANGO_DEFAULT_FROM_EMAIL", "no-reply@mosifra.local")
 
-if EMAIL_BACKEND == "django.core.mail.backends.smtp.EmailBackend":
+if EMAIL_BACKEND in (
+    "django.core.mail.backends.smtp.EmailBackend",
+    "accounts.email_backends.PersistentSMTPBackend",
+):
     EMAIL_HOST = os.environ.get("DJANGO_EMAIL_HOST", "")
     EMAIL_PORT = int(os.environ.get("DJANGO_EMAIL_PORT", "587"))
     EMAIL_HOST_USER = os.environ.get("DJANGO_EMAIL_HOST_USER", "")
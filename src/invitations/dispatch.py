@@ -0,0 +1,182 @@
+"""Envoi des invitations d'un import CSV, hors de la requête d'upload.
+
+``process_batch`` réserve un lot d'invitations en attente avec
+``SELECT ... FOR UPDATE SKIP LOCKED`` : plusieurs workers peuvent tourner en
+parallèle sans envoyer deux fois la même invitation, et un worker arrêté en
+cours de lot laisse ses invitations en attente pour le suivant. Les mails
+partent par un ``SMTPSenderPool`` (accounts.mail_pool) : celui du thread de
+``run_worker`` (``worker_pool``), gardé d'un lot à l'autre avec ses
+connexions SMTP, ou à défaut un pool ouvert pour le lot. La taille du lot est
+bornée par le quota d'envoi restant (accounts.mail_limiter, voie ``BULK``) ;
+quota épuisé, ``process_batch`` retourne 0 sans rien réserver.
+
+``retry_invitations`` relance d'un coup les invitations en échec ou expirées
+d'un établissement : nouveaux liens en une seule requête, puis envoi par la
+même file avec ``INVITATION_RETRY_MAX_ATTEMPTS`` essais par invitation,
+espacés par ``backoff``. Une invitation en attente d'un nouvel essai reste
+``pending`` jusqu'à ``next_attempt_at``.
+
+Les imports et les relances d'un même établissement ouvrent des
+invitations : ``lock_institution`` les fait passer l'un après l'autre, sans
+quoi deux transactions concurrentes pourraient ouvrir la même invitation
+(contrainte ``invitation_open_unique``).
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.postgres.functions import RandomUUID
+from django.core.mail import EmailMessage
+from django.db import models, transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Cast, Lower, Replace
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts import mail_limiter
+from accounts.jobqueue import PRIORITY_BULK, enqueue
+from accounts.mail_pool import SMTPSenderPool
+from accounts.models import InvitationImport, StudentInvitation, User
+
+
+def build_invitation_email(base_url, invitation):
+    link = base_url.rstrip("/") + reverse("accounts:invitation_accept", args=[invitation.token])
+    subject = "Invitation Mosifra"
+    message = (
+        f"Bonjour {invitation.first_name},\n\n"
+        f"Ton établissement t'invite à rejoindre Mosifra.\n"
+        f"Profil : {invitation.filiere} / {invitation.level} / {invitation.academic_year}\n\n"
+        f"Clique sur ce lien pour créer ton compte (valide jusqu'au {invitation.expires_at:%d/%m/%Y}) :\n{link}\n"
+    )
+    return EmailMessage(subject, message, getattr(settings, "DEFAULT_FROM_EMAIL", None), [invitation.email])
+
+
+def backoff(attempts):
+    base = getattr(settings, "INVITATION_RETRY_BACKOFF_BASE", 60)
+    return timedelta(seconds=min(base * 2 ** (attempts - 1), getattr(settings, "INVITATION_RETRY_BACKOFF_MAX", 3600)))
+
+
+def due(invitations, now=None):
+    """Invitations dont l'essai suivant peut partir maintenant."""
+    now = now or timezone.now()
+    return invitations.filter(Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now))
+
+
+def process_batch(chunk_size=None, import_id=None, pool=None):
+    """
+    Envoie un lot d'invitations en attente (d'un import ou de tous) par
+    ``pool`` (un pool le temps du lot sinon) ; retourne la taille du lot.
+    """
+    if pool is None:
+        with SMTPSenderPool() as pool:
+            return process_batch(chunk_size, import_id, pool)
+    if chunk_size is None:
+        chunk_size = getattr(settings, "INVITATION_IMPORT_CHUNK_SIZE", 50)
+    pending = StudentInvitation.objects.filter(
+        import_job__isnull=False, status=StudentInvitation.Status.PENDING
+    )
+    if import_id is not None:
+        pending = pending.filter(import_job_id=import_id)
+    pending = due(pending)
+    granted = mail_limiter.acquire(chunk_size, mail_limiter.BULK)
+    if not granted:
+        return 0
+    with transaction.atomic():
+        batch = list(
+            pending.select_for_update(skip_locked=True, of=("self",))
+            .select_related("import_job")
+            .order_by("created_at", "import_line")[:granted]
+        )
+        mail_limiter.release(granted - len(batch), mail_limiter.BULK)
+        if not batch:
+            return 0
+        job_ids = {invitation.import_job_id for invitation in batch}
+        InvitationImport.objects.filter(
+            pk__in=job_ids, status=InvitationImport.Status.QUEUED
+        ).update(status=InvitationImport.Status.RUNNING)
+
+        report = pool.send(
+            build_invitation_email(invitation.import_job.base_url, invitation) for invitation in batch
+        )
+        failed = {batch[index].pk for index in report["failed"]}
+        sent = [invitation.pk for invitation in batch if invitation.pk not in failed]
+        now = timezone.now()
+
+        if sent:
+            StudentInvitation.objects.filter(pk__in=sent).update(
+                status=StudentInvitation.Status.SENT, sent_at=now, error_message="",
+                attempts=F("attempts") + 1, next_attempt_at=None,
+            )
+        # essais restants : même attente pour toutes celles au même essai
+        retries = {}
+        for invitation in batch:
+            if invitation.pk in failed and invitation.attempts + 1 < invitation.max_attempts:
+                retries.setdefault(invitation.attempts + 1, []).append(invitation.pk)
+                failed.discard(invitation.pk)
+        for attempts, pks in retries.items():
+            StudentInvitation.objects.filter(pk__in=pks).update(
+                attempts=attempts, next_attempt_at=now + backoff(attempts),
+                error_message=f"Erreur d'envoi (essai {attempts})",
+            )
+        if failed:
+            StudentInvitation.objects.filter(pk__in=failed).update(
+                status=StudentInvitation.Status.FAILED, error_message="Erreur d'envoi",
+                attempts=F("attempts") + 1, next_attempt_at=None,
+            )
+        # terminé quand plus aucune invitation n'attend, lots des autres workers compris
+        InvitationImport.objects.filter(pk__in=job_ids).exclude(
+            invitations__status=StudentInvitation.Status.PENDING
+        ).update(status=InvitationImport.Status.DONE, finished_at=timezone.now())
+    return len(batch)
+
+
+def lock_institution(institution):
+    """Verrouille le compte de l'établissement jusqu'à la fin de la transaction."""
+    list(User.objects.select_for_update().filter(pk=institution.pk).values_list("pk", flat=True))
+
+
+def retryable_invitations(institution):
+    """
+    Invitations en échec, et la dernière expirée de chaque email sans
+    invitation ouverte ni utilisée, et sans compte (email comparé sans casse).
+    """
+    invitations = StudentInvitation.objects.filter(institution=institution)
+    taken_emails = invitations.filter(
+        status__in=(*StudentInvitation.OPEN_STATUSES, StudentInvitation.Status.USED)
+    ).values("email")
+    registered = User.objects.annotate(email_lower=Lower("email")).values("email_lower")
+    expired = (
+        invitations.filter(status=StudentInvitation.Status.EXPIRED)
+        .exclude(email__in=taken_emails)
+        .exclude(email__in=registered)
+        .order_by("email", "-created_at")
+        .distinct("email")
+        .values("pk")
+    )
+    return invitations.filter(Q(status=StudentInvitation.Status.FAILED) | Q(pk__in=expired))
+
+
+@transaction.atomic
+def retry_invitations(institution, base_url):
+    """
+    Remet en attente les invitations à relancer avec un nouveau lien, en une
+    requête, et les rattache à un nouvel import pour suivre l'envoi ;
+    retourne cet import, ou None s'il n'y a rien à relancer.
+    """
+    lock_institution(institution)
+    retry = retryable_invitations(institution)
+    if not retry.exists():
+        return None
+    job = InvitationImport.objects.create(institution=institution, base_url=base_url)
+    retry.update(
+        status=StudentInvitation.Status.PENDING,
+        # même forme que uuid.uuid4().hex, calculé par PostgreSQL pour chaque ligne
+        token=Replace(Cast(RandomUUID(), models.CharField()), Value("-"), Value("")),
+        expires_at=timezone.now() + timedelta(days=7),
+        error_message="",
+        attempts=0,
+        max_attempts=getattr(settings, "INVITATION_RETRY_MAX_ATTEMPTS", 5),
+        next_attempt_at=None,
+        import_job=job,
+    )
+    enqueue("process_invitation_import", priority=PRIORITY_BULK, import_id=str(job.pk))
+    return job
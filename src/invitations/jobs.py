@@ -0,0 +1,32 @@
+"""Tâches différées des invitations (voir accounts.jobqueue)."""
+import math
+
+from django.db.models import Min
+from django.utils import timezone
+
+from accounts import mail_limiter
+from accounts.mail_pool import current_pool
+from accounts.jobqueue import Defer, register
+from accounts.models import StudentInvitation
+
+from .dispatch import due, process_batch
+
+
+@register("process_invitation_import")
+def process_invitation_import(import_id):
+    # un lot par exécution : entre deux lots la tâche repasse par la file,
+    # derrière les codes de connexion, et reste loin de JOBS_LOCK_TIMEOUT ;
+    # les lots successifs passent par le pool SMTP du worker
+    processed = process_batch(import_id=import_id, pool=current_pool())
+    pending = StudentInvitation.objects.filter(
+        import_job_id=import_id, status=StudentInvitation.Status.PENDING
+    )
+    if due(pending).exists():
+        if processed:
+            raise Defer(0)
+        # quota d'envoi épuisé (ou lot tenu par un autre worker) : reprise plus tard
+        raise Defer(max(mail_limiter.retry_after(mail_limiter.BULK), 1))
+    next_attempt_at = pending.aggregate(next_attempt_at=Min("next_attempt_at"))["next_attempt_at"]
+    if next_attempt_at is not None:
+        # nouveaux essais après échec : reprise au plus proche
+        raise Defer(max(math.ceil((next_attempt_at - timezone.now()).total_seconds()), 1))
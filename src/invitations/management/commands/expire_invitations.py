@@ -0,0 +1,99 @@
+"""Passe les invitations échues à l'état « expirée », par lots, et purge les anciennes.
+
+    python manage.py expire_invitations                       # à lancer par cron
+    python manage.py expire_invitations --purge               # + supprime les expirées anciennes
+    python manage.py expire_invitations --archive exp.jsonl   # + les écrit avant de les supprimer
+
+Chaque lot est une seule requête ``UPDATE ... WHERE id IN (SELECT id ...
+WHERE expires_at < now() LIMIT n)``, servie par l'index partiel
+``invitation_open_expiry_idx`` et validée seule : les verrous restent
+courts même sur une grosse table. Les invitations expirées depuis plus de
+``INVITATION_RETENTION_DAYS`` jours peuvent être supprimées (``--purge``),
+ou écrites en JSON Lines puis supprimées (``--archive``).
+"""
+import json
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from accounts.models import InvitationImport, StudentInvitation
+
+ARCHIVE_FIELDS = (
+    "id", "institution_id", "email", "first_name", "last_name", "filiere", "level",
+    "academic_year", "status", "expires_at", "sent_at", "created_at", "import_line",
+)
+
+
+class Command(BaseCommand):
+    help = "Expire les invitations échues par lots et purge (ou archive) les anciennes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--sleep", type=float, default=0, help="pause entre deux lots")
+        parser.add_argument("--retention-days", type=int, default=None)
+        parser.add_argument("--purge", action="store_true", help="supprime les expirées au-delà de la rétention")
+        parser.add_argument("--archive", help="fichier JSON Lines où écrire les invitations purgées")
+
+    def batches(self, run, batch_size, sleep):
+        total = 0
+        while True:
+            count = run(batch_size)
+            total += count
+            if count < batch_size:
+                return total
+            if sleep:
+                time.sleep(sleep)
+
+    def expire_batch(self, batch_size):
+        due = (
+            StudentInvitation.objects.filter(
+                status__in=StudentInvitation.OPEN_STATUSES, expires_at__lt=timezone.now()
+            )
+            .order_by()
+            .values("pk")[:batch_size]
+        )
+        return StudentInvitation.objects.filter(pk__in=due).update(status=StudentInvitation.Status.EXPIRED)
+
+    def purge_batch(self, batch_size):
+        ids = list(
+            StudentInvitation.objects.filter(
+                status=StudentInvitation.Status.EXPIRED, expires_at__lt=self.purge_before
+            )
+            .order_by("expires_at")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if self.archive is not None:
+            for row in StudentInvitation.objects.filter(pk__in=ids).values(*ARCHIVE_FIELDS):
+                self.archive.write(json.dumps(row, cls=DjangoJSONEncoder) + "\n")
+            self.archive.flush()
+        StudentInvitation.objects.filter(pk__in=ids).delete()
+        return len(ids)
+
+    def handle(self, *args, **options):
+        expired = self.batches(self.expire_batch, options["batch_size"], options["sleep"])
+        # imports dont les dernières invitations en attente viennent d'expirer
+        InvitationImport.objects.exclude(status=InvitationImport.Status.DONE).exclude(
+            invitations__status=StudentInvitation.Status.PENDING
+        ).update(status=InvitationImport.Status.DONE, finished_at=timezone.now())
+        self.stdout.write(f"{expired} invitation(s) expirée(s)")
+
+        if not (options["purge"] or options["archive"]):
+            return
+        retention = options["retention_days"]
+        if retention is None:
+            retention = getattr(settings, "INVITATION_RETENTION_DAYS", 180)
+        self.purge_before = timezone.now() - timedelta(days=retention)
+        self.archive = None
+        if options["archive"]:
+            self.archive = open(options["archive"], "a", encoding="utf-8")
+        try:
+            purged = self.batches(self.purge_batch, options["batch_size"], options["sleep"])
+        finally:
+            if self.archive is not None:
+                self.archive.close()
+        action = "archivée(s)" if options["archive"] else "supprimée(s)"
+        self.stdout.write(f"{purged} invitation(s) {action}")
@@ -0,0 +1,35 @@
+"""Remet en file l'envoi des imports d'invitations en attente.
+
+    python manage.py process_invitation_imports
+
+Les invitations sont envoyées par la tâche ``process_invitation_import`` de
+``manage.py run_worker``, seul chemin d'envoi. Cette commande met en file
+une tâche pour chaque import qui a encore des invitations en attente sans
+tâche prévue (imports antérieurs à la file de tâches, tâche abandonnée).
+"""
+from django.core.management.base import BaseCommand
+
+from accounts.jobqueue import PRIORITY_BULK, enqueue
+from accounts.models import InvitationImport, Job, StudentInvitation
+
+
+class Command(BaseCommand):
+    help = "Met en file l'envoi des imports d'invitations qui n'ont plus de tâche."
+
+    def handle(self, *args, **options):
+        scheduled = set(
+            Job.objects.filter(
+                name="process_invitation_import", status__in=(Job.Status.QUEUED, Job.Status.RUNNING)
+            ).values_list("payload__import_id", flat=True)
+        )
+        import_ids = (
+            InvitationImport.objects.filter(invitations__status=StudentInvitation.Status.PENDING)
+            .distinct()
+            .values_list("pk", flat=True)
+        )
+        queued = 0
+        for import_id in import_ids:
+            if str(import_id) not in scheduled:
+                enqueue("process_invitation_import", priority=PRIORITY_BULK, import_id=str(import_id))
+                queued += 1
+        self.stdout.write(f"{queued} import(s) remis en file")
@@ -1,6 +1,6 @@
 from django.urls import path
 
-from .views import InvitationUploadView, download_csv_model, preview_csv
+from .views import InvitationUploadView, download_csv_model, import_status, preview_csv, retry_invitations
 
 app_name = "invitations"
 
@@ -8,4 +8,6 @@ urlpatterns = [
     path("upload/", InvitationUploadView.as_view(), name="upload"),
     path("preview/", preview_csv, name="preview"),
     path("model/", download_csv_model, name="model"),
+    path("imports/<uuid:pk>/status/", import_status, name="import_status"),
+    path("retry/", retry_invitations, name="retry"),
 ]
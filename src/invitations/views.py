@@ -2,46 +2,38 @@ import csv
 import uuid
 from datetime import timedelta
 
-from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.mail import send_mail
 from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models.functions import Lower
 from django.http import Http404, HttpResponse
-from django.shortcuts import render
-from django.urls import reverse, reverse_lazy
+from django.shortcuts import get_object_or_404, render
+from django.urls import reverse_lazy
 from django.utils import timezone
 from django.views.decorators.http import require_GET, require_POST
 from django.views.generic import FormView
 
+from accounts import csv_sniff
 from accounts.forms import InvitationUploadForm
-from accounts.models import StudentInvitation, User
+from accounts.jobqueue import PRIORITY_BULK, enqueue
+from accounts.models import InvitationImport, StudentInvitation, User
 
+from . import dispatch
 
-def _send_invitation_email(request, invitation):
-    link = request.build_absolute_uri(
-        reverse("accounts:invitation_accept", args=[invitation.token])
-    )
-    subject = "Invitation Mosifra"
-    message = (
-        f"Bonjour {invitation.first_name},\n\n"
-        f"Ton établissement t'invite à rejoindre Mosifra.\n"
-        f"Profil : {invitation.filiere} / {invitation.level} / {invitation.academic_year}\n\n"
-        f"Clique sur ce lien pour créer ton compte (valide jusqu'au {invitation.expires_at:%d/%m/%Y}) :\n{link}\n"
-    )
-    send_mail(
-        subject,
-        message,
-        getattr(settings, "DEFAULT_FROM_EMAIL", None),
-        [invitation.email],
-        fail_silently=True,
-    )
+
+# champs réécrits quand un import retrouve une invitation ouverte
+UPSERT_FIELDS = [
+    "first_name", "last_name", "filiere", "level", "academic_year",
+    "expires_at", "token", "status", "error_message", "import_job", "import_line",
+    "attempts", "max_attempts", "next_attempt_at",
+]
 
 
 class InvitationUploadView(LoginRequiredMixin, FormView):
     template_name = "invitations/invitations_upload.html"
     form_class = InvitationUploadForm
     success_url = reverse_lazy("invitations:upload")
-    report = None
+    job = None
 
     def dispatch(self, request, *args, **kwargs):
         if not request.user.is_authenticated:
@@ -51,63 +43,164 @@ class InvitationUploadView(LoginRequiredMixin, FormView):
         return super().dispatch(request, *args, **kwargs)
 
     def form_valid(self, form):
-        rows = form.read_rows()
-        self.report = self._process_rows(rows)
+        self.job = self._create_import(form.iter_rows())
         return self.render_to_response(self.get_context_data(form=self.form_class()))
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["report"] = self.report
+        context["job"] = self.job
+        context["report"] = self.job.get_report() if self.job else None
         user = self.request.user
         logo_url = None
         if hasattr(user, "institution_profile") and user.institution_profile.logo:
             logo_url = user.institution_profile.logo.url
         context["logo_url"] = logo_url
+        context["retryable"] = dispatch.retryable_invitations(user).count()
         return context
 
-    def _process_rows(self, rows):
-        report = {"sent": 0, "failed": 0, "errors": []}
+    @transaction.atomic
+    def _create_import(self, chunks):
+        """
+        Valide les lignes paquet par paquet et crée les invitations ; l'envoi
+        est fait par le worker. Une invitation encore ouverte pour le même
+        email est mise à jour au lieu d'être dupliquée, et n'est renvoyée que
+        si le profil a changé ou si elle a expiré. Les imports d'un même
+        établissement passent l'un après l'autre (``dispatch.lock_institution``).
+        """
+        dispatch.lock_institution(self.request.user)
+        # (ligne, message) : remis dans l'ordre du fichier dans le rapport
+        errors = []
         now = timezone.now()
-        for idx, row in enumerate(rows, start=2):
-            email = (row.get("email") or "").strip().lower()
-            try:
-                validate_email(email)
-            except Exception:
-                report["failed"] += 1
-                report["errors"].append(f"Ligne {idx}: email invalide ({email}).")
-                continue
-            if User.objects.filter(email__iexact=email).exists():
-                report["failed"] += 1
-                report["errors"].append(f"Ligne {idx}: email déjà utilisé ({email}).")
-                continue
-
-            first_name = (row.get("prenom") or "").strip().title()
-            last_name = (row.get("nom") or "").strip().upper()
-            filiere = (row.get("filiere_ou_parcours") or "").strip()
-            level = (row.get("niveau") or "").strip()
-            academic_year = (row.get("annee_academique") or "").strip()
-
-            token = uuid.uuid4().hex
-            invitation = StudentInvitation.objects.create(
-                institution=self.request.user,
-                email=email,
-                first_name=first_name or "Étudiant",
-                last_name=last_name or "",
-                filiere=filiere or "N/A",
-                level=level or "N/A",
-                academic_year=academic_year or "N/A",
-                token=token,
-                expires_at=now + timedelta(days=7),
+        expires_at = now + timedelta(days=7)
+        job = InvitationImport.objects.create(
+            institution=self.request.user,
+            base_url=self.request.build_absolute_uri("/"),
+        )
+        queued = 0
+        # email -> première ligne du fichier
+        seen = {}
+        idx = 1
+        for rows in chunks:
+            candidates = []
+            for row in rows:
+                idx += 1
+                email = (row.get("email") or "").strip().lower()
+                try:
+                    validate_email(email)
+                except Exception:
+                    errors.append((idx, f"Ligne {idx}: email invalide ({email})."))
+                    continue
+                if email in seen:
+                    errors.append((idx, f"Ligne {idx}: email en double ({email}, déjà ligne {seen[email]})."))
+                    continue
+                seen[email] = idx
+                candidates.append((idx, email, row))
+
+            emails = {email for _idx, email, _row in candidates}
+            # une seule requête par paquet pour les emails déjà inscrits
+            existing = set(
+                User.objects.annotate(email_lower=Lower("email"))
+                .filter(email_lower__in=emails)
+                .values_list("email_lower", flat=True)
             )
-            try:
-                _send_invitation_email(self.request, invitation)
-                invitation.mark_sent()
-                report["sent"] += 1
-            except Exception:
-                invitation.mark_failed("Erreur d'envoi")
-                report["failed"] += 1
-                report["errors"].append(f"Ligne {idx}: envoi impossible pour {email}.")
-        return report
+            # et une pour les invitations encore ouvertes
+            open_invitations = {
+                invitation.email: invitation
+                for invitation in StudentInvitation.objects.filter(
+                    institution=self.request.user,
+                    email__in=emails,
+                    status__in=StudentInvitation.OPEN_STATUSES,
+                )
+            }
+
+            invitations = []
+            updated = []
+            for line, email, row in candidates:
+                if email in existing:
+                    errors.append((line, f"Ligne {line}: email déjà utilisé ({email})."))
+                    continue
+
+                profile = {
+                    "first_name": (row.get("prenom") or "").strip().title() or "Étudiant",
+                    "last_name": (row.get("nom") or "").strip().upper(),
+                    "filiere": (row.get("filiere_ou_parcours") or "").strip() or "N/A",
+                    "level": (row.get("niveau") or "").strip() or "N/A",
+                    "academic_year": (row.get("annee_academique") or "").strip() or "N/A",
+                }
+                invitation = open_invitations.get(email)
+                if invitation is None:
+                    invitations.append(StudentInvitation(
+                        institution=self.request.user,
+                        email=email,
+                        token=uuid.uuid4().hex,
+                        expires_at=expires_at,
+                        import_job=job,
+                        import_line=line,
+                        **profile,
+                    ))
+                    continue
+
+                expired = invitation.expires_at <= now
+                changed = any(getattr(invitation, name) != value for name, value in profile.items())
+                for name, value in profile.items():
+                    setattr(invitation, name, value)
+                invitation.expires_at = expires_at
+                if changed or expired or invitation.status == StudentInvitation.Status.FAILED:
+                    # renvoyée avec ce fichier ; l'ancien lien ne vaut plus rien si elle a expiré
+                    if expired:
+                        invitation.token = uuid.uuid4().hex
+                    invitation.status = StudentInvitation.Status.PENDING
+                    invitation.error_message = ""
+                    invitation.attempts = 0
+                    invitation.max_attempts = 1
+                    invitation.next_attempt_at = None
+                    invitation.import_job = job
+                    invitation.import_line = line
+                    queued += 1
+                else:
+                    job.unchanged += 1
+                updated.append(invitation)
+
+            StudentInvitation.objects.bulk_update(updated, UPSERT_FIELDS, batch_size=500)
+            StudentInvitation.objects.bulk_create(invitations, batch_size=500)
+            queued += len(invitations)
+
+        job.errors = errors
+        if queued:
+            enqueue("process_invitation_import", priority=PRIORITY_BULK, import_id=str(job.pk))
+        else:
+            job.status = InvitationImport.Status.DONE
+            job.finished_at = timezone.now()
+        job.save(update_fields=["errors", "unchanged", "status", "finished_at"])
+        return job
+
+
+@require_GET
+def import_status(request, pk):
+    """Fragment HTMX interrogé pendant l'envoi : compteurs et erreurs de l'import."""
+    if not request.user.is_authenticated:
+        raise Http404()
+    job = get_object_or_404(InvitationImport, pk=pk, institution=request.user)
+    return render(
+        request,
+        "invitations/partials/import_progress.html",
+        {"job": job, "report": job.get_report()},
+    )
+
+
+@require_POST
+def retry_invitations(request):
+    """Relance les invitations en échec ou expirées ; répond par le suivi de l'envoi."""
+    if not request.user.is_authenticated or request.user.role != User.Role.INSTITUTION:
+        raise Http404("Réservé aux établissements.")
+    job = dispatch.retry_invitations(request.user, request.build_absolute_uri("/"))
+    if job is None:
+        return HttpResponse('<p class="text-sm text-slate-700">Aucune invitation à relancer.</p>')
+    return render(
+        request,
+        "invitations/partials/import_progress.html",
+        {"job": job, "report": job.get_report()},
+    )
 
 
 @require_GET
@@ -137,86 +230,28 @@ def download_csv_model(request):
 @require_POST
 def preview_csv(request):
     if request.FILES.get("csv_file"):
-        file = request.FILES["csv_file"]
-        raw_data = file.read(4096)
-        file.seek(0)
-
-        text = _detect_encoding(raw_data)
-        if not text:
-             return render(request, "invitations/partials/csv_preview.html", {"rows": []})
-
-        delimiter = _detect_delimiter(text)
-        rows = _parse_csv_rows(text, delimiter)
-        rows = _cleanup_rows(rows, delimiter)
-
-        return render(request, "invitations/partials/csv_preview.html", {"rows": rows})
+        # même analyse que l'import, gardée en cache pour l'étape suivante
+        sniffed = csv_sniff.sniff(request.FILES["csv_file"])
+        return render(
+            request,
+            "invitations/partials/csv_preview.html",
+            {"rows": sniffed["preview"], "row_count": sniffed["rows"]},
+        )
 
     return HttpResponse("")
 
 
+# aides historiques de la prévisualisation, désormais dans accounts.csv_sniff
 def _detect_encoding(raw_data):
-    try:
-        return raw_data.decode("utf-8")
-    except UnicodeDecodeError:
-        try:
-            text = raw_data.decode("cp1252")
-            if "\u201a" in text or "\u2026" in text or "\u2021" in text:
-                return raw_data.decode("cp850")
-            return text
-        except UnicodeDecodeError:
-            return raw_data.decode("latin-1", errors="replace")
-
-
-def _detect_delimiter(text):
-    first_line = text.splitlines()[0] if text else ""
-    delimiter = ","
-    if first_line:
-        semi = first_line.count(";")
-        comma = first_line.count(",")
-        tab = first_line.count("\t")
-        if semi > comma and semi > tab:
-            delimiter = ";"
-        elif tab > comma and tab > semi:
-            delimiter = "\t"
-    return delimiter
-
-
-def _parse_csv_rows(text, delimiter):
-    rows = []
-    if text:
-        lines = text.splitlines()
-        reader = csv.reader(lines, delimiter=delimiter)
-        try:
-            for i, row in enumerate(reader):
-                if i >= 6:
-                    break
-                if row:
-                    if i == 0 and row and row[0].startswith("\ufeff"):
-                        row[0] = row[0].replace("\ufeff", "")
-                    rows.append(row)
-        except csv.Error:
-            pass
-    return rows
+    return csv_sniff.detect_encoding(raw_data)[1]
+
+
+_detect_delimiter = csv_sniff.detect_delimiter
+_parse_csv_rows = csv_sniff.parse_rows
 
 
 def _cleanup_rows(rows, delimiter):
     # Handle case where delimiter sniffer failed and everything is in one cell
-    if rows and len(rows[0]) == 1:
-        first_cell = rows[0][0]
-        if delimiter in first_cell:
-            new_rows = []
-            for row in rows:
-                if len(row) == 1:
-                    content = row[0]
-                    if content.startswith('"') and content.endswith('"'):
-                        content = content[1:-1]
-                    sub_reader = csv.reader([content], delimiter=delimiter)
-                    try:
-                        new_row = next(sub_reader)
-                        new_rows.append(new_row)
-                    except StopIteration:
-                        new_rows.append(row)
-                else:
-                    new_rows.append(row)
-            return new_rows
+    if rows and csv_sniff.is_wrapped(rows[0], delimiter):
+        return [csv_sniff.unwrap_row(row, delimiter) for row in rows]
     return rows
@@ -0,0 +1,39 @@
+"""Moteurs de recherche des offres, choisis par ``OFFERS_SEARCH_BACKEND``.
+
+Un moteur restreint un queryset au texte et au lieu recherchés, puis le
+classe. Les filtres structurés (pays,
+contrat, durée, facettes) et la recherche approchée restent en SQL quel que
+soit le moteur.
+
+- ``DatabaseSearchBackend`` (par défaut) : plein texte et trigrammes
+  PostgreSQL, classement par pertinence.
+"""
+import functools
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .search import filter_location, filter_search, rank_offers
+
+
+class DatabaseSearchBackend:
+    def filter(self, queryset, text, location):
+        if text:
+            queryset = filter_search(queryset, text)
+        if location:
+            queryset = filter_location(queryset, location)
+        return queryset
+
+    def rank(self, queryset, text, boost=None):
+        return rank_offers(queryset, text, boost) if text else queryset
+
+
+@functools.lru_cache(maxsize=None)
+def _load_backend(path):
+    return import_string(path)()
+
+
+def get_search_backend():
+    return _load_backend(
+        getattr(settings, "OFFERS_SEARCH_BACKEND", "offers.backends.DatabaseSearchBackend")
+    )
@@ -0,0 +1,104 @@
+"""Cache des résultats de la liste des offres.
+
+Une entrée par page (requête et lieu normalisés, curseur) : les identifiants
+ordonnés des offres et le nombre de résultats. Le contenu des cartes est
+relu en base à chaque fois, seule la recherche est évitée.
+
+Le cache utilise l'alias ``OFFERS_CACHE_ALIAS`` du framework de cache de
+Django (locmem par défaut, qui évince en LRU au-delà de ``MAX_ENTRIES`` ;
+un backend fichier ou Redis le partage entre plusieurs serveurs). Toute
+écriture sur une offre ou un profil d'organisation incrémente une
+génération incluse dans les clés, ce qui invalide toutes les entrées d'un
+coup sans avoir à les lister.
+"""
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from accounts.text import normalise
+
+GENERATION_KEY = "offers:generation"
+HITS_KEY = "offers:hits"
+MISSES_KEY = "offers:misses"
+# paramètres de texte libre, normalisés avant de servir de clé
+TEXT_PARAMS = ("q", "location")
+
+
+def get_cache():
+    return caches[getattr(settings, "OFFERS_CACHE_ALIAS", "default")]
+
+
+def _generation(cache):
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        # génération neuve (et non 0) si la clé a été évincée : les anciennes
+        # entrées ne peuvent pas redevenir valides
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def make_key(cache, params):
+    normalised = {
+        name: normalise(value or "") if name in TEXT_PARAMS else value
+        for name, value in sorted(params.items())
+    }
+    digest = hashlib.sha1(json.dumps(normalised).encode("utf-8")).hexdigest()
+    return f"offers:results:{_generation(cache)}:{digest}"
+
+
+def _increment(cache, key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def results_key(params):
+    """Clé de la page, à calculer avant la recherche.
+
+    La génération est lue avant d'exécuter la recherche : si une offre est
+    enregistrée pendant ce temps, le résultat est rangé sous l'ancienne
+    génération, déjà invalide, et jamais servi.
+    """
+    return make_key(get_cache(), params)
+
+
+def get_results(key):
+    cache = get_cache()
+    results = cache.get(key)
+    _increment(cache, HITS_KEY if results is not None else MISSES_KEY)
+    return results
+
+
+def set_results(key, results):
+    timeout = getattr(settings, "OFFERS_CACHE_TIMEOUT", 300)
+    get_cache().set(key, results, timeout=timeout)
+
+
+def get_generation():
+    return _generation(get_cache())
+
+
+def invalidate():
+    cache = get_cache()
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+
+
+def get_stats():
+    cache = get_cache()
+    hits = cache.get(HITS_KEY) or 0
+    misses = cache.get(MISSES_KEY) or 0
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / total, 4) if total else 0.0,
+    }
@@ -0,0 +1,50 @@
+"""Projection légère des offres pour les cartes de liste.
+
+Une seule requête : les colonnes affichées sur la carte, plus le nom, le logo
+et le lieu de l'organisation pris par jointure sur les deux profils possibles.
+La description (jusqu'à 10 000 caractères) et les champs de recherche ne sont
+jamais chargés.
+"""
+from django.core.files.storage import default_storage
+from django.db.models import CharField, F, Value
+from django.db.models.functions import Coalesce
+
+CARD_FIELDS = ("id", "title", "duration", "location", "contract_type", "remote", "created_at")
+
+
+def with_organisation(queryset):
+    return queryset.annotate(
+        organisation_name=Coalesce(
+            F("company__company_profile__organisation_name"),
+            F("company__institution_profile__organisation_name"),
+            Value(""),
+        ),
+        organisation_logo=Coalesce(
+            F("company__company_profile__logo"),
+            F("company__institution_profile__logo"),
+            Value(""),
+            output_field=CharField(),
+        ),
+        organisation_location=Coalesce(
+            F("company__company_profile__location"),
+            F("company__institution_profile__location"),
+            Value(""),
+        ),
+    )
+
+
+def offer_cards(queryset):
+    return with_organisation(queryset).only(*CARD_FIELDS)
+
+
+def as_card(offer):
+    return {
+        "offer": offer,
+        "logo_url": default_storage.url(offer.organisation_logo) if offer.organisation_logo else None,
+        "company_name": offer.organisation_name,
+    }
+
+
+def with_organisation_profiles(queryset):
+    """Pour les pages de détail : l'offre complète et son profil en une requête."""
+    return queryset.select_related("company__company_profile", "company__institution_profile")
@@ -0,0 +1,105 @@
+"""Filtres de la liste des offres et nombre de résultats par filtre.
+
+L'état des filtres vit dans la querystring (``contract``, ``remote``,
+``country``, ``recency``) pour que chaque combinaison reste une URL, donc
+une clé de cache. Tous les compteurs sont calculés en une seule requête :
+un GROUP BY sur le pays avec un ``COUNT(...) FILTER (WHERE ...)`` par valeur
+de filtre, puis une somme des groupes en Python. Le compteur d'un filtre
+tient compte des autres filtres actifs mais pas de lui-même, pour que les
+autres valeurs restent sélectionnables.
+"""
+from datetime import timedelta
+
+from django.db.models import Count, Q
+
+from accounts.countries import get_country_label
+from accounts.models import Offer
+
+RECENCY_CHOICES = (
+    ("1", "Dernières 24 heures"),
+    ("7", "7 derniers jours"),
+    ("30", "30 derniers jours"),
+)
+FILTER_PARAMS = ("contract", "remote", "country", "recency")
+
+
+def parse_filters(data):
+    contract = data.get("contract", "")
+    country = data.get("country", "").strip().upper()
+    recency = data.get("recency", "")
+    return {
+        "contract": contract if contract in Offer.ContractType.values else "",
+        "remote": "1" if data.get("remote") == "1" else "",
+        "country": country if len(country) == 2 and country.isalpha() else "",
+        "recency": recency if recency in dict(RECENCY_CHOICES) else "",
+    }
+
+
+def _conditions(filters, now):
+    conditions = {}
+    if filters["contract"]:
+        conditions["contract"] = Q(contract_type=filters["contract"])
+    if filters["remote"]:
+        conditions["remote"] = Q(remote=True)
+    if filters["country"]:
+        conditions["country"] = Q(country_code=filters["country"])
+    if filters["recency"]:
+        conditions["recency"] = Q(created_at__gte=now - timedelta(days=int(filters["recency"])))
+    return conditions
+
+
+def apply_filters(queryset, filters, now):
+    for condition in _conditions(filters, now).values():
+        queryset = queryset.filter(condition)
+    return queryset
+
+
+def facet_counts(queryset, filters, now):
+    conditions = _conditions(filters, now)
+
+    def others(name):
+        # tous les filtres actifs sauf celui qu'on compte
+        combined = Q()
+        for key, condition in conditions.items():
+            if key != name:
+                combined &= condition
+        return combined
+
+    aggregates = {"country_total": Count("pk", filter=others("country"))}
+    for value, _label in Offer.ContractType.choices:
+        aggregates[f"contract_{value}"] = Count(
+            "pk", filter=Q(contract_type=value) & others("contract")
+        )
+    aggregates["remote_1"] = Count("pk", filter=Q(remote=True) & others("remote"))
+    for value, _label in RECENCY_CHOICES:
+        aggregates[f"recency_{value}"] = Count(
+            "pk",
+            filter=Q(created_at__gte=now - timedelta(days=int(value))) & others("recency"),
+        )
+    groups = queryset.order_by().values("country_code").annotate(**aggregates)
+
+    totals = dict.fromkeys(aggregates, 0)
+    countries = {}
+    for group in groups:
+        if group["country_total"] and group["country_code"]:
+            countries[group["country_code"]] = group["country_total"]
+        # les groupes d'un autre pays ne comptent pas si un pays est choisi
+        if filters["country"] and group["country_code"] != filters["country"]:
+            continue
+        for key in aggregates:
+            totals[key] += group[key]
+
+    return {
+        "contract": [
+            (value, label, totals[f"contract_{value}"])
+            for value, label in Offer.ContractType.choices
+        ],
+        "remote": totals["remote_1"],
+        "recency": [
+            (value, label, totals[f"recency_{value}"]) for value, label in RECENCY_CHOICES
+        ],
+        "country": sorted(
+            ((code, get_country_label(code), count) for code, count in countries.items()),
+            key=lambda item: item[1],
+        ),
+    }
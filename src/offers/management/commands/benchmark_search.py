@@ -0,0 +1,246 @@
+"""Mesure la liste des offres pour chaque stratégie de recherche.
+
+Pour chaque taille, insère des organisations et des offres dans une
+transaction annulée à la fin, puis rejoue un jeu fixe de requêtes sur la vue
+de liste. Les stratégies couvrent la recherche plein texte (avec ou sans
+cache), la recherche approchée par trigrammes (``fuzzy=1``) et le fragment
+« Voir plus », qui ne compte pas les résultats. Le rapport JSON donne, par
+stratégie et par requête, les latences p50/p95, le nombre de requêtes SQL et
+le pic mémoire Python (tracemalloc).
+
+    python manage.py benchmark_search --sizes 1000,10000 --output bench.json
+"""
+import json
+import random
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import CompanyProfile, InstitutionProfile, Offer, User
+from offers import cache as search_cache
+from offers.query_parser import parse_duration_months
+from offers.search import refresh_search_fields
+from offers.views import OffersListMoreView, OffersListView
+
+# pays des organisations, pondérés comme la clientèle attendue
+COUNTRIES = (
+    ("FR", 60), ("DE", 8), ("BE", 6), ("ES", 5), ("CH", 4), ("IT", 4),
+    ("GB", 4), ("US", 3), ("CA", 3), ("AE", 2), ("LU", 1),
+)
+CITIES = {
+    "FR": ("Paris", "Lyon", "Limoges", "Bordeaux", "Lille", "Nantes"),
+    "DE": ("Berlin", "München", "Hamburg"),
+    "BE": ("Bruxelles", "Liège"),
+    "ES": ("Madrid", "Barcelona"),
+    "CH": ("Genève", "Lausanne"),
+    "IT": ("Milano", "Torino"),
+    "GB": ("London", "Manchester"),
+    "US": ("New York", "Austin"),
+    "CA": ("Montréal", "Québec"),
+    "AE": ("Dubai",),
+    "LU": ("Luxembourg",),
+}
+TITLES = (
+    "Développeur Python", "Développeur web", "Data analyst", "Ingénieur logiciel",
+    "Assistant marketing", "Chargé de communication", "Comptable", "Technicien réseau",
+    "Chef de projet", "Designer UX", "Juriste", "Ingénieur DevOps",
+)
+SKILLS = ("Python", "Django", "SQL", "Java", "React", "Excel", "Figma", "Linux", "Docker")
+DURATIONS = ("2 mois", "3 mois", "6 mois", "12 semaines", "1 an")
+
+QUERIES = {
+    "bare": {},
+    "q": {"q": "développeur"},
+    "location": {"location": "allemagne"},
+    "q_location": {"q": "python", "location": "paris"},
+    "no_hit": {"q": "xylophoniste"},
+}
+STRATEGIES = {
+    "database": {"backend": "offers.backends.DatabaseSearchBackend", "cache": False},
+    "database_cached": {"backend": "offers.backends.DatabaseSearchBackend", "cache": True},
+    # recherche approchée : seuil word_similarity et classement par trigrammes
+    "fuzzy": {
+        "backend": "offers.backends.DatabaseSearchBackend", "cache": False, "params": {"fuzzy": "1"},
+    },
+    # « Voir plus » : la page sans comptage ni facettes
+    "more": {"backend": "offers.backends.DatabaseSearchBackend", "cache": False, "view": "list_more"},
+}
+VIEWS = {
+    "list": OffersListView,
+    "list_more": OffersListMoreView,
+}
+# cache des résultats pendant la mesure
+BENCHMARK_CACHE_ALIAS = "offers_benchmark"
+BENCHMARK_CACHE = {
+    "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    "LOCATION": "offers-benchmark",
+}
+
+
+class Rollback(Exception):
+    pass
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+class Command(BaseCommand):
+    help = "Mesure la recherche d'offres (latence, requêtes SQL, mémoire) par stratégie."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="1000,10000,100000")
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--strategies", default=",".join(STRATEGIES))
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--output", help="fichier JSON ; sortie standard sinon")
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options["sizes"].split(",")]
+        except ValueError as exc:
+            raise CommandError("--sizes attend des entiers séparés par des virgules") from exc
+        strategies = options["strategies"].split(",")
+        unknown = set(strategies) - set(STRATEGIES)
+        if unknown:
+            raise CommandError(f"stratégies inconnues : {', '.join(sorted(unknown))}")
+
+        report = {
+            "generated_at": timezone.now().isoformat(),
+            "repeat": options["repeat"],
+            "queries": QUERIES,
+            "sizes": {},
+        }
+        # cache privé au processus : vider le cache des offres, qui peut être
+        # partagé avec les serveurs en production, n'est jamais nécessaire
+        caches = {**settings.CACHES, BENCHMARK_CACHE_ALIAS: BENCHMARK_CACHE}
+        with override_settings(CACHES=caches, OFFERS_CACHE_ALIAS=BENCHMARK_CACHE_ALIAS):
+            for size in sizes:
+                self.stderr.write(f"{size} offres...")
+                report["sizes"][str(size)] = self.run_size(
+                    size, strategies, options["repeat"], random.Random(options["seed"])
+                )
+
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as handle:
+                handle.write(output + "\n")
+        else:
+            self.stdout.write(output)
+
+    def run_size(self, size, strategies, repeat, rng):
+        results = {}
+        try:
+            with transaction.atomic():
+                self.seed(size, rng)
+                for name in strategies:
+                    results[name] = self.run_strategy(STRATEGIES[name], repeat)
+                raise Rollback()
+        except Rollback:
+            pass
+        finally:
+            # le cache décrit des offres annulées
+            search_cache.get_cache().clear()
+        return results
+
+    def seed(self, size, rng):
+        countries, weights = zip(*COUNTRIES)
+        organisations = []
+        for number in range(max(size // 50, 10)):
+            role = User.Role.INSTITUTION if number % 5 == 0 else User.Role.COMPANY
+            email = f"bench-{size}-{number}@bench.invalid"
+            user = User(username=email, email=email, role=role, is_active=True)
+            organisations.append((user, rng.choices(countries, weights)[0]))
+        User.objects.bulk_create([user for user, _country in organisations], batch_size=1000)
+
+        companies, institutions = [], []
+        for number, (user, country) in enumerate(organisations):
+            fields = {
+                "user": user,
+                "organisation_name": f"Organisation {number}",
+                "location": rng.choice(CITIES[country]),
+                "country_code": country,
+                "is_approved": True,
+            }
+            if user.role == User.Role.INSTITUTION:
+                institutions.append(InstitutionProfile(**fields))
+            else:
+                companies.append(CompanyProfile(**fields))
+        CompanyProfile.objects.bulk_create(companies, batch_size=1000)
+        InstitutionProfile.objects.bulk_create(institutions, batch_size=1000)
+
+        offers = []
+        for _number in range(size):
+            user, country = rng.choice(organisations)
+            duration = rng.choice(DURATIONS)
+            offers.append(
+                Offer(
+                    company=user,
+                    title=rng.choice(TITLES),
+                    skills=", ".join(rng.sample(SKILLS, 3)),
+                    location=rng.choice(CITIES[country]),
+                    contract_type=rng.choice(Offer.ContractType.values),
+                    remote=rng.random() < 0.2,
+                    duration=duration,
+                    duration_months=parse_duration_months(duration),
+                    description="Offre générée pour la mesure des performances.",
+                )
+            )
+        Offer.objects.bulk_create(offers, batch_size=2000)
+        # bulk_create ne déclenche pas les signaux : une mise à jour par organisation
+        profiles = {profile.user_id: profile for profile in companies + institutions}
+        for user, _country in organisations:
+            refresh_search_fields(user, profiles[user.pk])
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE accounts_offer")
+
+    def run_strategy(self, strategy, repeat):
+        results = {}
+        view = strategy.get("view", "list")
+        with override_settings(OFFERS_SEARCH_BACKEND=strategy["backend"]):
+            search_cache.get_cache().clear()
+            for name, params in QUERIES.items():
+                params = {**params, **strategy.get("params", {})}
+                results[name] = self.measure(view, params, strategy["cache"], repeat)
+        return results
+
+    def request(self, view, params):
+        request = RequestFactory().get(reverse(f"offers:{view}"), params)
+        request.user = AnonymousUser()
+        response = VIEWS[view].as_view()(request)
+        response.render()
+
+    def measure(self, view, params, cached, repeat):
+        if cached:
+            # entrée chaude : seule la lecture du cache et des cartes est mesurée
+            self.request(view, params)
+        timings = []
+        for _run in range(repeat):
+            if not cached:
+                search_cache.get_cache().clear()
+            started = time.perf_counter()
+            self.request(view, params)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        if not cached:
+            search_cache.get_cache().clear()
+        tracemalloc.start()
+        with CaptureQueriesContext(connection) as queries:
+            self.request(view, params)
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return {
+            "p50_ms": round(percentile(timings, 0.50), 3),
+            "p95_ms": round(percentile(timings, 0.95), 3),
+            "queries": len(queries),
+            "peak_kib": round(peak / 1024, 1),
+        }
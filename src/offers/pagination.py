@@ -0,0 +1,108 @@
+"""Pagination par curseur (keyset) pour la liste des offres.
+
+Le curseur encode les valeurs des colonnes de tri de la dernière offre
+affichée ; la page suivante filtre directement dessus au lieu d'un OFFSET,
+donc le coût ne dépend pas de la profondeur de la page.
+"""
+import base64
+import binascii
+import json
+import math
+import uuid
+from datetime import datetime
+
+from django.db.models import Q
+
+
+def encode_cursor(values):
+    raw = json.dumps([str(value) for value in values]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _parse_datetime(value):
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        raise ValueError("naive datetime")
+    return parsed
+
+
+def _parse_float(value):
+    parsed = float(value)
+    if not math.isfinite(parsed):
+        raise ValueError("non-finite float")
+    return parsed
+
+
+# relecture des valeurs du curseur, par colonne de tri : une valeur qui ne se
+# relit pas rend le curseur invalide au lieu d'échouer dans la requête
+CURSOR_PARSERS = {
+    "created_at": _parse_datetime,
+    "id": uuid.UUID,
+    "rank": _parse_float,
+}
+
+
+def decode_cursor(token, ordering):
+    """Retourne les valeurs du curseur, ou None s'il est absent ou invalide."""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError):
+        return None
+    if not isinstance(values, list) or len(values) != len(ordering):
+        return None
+    if not all(isinstance(value, str) for value in values):
+        return None
+    try:
+        return [
+            CURSOR_PARSERS[name.lstrip("-")](value) for name, value in zip(ordering, values)
+        ]
+    except ValueError:
+        return None
+
+
+def _after_filter(ordering, values):
+    # (a, b, c) après (x, y, z) : a < x OU (a = x ET b < y) OU ...
+    # la première borne (a <= x) permet à l'index de démarrer au bon endroit
+    fields = [name.lstrip("-") for name in ordering]
+    lookups = ["lt" if name.startswith("-") else "gt" for name in ordering]
+    condition = Q()
+    for index, field in enumerate(fields):
+        branch = Q(**{f"{field}__{lookups[index]}": values[index]})
+        for previous in range(index):
+            branch &= Q(**{fields[previous]: values[previous]})
+        condition |= branch
+    start = "lte" if lookups[0] == "lt" else "gte"
+    return Q(**{f"{fields[0]}__{start}": values[0]}) & condition
+
+
+def paginate_keyset(queryset, ordering, cursor, page_size):
+    """Retourne (offres de la page, curseur suivant ou None)."""
+    queryset = queryset.order_by(*ordering)
+    values = decode_cursor(cursor, ordering)
+    if values is not None:
+        queryset = queryset.filter(_after_filter(ordering, values))
+    items = list(queryset[: page_size + 1])
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, name.lstrip("-")) for name in ordering)
+    return items, next_cursor
+
+
+def count_offers(queryset, exact_limit):
+    """Compte exact pour les petits ensembles, estimation du planificateur au-delà.
+
+    Le comptage exact est borné par LIMIT : il ne parcourt jamais plus de
+    ``exact_limit + 1`` lignes. Retourne (nombre, est_une_estimation).
+    """
+    queryset = queryset.order_by()
+    bounded = queryset[: exact_limit + 1].count()
+    if bounded <= exact_limit:
+        return bounded, False
+    plan = json.loads(queryset.explain(format="json"))
+    estimate = int(plan[0]["Plan"]["Plan Rows"])
+    return max(estimate, bounded), True
@@ -0,0 +1,188 @@
+"""Analyse de la barre de recherche combinée.
+
+« Développeur web - Allemagne - 6 mois » donne :
+
+- pays : ``{"DE"}`` (noms et alias de ``accounts.countries``) ;
+- durée : 6 mois ;
+- type de contrat, si un mot-clé est présent (« stage », « alternance »...) ;
+- texte : « Développeur web », seule partie envoyée à la recherche plein texte.
+
+Chaque partie reconnue devient un filtre sur une colonne indexée de l'offre.
+Un nom de pays n'est un filtre que s'il désigne clairement un lieu : après
+« à », « en », « au », « aux » ou « in », ou seul dans un segment de la
+requête (« ... - Allemagne - ... », ou la requête entière). Ailleurs
+(« réunion client », « canada dry »), les mots restent du texte cherché et
+le pays ne fait que remonter les offres situées dans ce pays.
+"""
+import functools
+import re
+
+from django.db.models import Case, FloatField, Q, Value, When
+
+from accounts.countries import EXTRA_ALIASES, get_country_name_index, get_country_search_names
+from accounts.models import Offer
+from accounts.text import normalise
+
+CONTRACT_KEYWORDS = {
+    "stage": Offer.ContractType.STAGE,
+    "stages": Offer.ContractType.STAGE,
+    "stagiaire": Offer.ContractType.STAGE,
+    "internship": Offer.ContractType.STAGE,
+    "alternance": Offer.ContractType.ALTERNANCE,
+    "alternant": Offer.ContractType.ALTERNANCE,
+    "apprenti": Offer.ContractType.ALTERNANCE,
+    "apprentissage": Offer.ContractType.ALTERNANCE,
+}
+
+# nombre de mois par unité de durée (clés normalisées, comme le texte analysé)
+DURATION_UNITS = {normalise(unit): months for unit, months in {
+    "mois": 1,
+    "month": 1,
+    "months": 1,
+    "semaine": 12 / 52,
+    "semaines": 12 / 52,
+    "sem": 12 / 52,
+    "week": 12 / 52,
+    "weeks": 12 / 52,
+    "an": 12,
+    "ans": 12,
+    "année": 12,
+    "années": 12,
+    "year": 12,
+    "years": 12,
+}.items()}
+DURATION_RE = re.compile(
+    r"(?<!\w)(\d{1,3})\s*(" + "|".join(sorted(DURATION_UNITS, key=len, reverse=True)) + r")(?!\w)",
+    re.IGNORECASE,
+)
+CONTRACT_RE = re.compile(r"(?<!\w)(" + "|".join(CONTRACT_KEYWORDS) + r")(?!\w)")
+SEPARATORS_RE = re.compile(r"[\s\-–—,;/|]+")
+WORD_RE = re.compile(r"\w+")
+
+
+def parse_duration_months(text):
+    """« 6 mois » -> 6, « 12 semaines » -> 3, « 1 an » -> 12 ; None sinon."""
+    match = DURATION_RE.search(normalise(text))
+    if not match:
+        return None
+    months = round(int(match.group(1)) * DURATION_UNITS[match.group(2)])
+    return max(months, 1)
+
+
+# mots qui introduisent un lieu (« à » et « a » sont confondus une fois normalisés)
+LOCATION_PREPOSITIONS = ("a", "en", "au", "aux", "in")
+# séparateurs de segments : tirets entourés d'espaces, virgules... mais pas le
+# trait d'union de « Royaume-Uni »
+SEGMENT_RE = re.compile(r"\s[\-–—]\s|[,;/|]")
+# bonus ajouté à la pertinence des offres situées dans un pays seulement évoqué
+COUNTRY_HINT_BOOST = 0.1
+
+
+@functools.lru_cache(maxsize=1)
+def _country_names():
+    # les codes seuls (« de », « es »...) sont des mots courants : seuls les
+    # noms et les alias explicites sont reconnus dans le texte libre
+    aliases = {normalise(alias) for names in EXTRA_ALIASES.values() for alias in names}
+    return frozenset(name for name in get_country_name_index() if len(name) > 2 or name in aliases)
+
+
+def _names_alternation():
+    return "|".join(re.escape(name) for name in sorted(_country_names(), key=len, reverse=True))
+
+
+@functools.lru_cache(maxsize=1)
+def _country_pattern():
+    return re.compile(r"(?<!\w)(" + _names_alternation() + r")(?!\w)")
+
+
+@functools.lru_cache(maxsize=1)
+def _located_country_pattern():
+    prepositions = "|".join(LOCATION_PREPOSITIONS)
+    names = _names_alternation()
+    return re.compile(r"(?<!\w)(?:" + prepositions + r")\s+(" + names + r")(?!\w)")
+
+
+def _parse_countries(text):
+    """(pays filtrés, pays évoqués, texte sans les pays filtrés)."""
+    index = get_country_name_index()
+    countries = set()
+    segments = []
+    for segment in SEGMENT_RE.split(text):
+        name = segment.strip()
+        if name in _country_names():
+            countries |= index[name]
+            segment = " "
+        segments.append(segment)
+    text = " - ".join(segments)
+
+    for match in _located_country_pattern().finditer(text):
+        countries |= index[match.group(1)]
+    text = _located_country_pattern().sub(" ", text)
+
+    hints = set()
+    for match in _country_pattern().finditer(text):
+        hints |= index[match.group(1)]
+    return countries, hints - countries, text
+
+
+def parse_query(query):
+    countries, hints, text = _parse_countries(normalise(query))
+
+    duration_months = parse_duration_months(text)
+    if duration_months is not None:
+        text = DURATION_RE.sub(" ", text, count=1)
+
+    contract = ""
+    match = CONTRACT_RE.search(text)
+    if match:
+        contract = CONTRACT_KEYWORDS[match.group(1)]
+        text = CONTRACT_RE.sub(" ", text)
+
+    return {
+        "text": SEPARATORS_RE.sub(" ", text).strip(),
+        "countries": sorted(countries),
+        "country_hints": sorted(hints),
+        "contract": contract,
+        "duration_months": duration_months,
+    }
+
+
+def normalise_place(text):
+    """Lieu réduit à ses mots normalisés : « Berlin, Allemagne » -> « berlin allemagne »."""
+    return " ".join(WORD_RE.findall(normalise(text).replace("_", " ")))
+
+
+def place_condition(codes):
+    """Le lieu de l'offre elle-même nomme l'un des pays (mots entiers)."""
+    names = {
+        normalise_place(name)
+        for code in codes
+        for name in get_country_search_names(code)
+        if name in _country_names()
+    }
+    if not names:
+        return Q(pk__in=[])
+    pattern = "|".join(sorted(names, key=len, reverse=True))
+    # \m et \M : début et fin de mot dans les expressions de PostgreSQL
+    return Q(place_search__regex=r"\m(" + pattern + r")\M")
+
+
+def country_hint_boost(parsed):
+    """Bonus de pertinence des offres situées dans un pays évoqué, ou None."""
+    if not parsed["country_hints"]:
+        return None
+    return Case(
+        When(place_condition(parsed["country_hints"]), then=Value(COUNTRY_HINT_BOOST)),
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+
+
+def apply_parsed_query(queryset, parsed):
+    if parsed["countries"]:
+        queryset = queryset.filter(place_condition(parsed["countries"]))
+    if parsed["contract"]:
+        queryset = queryset.filter(contract_type=parsed["contract"])
+    if parsed["duration_months"] is not None:
+        queryset = queryset.filter(duration_months=parsed["duration_months"])
+    return queryset
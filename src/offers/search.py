@@ -0,0 +1,204 @@
+"""Recherche sur les offres (PostgreSQL).
+
+Chaque offre porte des champs dénormalisés, recalculés à l'enregistrement
+de l'offre (un UPDATE) ou au changement du nom ou du pays de son
+organisation (un ``bulk_update``). Le texte
+y est stocké normalisé par ``accounts.text.normalise`` (casse et accents),
+comme les requêtes entrantes :
+
+- ``search_vector`` : vecteur pondéré, titre (A) > compétences et type de
+  contrat (B) > nom de l'organisation (C) > description (D), racinisé en
+  français ;
+- ``location_search`` : lieu de l'offre et noms du pays de l'organisation,
+  indexé en trigrammes pour les recherches ``LIKE`` ;
+- ``place_search`` : lieu de l'offre seule, réduit à ses mots, indexé en
+  trigrammes pour les pays nommés dans la barre de recherche ;
+- ``fuzzy_search`` : titre, compétences et nom de l'organisation, indexé en trigrammes pour la recherche approchée,
+  les morceaux de mots (« script » dans « JavaScript ») et les requêtes faites seulement de mots vides ;
+- ``country_code`` : pays de l'organisation, pour le filtre par pays ;
+- ``duration_months`` : durée du champ libre ``duration``, en mois.
+"""
+import functools
+import re
+from contextlib import contextmanager
+
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramWordSimilarity,
+)
+from django.db import connection, transaction
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import Cast
+
+from accounts.countries import get_country_search_names
+from accounts.models import Offer
+from accounts.text import normalise
+
+from .query_parser import normalise_place, parse_duration_months
+
+SEARCH_CONFIG = "french"
+
+# ordres totaux, utilisés aussi comme clés du curseur de pagination
+LIST_ORDERING = ("-created_at", "-id")
+SEARCH_ORDERING = ("-rank", "-created_at", "-id")
+SEARCH_FIELDS = (
+    "search_vector", "fuzzy_search", "location_search", "place_search", "country_code", "duration_months"
+)
+
+# seuls les caractères de mot passent dans la requête brute to_tsquery
+TOKEN_RE = re.compile(r"\w+")
+
+
+def get_organisation_profile(user):
+    return getattr(user, "company_profile", None) or getattr(user, "institution_profile", None)
+
+
+# colonnes lues pour recalculer les champs de recherche d'une offre
+SOURCE_FIELDS = ("id", "title", "skills", "contract_type", "description", "location", "duration")
+
+
+def build_search_vector(offer, organisation_name):
+    return (
+        SearchVector(Value(normalise(offer.title)), weight="A", config=SEARCH_CONFIG)
+        + SearchVector(
+            Value(normalise(f"{offer.skills} {offer.contract_type}")), weight="B", config=SEARCH_CONFIG
+        )
+        + SearchVector(Value(normalise(organisation_name)), weight="C", config=SEARCH_CONFIG)
+        + SearchVector(Value(normalise(offer.description)), weight="D", config=SEARCH_CONFIG)
+    )
+
+
+def build_location_search(location, country_code):
+    names = get_country_search_names(country_code) if country_code else []
+    return normalise(" ".join([location, *names]))
+
+
+def build_fuzzy_search(offer, organisation_name):
+    return normalise(f"{offer.title} {offer.skills} {organisation_name}")
+
+
+def build_search_fields(offer, profile):
+    country_code = (profile.country_code if profile else "").upper()
+    organisation_name = profile.organisation_name if profile else ""
+    return {
+        "search_vector": build_search_vector(offer, organisation_name),
+        "fuzzy_search": build_fuzzy_search(offer, organisation_name),
+        "location_search": build_location_search(offer.location, country_code),
+        "place_search": normalise_place(offer.location),
+        "country_code": country_code,
+        "duration_months": parse_duration_months(offer.duration),
+    }
+
+
+def refresh_search_fields(company, profile=None):
+    """Recalcule par lots les champs de recherche des offres d'une organisation."""
+    if profile is None:
+        profile = get_organisation_profile(company)
+    offers = list(Offer.objects.filter(company=company).only(*SOURCE_FIELDS))
+    for offer in offers:
+        for name, value in build_search_fields(offer, profile).items():
+            setattr(offer, name, value)
+    Offer.objects.bulk_update(offers, SEARCH_FIELDS, batch_size=500)
+
+
+def refresh_offer_search_fields(offer):
+    profile = get_organisation_profile(offer.company)
+    Offer.objects.filter(pk=offer.pk).update(**build_search_fields(offer, profile))
+
+
+@functools.lru_cache(maxsize=1024)
+def _is_empty_tsquery(raw):
+    # to_tsquery retire les mots vides (« de », « la »...) : la liste est celle
+    # de PostgreSQL, fixe pour une configuration, donc gardée par processus
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT numnode(to_tsquery(%s::regconfig, %s)) = 0", [SEARCH_CONFIG, raw])
+        return cursor.fetchone()[0]
+
+
+def build_search_query(query):
+    """Chaque mot devient un préfixe (« dev » trouve « développeur »), tous requis.
+
+    None si la requête n'a aucun mot ou seulement des mots vides : la requête
+    plein texte serait vide et ne trouverait rien.
+    """
+    tokens = TOKEN_RE.findall(normalise(query).replace("_", " "))
+    if not tokens:
+        return None
+    raw = " & ".join(f"{token}:*" for token in tokens)
+    if _is_empty_tsquery(raw):
+        return None
+    return SearchQuery(raw, search_type="raw", config=SEARCH_CONFIG)
+
+
+def filter_plain(queryset, query):
+    """La phrase telle quelle dans le titre, les compétences ou le nom de l'organisation."""
+    text = normalise(query)
+    if not text:
+        return queryset
+    return queryset.filter(fuzzy_search__contains=text)
+
+
+def filter_search(queryset, query):
+    """Filtre sans classement, pour les comptages.
+
+    Une requête faite seulement de mots vides (« de la ») est cherchée telle
+    quelle par ``filter_plain``, comme l'ancienne recherche ``icontains``.
+    Sinon, la phrase trouvée au milieu d'un mot du titre, des compétences ou
+    du nom de l'organisation compte aussi, ce que les préfixes du plein texte
+    ne voient pas ; dans la description, seuls les mots et leurs préfixes.
+    """
+    search_query = build_search_query(query)
+    if search_query is None:
+        return filter_plain(queryset, query)
+    return queryset.filter(Q(search_vector=search_query) | Q(fuzzy_search__contains=normalise(query)))
+
+
+def rank_offers(queryset, query, boost=None):
+    """Classe par ts_rank (plus ``boost``) un queryset déjà filtré par filter_search."""
+    search_query = build_search_query(query)
+    if search_query is None:
+        return queryset
+    rank = SearchRank(F("search_vector"), search_query)
+    if boost is not None:
+        rank += boost
+    return (
+        # ts_rank rend un real : en double, la valeur relue dans le curseur
+        # se compare exactement à celle calculée par PostgreSQL
+        queryset.annotate(rank=Cast(rank, FloatField()))
+        .order_by(*SEARCH_ORDERING)
+    )
+
+
+def filter_fuzzy(queryset, query):
+    """Mots proches (fautes de frappe) : word_similarity au-dessus du seuil."""
+    return queryset.filter(fuzzy_search__trigram_word_similar=normalise(query))
+
+
+def rank_fuzzy(queryset, query, boost=None):
+    similarity = TrigramWordSimilarity(normalise(query), "fuzzy_search")
+    if boost is not None:
+        similarity += boost
+    return queryset.annotate(rank=Cast(similarity, FloatField())).order_by(*SEARCH_ORDERING)
+
+
+@contextmanager
+def similarity_threshold(threshold):
+    """Fixe le seuil de l'opérateur %> (indexé) le temps d'une transaction."""
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT set_config('pg_trgm.word_similarity_threshold', %s, true)", [str(threshold)]
+        )
+        yield
+
+
+def get_ordering(queryset):
+    return SEARCH_ORDERING if "rank" in queryset.query.annotations else LIST_ORDERING
+
+
+def filter_location(queryset, location):
+    """Chaque mot du lieu doit apparaître dans le lieu ou les noms du pays."""
+    for term in normalise(location).split():
+        queryset = queryset.filter(location_search__contains=term)
+    return queryset
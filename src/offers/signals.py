@@ -0,0 +1,49 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from accounts.models import CompanyProfile, InstitutionProfile, Offer
+
+from . import cache as search_cache
+from .search import refresh_offer_search_fields, refresh_search_fields
+
+
+@receiver(post_save, sender=Offer)
+def offer_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    refresh_offer_search_fields(instance)
+    search_cache.invalidate()
+
+
+@receiver(post_delete, sender=Offer)
+def offer_deleted(sender, instance, **kwargs):
+    search_cache.invalidate()
+
+
+# champs d'un profil d'organisation recopiés dans l'index de ses offres
+ORGANISATION_SEARCH_FIELDS = ("organisation_name", "country_code")
+
+
+@receiver(pre_save, sender=CompanyProfile)
+@receiver(pre_save, sender=InstitutionProfile)
+def organisation_saving(sender, instance, raw=False, update_fields=None, **kwargs):
+    # compare aux valeurs enregistrées : un changement de logo ou de
+    # description ne recalcule pas les offres de l'organisation
+    if raw:
+        return
+    if update_fields is not None and not set(update_fields) & set(ORGANISATION_SEARCH_FIELDS):
+        instance._search_fields_changed = False
+        return
+    stored = sender.objects.filter(pk=instance.pk).values_list(*ORGANISATION_SEARCH_FIELDS).first()
+    current = tuple(getattr(instance, name) for name in ORGANISATION_SEARCH_FIELDS)
+    instance._search_fields_changed = stored != current
+
+
+@receiver(post_save, sender=CompanyProfile)
+@receiver(post_save, sender=InstitutionProfile)
+def organisation_saved(sender, instance, raw=False, **kwargs):
+    # le nom et le pays de l'organisation font partie de l'index de ses offres
+    if raw or not getattr(instance, "_search_fields_changed", True):
+        return
+    refresh_search_fields(instance.user, instance)
+    search_cache.invalidate()
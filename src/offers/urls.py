@@ -4,14 +4,18 @@ from .views import (
     CreateOfferView,
     EditOfferView,
     OfferDetailView,
+    OffersListMoreView,
     OffersListView,
     PublicOfferDetailView,
+    search_cache_stats,
 )
 
 app_name = "offers"
 
 urlpatterns = [
     path("", OffersListView.as_view(), name="list"),
+    path("more/", OffersListMoreView.as_view(), name="list_more"),
+    path("cache-stats/", search_cache_stats, name="cache_stats"),
     path("<uuid:pk>/", PublicOfferDetailView.as_view(), name="detail_public"),
     path("create/", CreateOfferView.as_view(), name="create"),
     path("<uuid:offer_id>/view/", OfferDetailView.as_view(), name="detail"),
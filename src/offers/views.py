@@ -1,13 +1,29 @@
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Q
+from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404
 from django.urls import reverse_lazy
+from django.utils import timezone
+from django.views.decorators.http import require_GET
 from django.views.generic import FormView, TemplateView, UpdateView
 
 from accounts.models import Offer, CompanyProfile, InstitutionProfile
 from accounts.forms import OfferForm
-from accounts.countries import get_country_search_names
+
+from . import cache as search_cache
+from .backends import get_search_backend
+from .cards import as_card, offer_cards, with_organisation_profiles
+from .pagination import count_offers, paginate_keyset
+from .facets import apply_filters, facet_counts, parse_filters
+from .query_parser import apply_parsed_query, country_hint_boost, parse_query
+from .search import (
+    filter_fuzzy,
+    filter_location,
+    get_ordering,
+    rank_fuzzy,
+    similarity_threshold,
+)
 
 
 class CreateOfferView(LoginRequiredMixin, FormView):
@@ -77,62 +93,111 @@ class EditOfferView(LoginRequiredMixin, UpdateView):
 
 class OffersListView(TemplateView):
     template_name = "offers/offers_list.html"
-
-    def _get_searchable_location(self, offer):
-        profile = getattr(offer.company, "company_profile", None) or getattr(offer.company, "institution_profile", None)
-        parts = []
-        if offer.location:
-            parts.append(offer.location.lower())
-        if profile and profile.country_code:
-            names = get_country_search_names(profile.country_code)
-            parts.extend(names)
-        return " ".join(parts)
+    with_count = True
+
+    def get_queryset(self, parsed, location, fuzzy=False):
+        offers = apply_parsed_query(Offer.objects.all(), parsed)
+        if not fuzzy:
+            return get_search_backend().filter(offers, parsed["text"], location)
+        if parsed["text"]:
+            offers = filter_fuzzy(offers, parsed["text"])
+        if location:
+            offers = filter_location(offers, location)
+        return offers
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         query = self.request.GET.get("q", "").strip()
         location = self.request.GET.get("location", "").strip()
-
-        offers = Offer.objects.select_related("company").order_by("-created_at")
-
-        if query:
-            offers = offers.filter(
-                Q(title__icontains=query) |
-                Q(skills__icontains=query) |
-                Q(description__icontains=query) |
-                Q(contract_type__icontains=query) |
-                Q(company__company_profile__organisation_name__icontains=query) |
-                Q(company__institution_profile__organisation_name__icontains=query)
-            )
-
-        all_offers = list(offers)
-
-        if location:
-            terms = location.lower().split()
-            filtered_offers = []
-            for offer in all_offers:
-                searchable = self._get_searchable_location(offer)
-                if all(term in searchable for term in terms):
-                    filtered_offers.append(offer)
-            all_offers = filtered_offers
-
-        offers_with_logo = []
-        for offer in all_offers:
-            profile = getattr(offer.company, "company_profile", None) or getattr(offer.company, "institution_profile", None)
-            logo_url = profile.logo.url if profile and profile.logo else None
-            company_name = profile.organisation_name if profile else ""
-            offers_with_logo.append({
-                "offer": offer,
-                "logo_url": logo_url,
-                "company_name": company_name,
-            })
-
-        context["offers"] = offers_with_logo
-        context["count"] = len(offers_with_logo)
+        filters = parse_filters(self.request.GET)
+        params = {
+            "q": query,
+            "location": location,
+            "after": self.request.GET.get("after", ""),
+            "fuzzy": "1" if self.request.GET.get("fuzzy") == "1" else "",
+        }
+        params.update(filters)
+
+        cache_key = search_cache.results_key(params)
+        results = search_cache.get_results(cache_key)
+        if results is None or (self.with_count and results["count"] is None):
+            cards, results = self._search(query, location, filters, params["after"], params["fuzzy"])
+            search_cache.set_results(cache_key, results)
+        else:
+            cards = self._load_cards(results["ids"])
+
+        if self.with_count:
+            context["count"] = results["count"]
+            context["count_is_estimate"] = results["count_is_estimate"]
+            context["facets"] = results["facets"]
+        context["offers"] = [as_card(offer) for offer in cards]
+        context["fuzzy"] = results["fuzzy"]
+        context["next_querystring"] = self._next_querystring(results)
         context["query"] = query
         context["location"] = location
+        context["filters"] = filters
         return context
 
+    def _search(self, query, location, filters, cursor, fuzzy):
+        parsed = parse_query(query)
+        if not fuzzy:
+            page, results = self._run_search(parsed, location, filters, cursor)
+            # la recherche approchée n'est tentée que si la recherche exacte,
+            # servie par l'index plein texte, ne trouve presque rien
+            min_results = getattr(settings, "OFFERS_FUZZY_MIN_RESULTS", 3)
+            if not parsed["text"] or cursor or results["next_cursor"] or len(page) >= min_results:
+                return page, results
+        with similarity_threshold(getattr(settings, "OFFERS_FUZZY_THRESHOLD", 0.25)):
+            fuzzy_page, fuzzy_results = self._run_search(parsed, location, filters, cursor, fuzzy=True)
+        if fuzzy or len(fuzzy_page) > len(page):
+            return fuzzy_page, fuzzy_results
+        return page, results
+
+    def _run_search(self, parsed, location, filters, cursor, fuzzy=False):
+        now = timezone.now()
+        matching = self.get_queryset(parsed, location, fuzzy)
+        offers = apply_filters(matching, filters, now)
+        boost = country_hint_boost(parsed)
+        if fuzzy:
+            ranked = offer_cards(rank_fuzzy(offers, parsed["text"], boost))
+        else:
+            ranked = offer_cards(get_search_backend().rank(offers, parsed["text"], boost))
+        page_size = getattr(settings, "OFFERS_PAGE_SIZE", 20)
+        page, next_cursor = paginate_keyset(ranked, get_ordering(ranked), cursor, page_size)
+        results = {
+            "ids": [offer.pk for offer in page],
+            "next_cursor": next_cursor,
+            "fuzzy": fuzzy,
+            "count": None,
+            "count_is_estimate": None,
+            "facets": None,
+        }
+        if self.with_count:
+            exact_limit = getattr(settings, "OFFERS_EXACT_COUNT_LIMIT", 1000)
+            results["count"], results["count_is_estimate"] = count_offers(offers, exact_limit)
+            results["facets"] = facet_counts(matching, filters, now)
+        return page, results
+
+    def _load_cards(self, ids):
+        offers = offer_cards(Offer.objects.filter(pk__in=ids)).in_bulk()
+        return [offers[pk] for pk in ids if pk in offers]
+
+    def _next_querystring(self, results):
+        if not results["next_cursor"]:
+            return ""
+        params = self.request.GET.copy()
+        params["after"] = results["next_cursor"]
+        if results["fuzzy"]:
+            params["fuzzy"] = "1"
+        return params.urlencode()
+
+
+class OffersListMoreView(OffersListView):
+    """Fragment HTMX « Voir plus » : la page suivante, sans recompter."""
+
+    template_name = "offers/partials/offer_cards.html"
+    with_count = False
+
 
 class PublicOfferDetailView(TemplateView):
     template_name = "offers/offer_detail.html"
@@ -140,8 +205,15 @@ class PublicOfferDetailView(TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         offer_id = self.kwargs.get("pk")
-        offer = get_object_or_404(Offer, pk=offer_id)
+        offer = get_object_or_404(with_organisation_profiles(Offer.objects), pk=offer_id)
         profile = getattr(offer.company, "company_profile", None) or getattr(offer.company, "institution_profile", None)
         context["offer"] = offer
         context["company"] = profile
         return context
+
+
+@require_GET
+def search_cache_stats(request):
+    if not request.user.is_staff:
+        raise Http404()
+    return JsonResponse(search_cache.get_stats())
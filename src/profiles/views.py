@@ -2,13 +2,14 @@ from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.mail import send_mail
 from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.views.decorators.http import require_GET
 from django.views.generic import TemplateView
 
+from accounts.jobqueue import PRIORITY_NOTICE, enqueue
 from accounts.models import CompanyProfile, InstitutionProfile, Offer, StudentProfile, User
+from offers.cards import offer_cards
 
 
 class AccountSpaceView(LoginRequiredMixin, TemplateView):
@@ -81,7 +82,7 @@ class MyOffersView(LoginRequiredMixin, TemplateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["offers"] = Offer.objects.filter(company=self.request.user).order_by("-created_at")
+        context["offers"] = offer_cards(Offer.objects.filter(company=self.request.user)).order_by("-created_at")
         profile = getattr(self.request.user, "company_profile", None) or getattr(self.request.user, "institution_profile", None)
         if profile and profile.logo:
             context["logo_url"] = profile.logo.url
@@ -162,12 +163,13 @@ class AccountDetailView(LoginRequiredMixin, TemplateView):
         if action == "approve":
             profile.is_approved = True
             profile.save()
-            send_mail(
-                "Votre compte Mosifra a été validé",
-                f"Bonjour {profile.organisation_name},\n\nVotre compte a été validé par notre équipe. Vous pouvez maintenant accéder à toutes les fonctionnalités de Mosifra.\n\nConnectez-vous ici : https://mosifra.com/accounts/login/\n\nL'équipe Mosifra",
-                from_email,
-                [profile.user.email],
-                fail_silently=True,
+            enqueue(
+                "send_mail",
+                priority=PRIORITY_NOTICE,
+                subject="Votre compte Mosifra a été validé",
+                message=f"Bonjour {profile.organisation_name},\n\nVotre compte a été validé par notre équipe. Vous pouvez maintenant accéder à toutes les fonctionnalités de Mosifra.\n\nConnectez-vous ici : https://mosifra.com/accounts/login/\n\nL'équipe Mosifra",
+                recipient_list=[profile.user.email],
+                from_email=from_email,
             )
             messages.success(request, f"Le compte {profile.organisation_name} a été approuvé.")
 
@@ -177,12 +179,13 @@ class AccountDetailView(LoginRequiredMixin, TemplateView):
             if custom_message:
                 reject_message += f"\n\nMotif : {custom_message}"
             reject_message += "\n\nSi vous pensez qu'il s'agit d'une erreur, n'hésitez pas à nous contacter.\n\nL'équipe Mosifra"
-            send_mail(
-                "Votre demande d'inscription Mosifra",
-                reject_message,
-                from_email,
-                [profile.user.email],
-                fail_silently=True,
+            enqueue(
+                "send_mail",
+                priority=PRIORITY_NOTICE,
+                subject="Votre demande d'inscription Mosifra",
+                message=reject_message,
+                recipient_list=[profile.user.email],
+                from_email=from_email,
             )
             messages.success(request, f"Le compte {profile.organisation_name} a été refusé.")
 
@@ -206,7 +209,7 @@ def tab_account(request):
 def tab_offers(request):
     if request.user.role not in (User.Role.COMPANY, User.Role.INSTITUTION):
         return HttpResponse("", status=403)
-    offers = Offer.objects.filter(company=request.user).order_by("-created_at")
+    offers = offer_cards(Offer.objects.filter(company=request.user)).order_by("-created_at")
     profile = getattr(request.user, "company_profile", None) or getattr(request.user, "institution_profile", None)
     logo_url = profile.logo.url if profile and profile.logo else None
     return render(request, "profiles/partials/tab_offers.html", {
@@ -1,7 +1,25 @@
-from django.test import TestCase
-from unittest.mock import patch
+import base64
+import json
+import smtplib
+import socket
+import socketserver
+import threading
+from datetime import timedelta
+from io import StringIO
+
+from django.core import mail
+from django.core.cache import caches
+from django.core.mail import EmailMessage
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from unittest.mock import Mock, patch
+from accounts import countries, jobqueue
+from accounts import checks, email_backends, mail_limiter
+from accounts.mail_pool import SMTPSenderPool
+from accounts.text import normalise
 from accounts.views import _send_two_factor_code, SESSION_CODE_KEY
-from accounts.models import User
+from accounts.models import Job, MailQuota, User
 
 class AccountsTests(TestCase):
     def test_send_two_factor_code_uses_secrets(self):
@@ -30,3 +48,492 @@ class AccountsTests(TestCase):
         self.assertEqual(response.status_code, 302)
         self.assertEqual(response.url, "/accounts/two-factor/")
         self.assertIn(SESSION_CODE_KEY, self.client.session)
+
+    @override_settings(JOBS_EAGER=True)
+    def test_eager_login_survives_smtp_failure(self):
+        """Verify an SMTP error while sending the code in the request is logged, not raised."""
+        User.objects.create_user(email="login@test.com", password="password", username="login@test.com")
+        with patch("accounts.jobs.django_send_mail", side_effect=smtplib.SMTPException("down")), \
+                self.assertLogs("accounts.views", "ERROR"):
+            response = self.client.post("/accounts/login/", {"username": "login@test.com", "password": "password"})
+        self.assertEqual(response.url, "/accounts/two-factor/")
+
+
+class CountryTableTests(TestCase):
+    def test_search_names_are_precomputed(self):
+        """Verify country names come from the generated table, not from pycountry."""
+        countries.get_country_table.cache_clear()
+        self.addCleanup(countries.get_country_table.cache_clear)
+        with patch("accounts.countries.load_from_pycountry") as load:
+            names = countries.get_country_search_names("de")
+        load.assert_not_called()
+        self.assertEqual(names[0], "de")
+        self.assertIn("germany", names)
+        self.assertIn("allemagne", names)
+
+    def test_reverse_indexes(self):
+        """Verify full names and single name tokens map back to country codes."""
+        self.assertEqual(countries.get_country_name_index()["allemagne"], {"DE"})
+        self.assertIn("AE", countries.get_country_token_index()["arabes"])
+        self.assertEqual(countries.get_country_search_names("zz"), ["zz"])
+
+    def test_choices_are_a_cached_sorted_tuple(self):
+        """Verify choices are built once and sorted by French name."""
+        choices = countries.get_country_choices()
+        self.assertIsInstance(choices, tuple)
+        self.assertIs(choices, countries.get_country_choices())
+        self.assertEqual(list(choices), sorted(choices, key=lambda choice: choice[1]))
+        self.assertEqual(countries.get_country_label("DE"), "Allemagne")
+
+    def test_generated_table_is_up_to_date(self):
+        """Verify the committed country_data module matches pycountry."""
+        call_command("build_country_data", check=True, stdout=StringIO())
+
+
+class NormaliseTests(TestCase):
+    def test_normalise_folds_case_accents_and_spaces(self):
+        """Verify the shared normalisation used for stored columns and queries."""
+        self.assertEqual(normalise("  Émirats   Arabes Unis "), "emirats arabes unis")
+        self.assertEqual(normalise("Straße"), "strasse")
+        self.assertEqual(normalise(None), "")
+
+
+class JobQueueTests(TestCase):
+    def test_login_code_is_queued_then_sent_by_the_worker(self):
+        """Verify the 2FA mail leaves the request and is sent by run_worker."""
+        User.objects.create_user(email="login@test.com", password="password", username="login@test.com")
+        self.client.post("/accounts/login/", {"username": "login@test.com", "password": "password"})
+        self.assertEqual(len(mail.outbox), 0)
+        job = Job.objects.get()
+        self.assertEqual((job.name, job.priority), ("send_mail", jobqueue.PRIORITY_TRANSACTIONAL))
+
+        call_command("run_worker", once=True, stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn(self.client.session[SESSION_CODE_KEY], mail.outbox[0].body)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.DONE)
+        self.assertEqual(job.payload, {})
+
+    @override_settings(JOBS_RETENTION_DAYS=7)
+    def test_worker_purges_old_finished_jobs(self):
+        """Verify finished and dead jobs are deleted after the retention period only."""
+        now = timezone.now()
+        Job.objects.create(name="send_mail", status=Job.Status.DONE, finished_at=now - timedelta(days=8))
+        Job.objects.create(name="send_mail", status=Job.Status.DEAD, finished_at=now - timedelta(days=8))
+        recent = Job.objects.create(name="send_mail", status=Job.Status.DONE, finished_at=now - timedelta(days=1))
+        queued = Job.objects.create(name="send_mail", run_at=now + timedelta(days=1))
+        call_command("run_worker", once=True, stdout=StringIO())
+        self.assertEqual(set(Job.objects.values_list("pk", flat=True)), {recent.pk, queued.pk})
+
+    @override_settings(JOBS_EAGER=True)
+    def test_eager_mode_runs_in_the_request(self):
+        """Verify JOBS_EAGER sends immediately without storing a job."""
+        jobqueue.enqueue("send_mail", subject="S", message="M", recipient_list=["a@test.com"])
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertFalse(Job.objects.exists())
+
+    def test_claim_follows_priority_and_skips_running_jobs(self):
+        """Verify workers take urgent jobs first and never a job already claimed."""
+        bulk = jobqueue.enqueue("send_mail", subject="B", message="", recipient_list=["b@test.com"])
+        urgent = jobqueue.enqueue(
+            "send_mail", priority=jobqueue.PRIORITY_TRANSACTIONAL,
+            subject="U", message="", recipient_list=["u@test.com"],
+        )
+        self.assertEqual(jobqueue.claim("w1"), [urgent])
+        self.assertEqual(jobqueue.claim("w2"), [bulk])
+        self.assertEqual(jobqueue.claim("w3"), [])
+
+    @override_settings(JOBS_BACKOFF_BASE=10)
+    def test_failures_back_off_then_go_to_dead_letter(self):
+        """Verify a failing job is retried later and finally marked dead."""
+        job = jobqueue.enqueue(
+            "send_mail", max_attempts=2, subject="S", message="M", recipient_list=["a@test.com"]
+        )
+        with patch("accounts.jobs.django_send_mail", side_effect=OSError("smtp down")):
+            jobqueue.run_pending()
+            job.refresh_from_db()
+            self.assertEqual((job.status, job.attempts), (Job.Status.QUEUED, 1))
+            self.assertGreater(job.run_at, timezone.now() + timedelta(seconds=5))
+            self.assertIn("smtp down", job.last_error)
+            # pas encore l'heure du nouvel essai
+            self.assertEqual(jobqueue.run_pending(), 0)
+
+            Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+            jobqueue.run_pending()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.Status.DEAD, 2))
+
+    def test_stale_running_jobs_are_requeued(self):
+        """Verify a job held by a vanished worker returns to the queue."""
+        job = jobqueue.enqueue("send_mail", subject="S", message="M", recipient_list=["a@test.com"])
+        jobqueue.claim("gone")
+        Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(jobqueue.requeue_stale(), 1)
+        self.assertEqual(jobqueue.run_pending(), 1)
+
+    def test_requeued_job_result_is_only_saved_by_its_new_owner(self):
+        """Verify a worker whose job was handed to another does not overwrite its state."""
+        job = jobqueue.enqueue("send_mail", subject="S", message="M", recipient_list=["a@test.com"])
+        [slow] = jobqueue.claim("slow")
+        Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(hours=1))
+        jobqueue.requeue_stale()
+        [fast] = jobqueue.claim("fast")
+        jobqueue.run(slow)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by), (Job.Status.RUNNING, "fast"))
+        jobqueue.run(fast)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by), (Job.Status.DONE, ""))
+
+
+class SMTPSinkHandler(socketserver.StreamRequestHandler):
+    # juste assez de SMTP pour smtplib : tout est accepté
+    def handle(self):
+        sink = self.server
+        with sink.lock:
+            sink.connections += 1
+        self.wfile.write(b"220 sink\r\n")
+        received = 0
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line[:4].upper()
+            if command == b"DATA":
+                self.wfile.write(b"354 go\r\n")
+                data = b"".join(iter(self.rfile.readline, b".\r\n"))
+                with sink.lock:
+                    sink.messages.append(data)
+                self.wfile.write(b"250 queued\r\n")
+                received += 1
+                if sink.drop_after and received >= sink.drop_after:
+                    return
+            elif command == b"AUTH":
+                # AUTH XOAUTH2 <base64 "user=...\x01auth=Bearer <jeton>\x01\x01">
+                token = base64.b64decode(line.split()[2]).split(b"Bearer ")[1].split(b"\x01")[0]
+                with sink.lock:
+                    sink.auth_tokens.append(token.decode())
+                if token.decode() in sink.accepted_tokens:
+                    self.wfile.write(b"235 accepted\r\n")
+                else:
+                    self.wfile.write(b"535 invalid credentials\r\n")
+            elif command == b"QUIT":
+                self.wfile.write(b"221 bye\r\n")
+                return
+            else:
+                self.wfile.write(b"250 ok\r\n")
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, drop_after=0):
+        super().__init__(("127.0.0.1", 0), SMTPSinkHandler)
+        self.drop_after = drop_after
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.messages = []
+        self.accepted_tokens = set()
+        self.auth_tokens = []
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    def settings(self):
+        return override_settings(
+            EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+            EMAIL_HOST="127.0.0.1",
+            EMAIL_PORT=self.server_address[1],
+            EMAIL_HOST_USER="",
+            EMAIL_HOST_PASSWORD="",
+            EMAIL_USE_TLS=False,
+            EMAIL_USE_SSL=False,
+        )
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class MailPoolTests(SimpleTestCase):
+    def start_sink(self, drop_after=0):
+        sink = SMTPSink(drop_after)
+        self.addCleanup(sink.stop)
+        settings_override = sink.settings()
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        return sink
+
+    def messages(self, count):
+        return [EmailMessage(f"Sujet {index}", "Corps", "from@test.com", [f"to{index}@test.com"]) for index in range(count)]
+
+    def test_pool_reuses_its_connections(self):
+        """Verify a bulk send opens at most one SMTP connection per thread."""
+        sink = self.start_sink()
+        with SMTPSenderPool(size=3, batch_size=5) as pool:
+            report = pool.send(self.messages(30))
+        self.assertEqual((report["sent"], report["failed"]), (30, []))
+        self.assertEqual(len(sink.messages), 30)
+        self.assertLessEqual(sink.connections, 3)
+        self.assertEqual(report["connections_opened"], sink.connections)
+        self.assertGreater(report["per_second"], 0)
+
+    def test_dropped_connection_is_reopened(self):
+        """Verify the pool reconnects and retries when the server hangs up."""
+        sink = self.start_sink(drop_after=4)
+        with SMTPSenderPool(size=1, batch_size=12) as pool:
+            report = pool.send(self.messages(12))
+        self.assertEqual((report["sent"], report["failed"]), (12, []))
+        self.assertEqual(len(sink.messages), 12)
+        self.assertEqual(report["reconnects"], 2)
+
+    def test_persistent_backend_keeps_connections_between_sends(self):
+        """Verify pool threads park PersistentSMTPBackend connections and reuse them on the next send."""
+        sink = self.start_sink()
+        backend = "accounts.email_backends.PersistentSMTPBackend"
+        with patch("accounts.mail_pool.connections.close_all") as close_all:
+            with SMTPSenderPool(size=1, batch_size=5, backend=backend) as pool:
+                first = pool.send(self.messages(10))
+                second = pool.send(self.messages(10))
+        self.assertEqual((first["sent"], second["sent"]), (10, 10))
+        self.assertEqual(sink.connections, 1)
+        self.assertEqual(second["connections_opened"], 0)
+        # le thread du pool ferme ses connexions à la base
+        close_all.assert_called_once()
+
+    def test_persistent_backend_reopens_idle_connections(self):
+        """Verify the pool honours the persistent backend idle timeout between batches."""
+        sink = self.start_sink()
+        backend = "accounts.email_backends.PersistentSMTPBackend"
+        with self.settings(MAIL_CONNECTION_IDLE_TIMEOUT=0), \
+                SMTPSenderPool(size=1, batch_size=5, backend=backend) as pool:
+            report = pool.send(self.messages(10))
+        self.assertEqual(report["sent"], 10)
+        self.assertEqual(sink.connections, 2)
+        self.assertEqual(report["connections_opened"], 2)
+
+    def test_unreachable_server_reports_failures(self):
+        """Verify messages that cannot be sent are reported by index, not raised."""
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+        with self.settings(
+            EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+            EMAIL_HOST="127.0.0.1", EMAIL_PORT=port, EMAIL_USE_TLS=False, EMAIL_USE_SSL=False,
+        ):
+            with SMTPSenderPool(size=2, batch_size=2, retries=1) as pool:
+                report = pool.send(self.messages(3))
+        self.assertEqual((report["sent"], report["failed"]), (0, [0, 1, 2]))
+
+    def test_benchmark_command_reports_throughput(self):
+        """Verify benchmark_mail compares one-connection-per-mail with the pool."""
+        sink = self.start_sink()
+        out = StringIO()
+        call_command("benchmark_mail", count=10, connections="1,2", stdout=out)
+        report = json.loads(out.getvalue())
+        self.assertEqual(set(report), {"backend", "count", "baseline", "pool_1", "pool_2"})
+        self.assertEqual(report["pool_2"]["sent"], 10)
+        # 10 connexions pour la référence, au plus 1 + 2 pour les pools
+        self.assertLessEqual(sink.connections, 13)
+        self.assertEqual(len(sink.messages), 30)
+
+
+@override_settings(
+    GMAIL_CLIENT_ID="id", GMAIL_CLIENT_SECRET="secret", GMAIL_REFRESH_TOKEN="refresh",
+    GMAIL_TOKEN_EXPIRY_MARGIN=300,
+)
+class GmailTokenCacheTests(TestCase):
+    expires_in = 3599
+
+    def setUp(self):
+        self.cache = caches["mail"]
+        self.cache.clear()
+        self.addCleanup(self.cache.clear)
+        self.tokens = iter(["fresh", "fresher"])
+        post = patch("accounts.email_backends.requests.post", side_effect=self.token_response)
+        self.post = post.start()
+        self.addCleanup(post.stop)
+
+    def token_response(self, *args, **kwargs):
+        response = Mock()
+        response.json.return_value = {"access_token": next(self.tokens), "expires_in": self.expires_in}
+        return response
+
+    def test_token_is_fetched_once_until_expiry(self):
+        """Verify later connections reuse the cached token instead of calling Google."""
+        backend = email_backends.GmailOAuth2Backend()
+        self.assertEqual(backend._get_access_token(), "fresh")
+        self.assertEqual(email_backends.GmailOAuth2Backend()._get_access_token(), "fresh")
+        self.assertEqual(self.post.call_count, 1)
+        # supprimé du cache avant son expiration réelle
+        with patch.object(self.cache, "set") as cache_set:
+            self.cache.clear()
+            backend._get_access_token()
+        self.assertEqual(cache_set.call_args.kwargs["timeout"], 3299)
+
+    def test_short_lived_token_is_not_cached(self):
+        """Verify a token expiring within the margin is not reused."""
+        self.expires_in = 120
+        backend = email_backends.GmailOAuth2Backend()
+        self.assertEqual(backend._get_access_token(), "fresh")
+        self.assertEqual(backend._get_access_token(), "fresher")
+
+    def test_waits_for_the_worker_holding_the_lock(self):
+        """Verify only the lock holder refreshes; others pick up its token."""
+        def other_worker_refreshes(seconds):
+            self.cache.set(email_backends.TOKEN_KEY, "from-other-worker")
+
+        with patch("accounts.email_backends._lock_refresh", return_value=False), \
+                patch("accounts.email_backends.time.sleep", side_effect=other_worker_refreshes):
+            token = email_backends.GmailOAuth2Backend()._get_access_token()
+        self.assertEqual(token, "from-other-worker")
+        self.post.assert_not_called()
+
+    def test_rejected_token_is_refreshed(self):
+        """Verify a token refused by XOAUTH2 is replaced and the login retried."""
+        sink = SMTPSink()
+        self.addCleanup(sink.stop)
+        sink.accepted_tokens = {"fresh"}
+        self.cache.set(email_backends.TOKEN_KEY, "revoked")
+        with sink.settings(), self.settings(EMAIL_HOST_USER="noreply@test.com"):
+            backend = email_backends.GmailOAuth2Backend()
+            self.assertTrue(backend.open())
+            backend.send_messages([EmailMessage("S", "M", "noreply@test.com", ["a@test.com"])])
+            backend.discard()
+        self.assertEqual(sink.auth_tokens, ["revoked", "fresh"])
+        self.assertEqual(len(sink.messages), 1)
+        self.assertEqual(self.cache.get(email_backends.TOKEN_KEY), "fresh")
+
+
+class MailCacheCheckTests(SimpleTestCase):
+    def test_gmail_warns_about_a_process_local_token_cache(self):
+        """Verify the check flags a Gmail token cache that workers cannot share."""
+        gmail = "accounts.email_backends.GmailOAuth2Backend"
+        with self.settings(EMAIL_BACKEND=gmail):
+            self.assertEqual([error.id for error in checks.check_mail_cache(None)], ["accounts.W001"])
+        redis = {"mail": {"BACKEND": "django.core.cache.backends.redis.RedisCache"}}
+        with self.settings(EMAIL_BACKEND=gmail, CACHES=redis):
+            self.assertEqual(checks.check_mail_cache(None), [])
+
+
+class PersistentConnectionTests(SimpleTestCase):
+    def setUp(self):
+        self.sink = SMTPSink()
+        self.addCleanup(self.sink.stop)
+        self.addCleanup(email_backends.close_parked_connections)
+        override = self.sink.settings()
+        override.enable()
+        self.addCleanup(override.disable)
+        self.stats = email_backends.get_connection_stats()
+
+    def stats_delta(self):
+        stats = email_backends.get_connection_stats()
+        return {name: stats[name] - self.stats[name] for name in stats}
+
+    def send(self, backend="accounts.email_backends.PersistentSMTPBackend"):
+        connection = mail.get_connection(backend)
+        return mail.send_mail("Code", "123456", "from@test.com", ["to@test.com"], connection=connection)
+
+    def test_connection_is_reused_between_mails(self):
+        """Verify consecutive mails share one SMTP connection checked by NOOP."""
+        for _mail in range(3):
+            self.assertEqual(self.send(), 1)
+        self.assertEqual(self.sink.connections, 1)
+        self.assertEqual(len(self.sink.messages), 3)
+        self.assertEqual(self.stats_delta(), {"opened": 1, "reused": 2, "dropped": 0})
+
+    def test_connection_closed_by_server_is_reopened(self):
+        """Verify a connection dropped by the server is replaced transparently."""
+        self.sink.drop_after = 1
+        self.send()
+        self.send()
+        self.assertEqual(len(self.sink.messages), 2)
+        self.assertEqual(self.stats_delta(), {"opened": 2, "reused": 0, "dropped": 1})
+
+    @override_settings(MAIL_CONNECTION_IDLE_TIMEOUT=0)
+    def test_idle_connection_is_not_reused(self):
+        """Verify a connection idle past the timeout is closed and reopened."""
+        self.send()
+        self.send()
+        self.assertEqual(self.sink.connections, 2)
+        self.assertEqual(self.stats_delta()["dropped"], 1)
+
+    @override_settings(
+        GMAIL_CLIENT_ID="id", GMAIL_CLIENT_SECRET="secret", GMAIL_REFRESH_TOKEN="refresh",
+        EMAIL_HOST_USER="noreply@test.com",
+    )
+    def test_gmail_authenticates_once_per_connection(self):
+        """Verify reused Gmail connections skip STARTTLS and XOAUTH2."""
+        caches["mail"].set(email_backends.TOKEN_KEY, "token")
+        self.addCleanup(caches["mail"].clear)
+        self.sink.accepted_tokens = {"token"}
+        self.send("accounts.email_backends.GmailOAuth2Backend")
+        self.send("accounts.email_backends.GmailOAuth2Backend")
+        self.assertEqual(self.sink.auth_tokens, ["token"])
+        self.assertEqual(len(self.sink.messages), 2)
+
+
+@override_settings(MAIL_RATE_PER_MINUTE=5, MAIL_RATE_PER_DAY=100, MAIL_TRANSACTIONAL_RESERVE=0.4)
+class MailRateLimiterTests(TestCase):
+    def setUp(self):
+        # au milieu d'une fenêtre : pas de changement de minute pendant le test
+        clock = patch("accounts.mail_limiter.time.time", return_value=1_800_000_030.0)
+        clock.start()
+        self.addCleanup(clock.stop)
+
+    def test_bulk_lane_leaves_room_for_login_codes(self):
+        """Verify bulk mail stops before the share reserved to transactional mail."""
+        self.assertEqual(mail_limiter.acquire(10, mail_limiter.BULK), 3)
+        self.assertEqual(mail_limiter.acquire(1, mail_limiter.BULK), 0)
+        self.assertEqual(mail_limiter.acquire(5, mail_limiter.TRANSACTIONAL), 2)
+        self.assertEqual(mail_limiter.retry_after(mail_limiter.BULK), 30)
+
+    @override_settings(MAIL_RATE_PER_DAY=2, MAIL_TRANSACTIONAL_RESERVE=0)
+    def test_tokens_refused_by_one_window_go_back_to_the_others(self):
+        """Verify the daily quota refusal does not consume per-minute tokens."""
+        self.assertEqual(mail_limiter.acquire(5), 2)
+        with self.settings(MAIL_RATE_PER_DAY=0):
+            self.assertEqual(mail_limiter.acquire(5), 3)
+
+    def test_counters_live_in_the_database(self):
+        """Verify tokens are counted on shared rows and released tokens come back."""
+        self.assertEqual(mail_limiter.acquire(3, mail_limiter.BULK), 3)
+        self.assertEqual(
+            dict(MailQuota.objects.values_list("window", "used")),
+            {"minute:30000000": 3, "day:20833": 3},
+        )
+        mail_limiter.release(5, mail_limiter.BULK)
+        self.assertEqual(set(MailQuota.objects.values_list("used", flat=True)), {0})
+        # fenêtres terminées : supprimées par la purge du worker
+        MailQuota.objects.update(expires_at=timezone.now() - timedelta(days=1))
+        self.assertEqual(mail_limiter.purge_expired(), 2)
+
+    def test_failed_send_gives_its_token_back(self):
+        """Verify a mail job failing on SMTP releases the token it took."""
+        job = jobqueue.enqueue("send_mail", subject="S", message="M", recipient_list=["a@test.com"])
+        with patch("accounts.jobs.django_send_mail", side_effect=smtplib.SMTPException("down")):
+            jobqueue.run_pending()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.Status.QUEUED, 1))
+        self.assertEqual(set(MailQuota.objects.values_list("used", flat=True)), {0})
+
+    def test_deferred_notice_resumes_while_codes_go_through(self):
+        """Verify a login code is sent over quota and a notice waits for the next window."""
+        mail_limiter.acquire(3, mail_limiter.BULK)
+        notice = jobqueue.enqueue(
+            "send_mail", priority=jobqueue.PRIORITY_NOTICE,
+            subject="Compte validé", message="M", recipient_list=["a@test.com"],
+        )
+        jobqueue.enqueue(
+            "send_mail", priority=jobqueue.PRIORITY_TRANSACTIONAL,
+            subject="Code", message="123456", recipient_list=["b@test.com"], transactional=True,
+        )
+        jobqueue.run_pending()
+        self.assertEqual([message.subject for message in mail.outbox], ["Code"])
+        notice.refresh_from_db()
+        self.assertEqual((notice.status, notice.attempts), (Job.Status.QUEUED, 0))
+        self.assertGreater(notice.run_at, timezone.now())
+
+        MailQuota.objects.all().delete()
+        Job.objects.filter(pk=notice.pk).update(run_at=timezone.now())
+        jobqueue.run_pending()
+        self.assertEqual(len(mail.outbox), 2)
@@ -1,5 +1,26 @@
-from django.test import SimpleTestCase, RequestFactory
+import json
+import tempfile
+import tracemalloc
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.core import mail
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import SimpleTestCase, RequestFactory, TestCase, override_settings
+from django.utils import timezone
+from django.test.utils import CaptureQueriesContext
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from accounts import csv_sniff, jobqueue
+from accounts.forms import InvitationUploadForm
+from accounts.jobqueue import Defer
+from accounts.models import InvitationImport, Job, MailQuota, StudentInvitation, User
+from invitations import dispatch
+from tests.test_accounts import SMTPSink
+from invitations.jobs import process_invitation_import
 from invitations.views import _detect_encoding, _detect_delimiter, _parse_csv_rows, _cleanup_rows, preview_csv, download_csv_model
 
 class InvitationsUtilsTest(SimpleTestCase):
@@ -36,6 +57,15 @@ class InvitationsUtilsTest(SimpleTestCase):
         rows = _parse_csv_rows(text, ",")
         self.assertEqual(rows[0][0], "email")
 
+    def test_detect_encoding_dos_export(self):
+        """Verify cp850 exports are recognised instead of read as cp1252."""
+        data = "prénom,nom".encode("cp850")
+        self.assertEqual(csv_sniff.detect_encoding(data), ("cp850", "prénom,nom"))
+
+    def test_detect_delimiter_tab(self):
+        """Verify tab-separated exports are detected."""
+        self.assertEqual(_detect_delimiter("email\tnom\tprenom"), "\t")
+
     def test_cleanup_rows_nested(self):
         """Verify fix for rows incorrectly identified as single cells containing delimiters."""
         bad_rows = [["\"email,nom\""], ["\"test@test.com,Doe\""]]
@@ -66,3 +96,440 @@ class InvitationsViewsTest(SimpleTestCase):
         request = self.factory.post("/invitations/preview/", {"csv_file": csv_file})
         response = preview_csv(request)
         self.assertEqual(response.status_code, 200)
+
+
+CSV_HEADER = "email,prenom,nom,filiere_ou_parcours,niveau,annee_academique\n"
+
+
+class InvitationImportTest(TestCase):
+    def setUp(self):
+        self.institution = User.objects.create(
+            username="unilim@test.com", email="unilim@test.com", role=User.Role.INSTITUTION
+        )
+        User.objects.create(username="Deja@Test.com", email="Deja@Test.com")
+        self.client.force_login(self.institution)
+
+    def upload(self, lines):
+        content = (CSV_HEADER + "\n".join(lines)).encode("utf-8")
+        csv_file = SimpleUploadedFile("etudiants.csv", content)
+        return self.client.post(reverse("invitations:upload"), {"csv_file": csv_file})
+
+    def student_lines(self, count):
+        return [f"etudiant{n}@test.com,Alice,Martin,BUT Info,BUT2,2025-2026" for n in range(count)]
+
+    def run_worker(self):
+        with self.settings(INVITATION_IMPORT_CHUNK_SIZE=2):
+            call_command("run_worker", once=True, stdout=StringIO())
+
+    def status(self, job):
+        response = self.client.get(reverse("invitations:import_status", args=[job.pk]))
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_upload_only_enqueues(self):
+        """Verify the upload creates pending invitations without sending mail."""
+        response = self.upload(self.student_lines(3))
+        report = response.context["report"]
+        self.assertEqual((report["sent"], report["pending"], report["done"]), (0, 3, False))
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertContains(response, 'hx-trigger="every 2s"')
+
+    def test_worker_sends_in_chunks_and_reports_in_file_order(self):
+        """Verify the worker sends every invitation and the report keeps line errors."""
+        response = self.upload([
+            "alice@test.com,alice,martin,BUT Info,BUT2,2025-2026",
+            "pas-un-email,Bob,Durand,BUT Info,BUT2,2025-2026",
+            "deja@test.com,Eve,Leroy,BUT Info,BUT2,2025-2026",
+            "carl@test.com,,,,,",
+            "dora@test.com,Dora,Petit,BUT Info,BUT2,2025-2026",
+        ])
+        job = response.context["job"]
+        self.run_worker()
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertIn("http://testserver/accounts/invitation/", mail.outbox[0].body)
+
+        response = self.status(job)
+        report = response.context["report"]
+        self.assertEqual((report["sent"], report["failed"], report["pending"]), (3, 2, 0))
+        self.assertTrue(report["done"])
+        self.assertEqual(report["errors"], [
+            "Ligne 3: email invalide (pas-un-email).",
+            "Ligne 4: email déjà utilisé (deja@test.com).",
+        ])
+        self.assertNotContains(response, "hx-trigger")
+        alice = StudentInvitation.objects.get(email="alice@test.com")
+        self.assertEqual((alice.first_name, alice.last_name), ("Alice", "MARTIN"))
+        self.assertEqual(alice.status, StudentInvitation.Status.SENT)
+        carl = StudentInvitation.objects.get(email="carl@test.com")
+        self.assertEqual((carl.first_name, carl.filiere), ("Étudiant", "N/A"))
+
+    def test_orphan_imports_are_requeued_on_the_worker(self):
+        """Verify the legacy command only enqueues the import job, once, for imports left without one."""
+        job = self.upload(self.student_lines(3)).context["job"]
+        Job.objects.all().delete()
+        call_command("process_invitation_imports", stdout=StringIO())
+        call_command("process_invitation_imports", stdout=StringIO())
+        self.assertEqual(
+            list(Job.objects.values_list("name", "payload")),
+            [("process_invitation_import", {"import_id": str(job.pk)})],
+        )
+        self.assertEqual(len(mail.outbox), 0)
+        self.run_worker()
+        self.assertEqual(len(mail.outbox), 3)
+
+    def test_send_failures_are_reported_per_line(self):
+        """Verify a failing mail marks the invitation failed with its line number."""
+        job = self.upload(self.student_lines(2)).context["job"]
+        with patch("django.core.mail.backends.locmem.EmailBackend.send_messages", side_effect=OSError("smtp down")):
+            self.run_worker()
+        report = job.get_report()
+        self.assertEqual(report["failed"], 2)
+        self.assertEqual(report["errors"][0], "Ligne 2: envoi impossible pour etudiant0@test.com.")
+
+    @override_settings(MAIL_RATE_PER_MINUTE=3, MAIL_TRANSACTIONAL_RESERVE=0)
+    def test_import_over_quota_resumes_in_next_window(self):
+        """Verify an import stops at the mail quota and its job resumes later."""
+        clock = patch("accounts.mail_limiter.time.time", return_value=1_800_000_030.0)
+        clock.start()
+        self.addCleanup(clock.stop)
+        import_job = self.upload(self.student_lines(5)).context["job"]
+        call_command("run_worker", once=True, stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 3)
+        job = Job.objects.get(name="process_invitation_import")
+        self.assertEqual((job.status, job.attempts), (Job.Status.QUEUED, 0))
+        self.assertGreater(job.run_at, timezone.now())
+
+        # fenêtre suivante
+        MailQuota.objects.all().delete()
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        call_command("run_worker", once=True, stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 5)
+        import_job.refresh_from_db()
+        self.assertEqual(import_job.status, InvitationImport.Status.DONE)
+
+    @override_settings(INVITATION_IMPORT_CHUNK_SIZE=2, MAIL_POOL_SIZE=1)
+    def test_worker_keeps_one_smtp_pool_across_batches(self):
+        """Verify an import's batches share the worker's SMTP connection instead of reconnecting."""
+        sink = SMTPSink()
+        self.addCleanup(sink.stop)
+        self.upload(self.student_lines(5))
+        with sink.settings():
+            call_command("run_worker", once=True, stdout=StringIO())
+        self.assertEqual(len(sink.messages), 5)
+        self.assertEqual(sink.connections, 1)
+
+    @override_settings(INVITATION_IMPORT_CHUNK_SIZE=2)
+    def test_import_job_sends_one_batch_per_run(self):
+        """Verify an import job requeues itself between batches, behind login codes."""
+        self.upload(self.student_lines(5))
+        job = Job.objects.get(name="process_invitation_import")
+        jobqueue.run_pending(limit=1)
+        self.assertEqual(len(mail.outbox), 2)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.Status.QUEUED, 0))
+
+        jobqueue.enqueue(
+            "send_mail", priority=jobqueue.PRIORITY_TRANSACTIONAL,
+            subject="Code", message="", recipient_list=["login@test.com"],
+        )
+        jobqueue.run_pending(limit=1)
+        self.assertEqual(mail.outbox[-1].subject, "Code")
+        jobqueue.run_pending()
+        self.assertEqual(len(mail.outbox), 6)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.DONE)
+
+    @override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=1024)
+    def test_large_import_is_streamed_from_disk_in_chunks(self):
+        """Verify an import above the former 500-row cap is read in chunks from a temp file."""
+        response = self.upload(self.student_lines(1200))
+        self.assertEqual(response.context["report"]["pending"], 1200)
+        self.assertEqual(StudentInvitation.objects.get(email="etudiant1199@test.com").import_line, 1201)
+
+    def test_legacy_encoding_and_delimiter_are_detected_from_the_prefix(self):
+        """Verify a cp1252, semicolon-separated export is decoded correctly."""
+        content = "email;prenom;nom;filiere_ou_parcours;niveau;annee_academique\r\n"
+        content += "zoe@test.com;Zoé;Lefèvre;Génie civil;L3;2025-2026\r\n"
+        csv_file = SimpleUploadedFile("etudiants.csv", content.encode("cp1252"))
+        self.client.post(reverse("invitations:upload"), {"csv_file": csv_file})
+        zoe = StudentInvitation.objects.get(email="zoe@test.com")
+        self.assertEqual((zoe.first_name, zoe.last_name, zoe.filiere), ("Zoé", "LEFÈVRE", "Génie civil"))
+
+    def test_row_cap_is_checked_before_reading_rows(self):
+        """Verify files above MAX_ROWS are rejected without creating an import."""
+        with patch.object(InvitationUploadForm, "MAX_ROWS", 10):
+            response = self.upload(self.student_lines(11))
+        self.assertFormError(response.context["form"], "csv_file", "Limité à 10 lignes par import.")
+        self.assertFalse(InvitationImport.objects.exists())
+
+    def test_upload_reuses_the_preview_analysis(self):
+        """Verify preview and upload share one cached analysis of the same file."""
+        caches["default"].clear()
+        content = (CSV_HEADER + "\n".join(self.student_lines(4))).encode("utf-8")
+        with patch("accounts.csv_sniff.detect_encoding", wraps=csv_sniff.detect_encoding) as detect:
+            preview = self.client.post(
+                reverse("invitations:preview"), {"csv_file": SimpleUploadedFile("etudiants.csv", content)}
+            )
+            response = self.client.post(
+                reverse("invitations:upload"), {"csv_file": SimpleUploadedFile("etudiants.csv", content)}
+            )
+        self.assertEqual(detect.call_count, 1)
+        self.assertContains(preview, "4 lignes à importer")
+        self.assertEqual(response.context["report"]["pending"], 4)
+
+    def test_quoted_lines_import_like_the_preview_shows_them(self):
+        """Verify exports with each line wrapped in quotes are imported, not rejected."""
+        lines = [CSV_HEADER.strip(), *self.student_lines(2)]
+        content = "\n".join(f'"{line}"' for line in lines).encode("utf-8")
+        response = self.client.post(
+            reverse("invitations:upload"), {"csv_file": SimpleUploadedFile("etudiants.csv", content)}
+        )
+        self.assertEqual(response.context["report"]["pending"], 2)
+        self.assertEqual(StudentInvitation.objects.get(email="etudiant1@test.com").filiere, "BUT Info")
+
+    def test_rows_are_counted_and_read_as_csv_records(self):
+        """Verify leading blank lines and quoted line breaks do not shift the header or the count."""
+        lines = ["", "", CSV_HEADER.strip(), *self.student_lines(2)]
+        lines.append('etudiant9@test.com,Alice,Martin,"BUT Info\nalternance",BUT2,2025-2026')
+        content = "\n".join(lines).encode("utf-8")
+        form = InvitationUploadForm(files={"csv_file": SimpleUploadedFile("etudiants.csv", content)})
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(form.sniffed["rows"], 3)
+        rows = [row for chunk in form.iter_rows() for row in chunk]
+        self.assertEqual([row["email"] for row in rows], [f"etudiant{n}@test.com" for n in (0, 1, 9)])
+        self.assertEqual(rows[2]["filiere_ou_parcours"], "BUT Info\nalternance")
+
+    def test_reupload_does_not_duplicate_or_remail(self):
+        """Verify re-importing the same file refreshes open invitations without new mail."""
+        self.upload(self.student_lines(3))
+        self.run_worker()
+        StudentInvitation.objects.update(expires_at=timezone.now() + timedelta(days=1))
+
+        report = self.upload(self.student_lines(3)).context["report"]
+        self.run_worker()
+        self.assertEqual(StudentInvitation.objects.count(), 3)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual((report["unchanged"], report["pending"], report["done"]), (3, 0, True))
+        self.assertFalse(
+            StudentInvitation.objects.filter(expires_at__lt=timezone.now() + timedelta(days=6)).exists()
+        )
+
+    def test_reupload_remails_changed_or_expired_invitations(self):
+        """Verify changed profiles and expired invitations are updated in place and re-sent."""
+        self.upload(self.student_lines(3))
+        self.run_worker()
+        expired = StudentInvitation.objects.get(email="etudiant2@test.com")
+        StudentInvitation.objects.filter(pk=expired.pk).update(expires_at=timezone.now() - timedelta(days=1))
+        changed_token = StudentInvitation.objects.get(email="etudiant1@test.com").token
+
+        lines = self.student_lines(3)
+        lines[1] = lines[1].replace("BUT Info", "BUT GEA")
+        report = self.upload(lines).context["report"]
+        self.assertEqual((report["unchanged"], report["pending"]), (1, 2))
+        self.run_worker()
+        self.assertEqual(StudentInvitation.objects.count(), 3)
+        self.assertEqual(len(mail.outbox), 5)
+        changed = StudentInvitation.objects.get(email="etudiant1@test.com")
+        self.assertEqual((changed.filiere, changed.token), ("BUT GEA", changed_token))
+        old_token = expired.token
+        expired.refresh_from_db()
+        self.assertEqual(expired.status, StudentInvitation.Status.SENT)
+        self.assertNotEqual(expired.token, old_token)
+
+    def test_duplicates_in_file_are_reported(self):
+        """Verify a repeated email is invited once and the repeat is reported."""
+        lines = self.student_lines(2) + [self.student_lines(1)[0].upper()]
+        report = self.upload(lines).context["report"]
+        self.assertEqual(StudentInvitation.objects.count(), 2)
+        self.assertEqual(report["errors"], ["Ligne 4: email en double (etudiant0@test.com, déjà ligne 2)."])
+
+    def test_open_invitations_are_unique_per_institution(self):
+        """Verify the database refuses a second open invitation for one email."""
+        self.upload(self.student_lines(1))
+        invitation = StudentInvitation.objects.get()
+        duplicate = StudentInvitation(
+            institution=self.institution, email=invitation.email, first_name="A", last_name="B",
+            filiere="F", level="L", academic_year="Y", token="other", expires_at=invitation.expires_at,
+        )
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            duplicate.save()
+        invitation.mark_used()
+        duplicate.save()
+
+    def test_imports_and_retries_lock_the_institution(self):
+        """Verify concurrent imports and retries of one institution are serialised on its row."""
+        def locks_institution(queries):
+            return any(
+                "FOR UPDATE" in query["sql"] and '"accounts_user"' in query["sql"] for query in queries
+            )
+
+        with CaptureQueriesContext(connection) as upload:
+            self.upload(self.student_lines(1))
+        self.assertTrue(locks_institution(upload.captured_queries))
+        StudentInvitation.objects.update(status=StudentInvitation.Status.FAILED)
+        with CaptureQueriesContext(connection) as retry:
+            self.client.post(reverse("invitations:retry"))
+        self.assertTrue(locks_institution(retry.captured_queries))
+
+    def test_status_is_private_to_the_institution(self):
+        """Verify another account cannot read an import's progress."""
+        job = self.upload(self.student_lines(1)).context["job"]
+        other = User.objects.create(username="o@test.com", email="o@test.com", role=User.Role.INSTITUTION)
+        self.client.force_login(other)
+        response = self.client.get(reverse("invitations:import_status", args=[job.pk]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_upload_query_count_does_not_grow_with_rows(self):
+        """Verify the upload uses set-based queries instead of per-row ones."""
+        with CaptureQueriesContext(connection) as small:
+            self.upload(self.student_lines(3))
+        StudentInvitation.objects.all().delete()
+        with CaptureQueriesContext(connection) as large:
+            response = self.upload(self.student_lines(60))
+        self.assertEqual(response.context["report"]["pending"], 60)
+        self.assertEqual(len(large), len(small))
+
+    def fail_sends(self):
+        return patch("django.core.mail.backends.locmem.EmailBackend.send_messages", side_effect=OSError("smtp down"))
+
+    def test_retry_resends_failed_and_expired_with_fresh_tokens(self):
+        """Verify the bulk retry reopens failed and expired invitations with new tokens in one update."""
+        self.upload(self.student_lines(3))
+        with self.fail_sends():
+            self.run_worker()
+        failed, expired, sent = StudentInvitation.objects.order_by("email")
+        StudentInvitation.objects.filter(pk=expired.pk).update(status=StudentInvitation.Status.EXPIRED)
+        StudentInvitation.objects.filter(pk=sent.pk).update(status=StudentInvitation.Status.SENT)
+        # une invitation expirée dont l'email a déjà une invitation ouverte reste expirée
+        stale = StudentInvitation.objects.create(
+            institution=self.institution, email=failed.email, first_name="A", last_name="B",
+            filiere="F", level="L", academic_year="Y", token="stale",
+            expires_at=timezone.now(), status=StudentInvitation.Status.EXPIRED,
+        )
+        old_tokens = dict(StudentInvitation.objects.values_list("pk", "token"))
+        self.assertEqual(self.client.get(reverse("invitations:upload")).context["retryable"], 2)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse("invitations:retry"))
+        updates = [q for q in queries.captured_queries if q["sql"].startswith('UPDATE "accounts_studentinvitation"')]
+        self.assertEqual(len(updates), 1)
+        job = response.context["job"]
+        retried = StudentInvitation.objects.filter(import_job=job)
+        self.assertEqual(set(retried.values_list("pk", flat=True)), {failed.pk, expired.pk})
+        for invitation in retried:
+            self.assertEqual((invitation.status, invitation.attempts, invitation.max_attempts), ("pending", 0, 5))
+            self.assertNotEqual(invitation.token, old_tokens[invitation.pk])
+            self.assertRegex(invitation.token, r"^[0-9a-f]{32}$")
+        self.assertEqual(StudentInvitation.objects.get(pk=stale.pk).token, "stale")
+        self.assertTrue(Job.objects.filter(name="process_invitation_import", payload__import_id=str(job.pk)).exists())
+
+        self.run_worker()
+        self.assertEqual(job.get_report()["sent"], 2)
+        bodies = {message.to[0]: message.body for message in mail.outbox}
+        for invitation in retried:
+            self.assertIn(invitation.token, bodies[invitation.email])
+        self.assertContains(self.client.post(reverse("invitations:retry")), "Aucune invitation à relancer.")
+
+    def test_retry_skips_expired_invitations_already_accepted_or_registered(self):
+        """Verify an expired invitation is not resent once its email has an account or a used invitation."""
+        self.upload(self.student_lines(3))
+        StudentInvitation.objects.update(status=StudentInvitation.Status.EXPIRED)
+        # compte créé ailleurs, email avec une autre casse
+        User.objects.create(username="etudiant0", email="Etudiant0@Test.com", role=User.Role.STUDENT)
+        StudentInvitation.objects.create(
+            institution=self.institution, email="etudiant1@test.com", first_name="A", last_name="B",
+            filiere="F", level="L", academic_year="Y", token="used",
+            expires_at=timezone.now(), status=StudentInvitation.Status.USED,
+        )
+        self.assertEqual(
+            list(dispatch.retryable_invitations(self.institution).values_list("email", flat=True)),
+            ["etudiant2@test.com"],
+        )
+
+    @override_settings(INVITATION_RETRY_MAX_ATTEMPTS=3, INVITATION_RETRY_BACKOFF_BASE=60)
+    def test_retry_backs_off_exponentially_then_gives_up(self):
+        """Verify a retried invitation waits longer after each failure and fails after its last attempt."""
+        self.upload(self.student_lines(1))
+        with self.fail_sends():
+            self.run_worker()
+        job = self.client.post(reverse("invitations:retry")).context["job"]
+        Job.objects.all().delete()
+        invitation = StudentInvitation.objects.get()
+
+        delays = []
+        with self.fail_sends():
+            for attempt in (1, 2):
+                start = timezone.now()
+                self.assertRaises(Defer, process_invitation_import, import_id=str(job.pk))
+                invitation.refresh_from_db()
+                self.assertEqual((invitation.status, invitation.attempts), ("pending", attempt))
+                delays.append(round((invitation.next_attempt_at - start).total_seconds()))
+                # pas encore l'heure : rien n'est renvoyé
+                self.run_worker()
+                invitation.refresh_from_db()
+                self.assertEqual(invitation.attempts, attempt)
+                StudentInvitation.objects.filter(pk=invitation.pk).update(next_attempt_at=timezone.now())
+            process_invitation_import(import_id=str(job.pk))
+        self.assertEqual(delays, [60, 120])
+        invitation.refresh_from_db()
+        self.assertEqual((invitation.status, invitation.attempts), ("failed", 3))
+        self.assertIsNone(invitation.next_attempt_at)
+        self.assertEqual(job.get_report()["failed"], 1)
+
+    def test_expire_invitations_sweeps_in_batches(self):
+        """Verify the sweeper expires every stale open invitation, batch by batch, and nothing else."""
+        job = self.upload(self.student_lines(5)).context["job"]
+        invitations = list(StudentInvitation.objects.order_by("email"))
+        stale = [invitation.pk for invitation in invitations[:3]]
+        StudentInvitation.objects.filter(pk__in=stale).update(expires_at=timezone.now() - timedelta(days=1))
+        invitations[3].mark_used()
+        StudentInvitation.objects.filter(pk=invitations[3].pk).update(expires_at=timezone.now() - timedelta(days=1))
+
+        with CaptureQueriesContext(connection) as queries:
+            call_command("expire_invitations", batch_size=2, stdout=StringIO())
+        updates = [q for q in queries.captured_queries if q["sql"].startswith('UPDATE "accounts_studentinvitation"')]
+        self.assertEqual(len(updates), 2)
+        self.assertEqual(
+            set(StudentInvitation.objects.filter(status=StudentInvitation.Status.EXPIRED).values_list("pk", flat=True)),
+            set(stale),
+        )
+        self.assertEqual(StudentInvitation.objects.get(pk=invitations[3].pk).status, StudentInvitation.Status.USED)
+        self.assertEqual(StudentInvitation.objects.get(pk=invitations[4].pk).status, StudentInvitation.Status.PENDING)
+        job.refresh_from_db()
+        self.assertEqual(job.status, InvitationImport.Status.QUEUED)
+
+    def test_expire_invitations_archives_and_purges_old_rows(self):
+        """Verify only invitations expired beyond the retention are archived, then deleted."""
+        self.upload(self.student_lines(3))
+        old, recent, _open = StudentInvitation.objects.order_by("email")
+        StudentInvitation.objects.filter(pk=old.pk).update(expires_at=timezone.now() - timedelta(days=200))
+        StudentInvitation.objects.filter(pk=recent.pk).update(expires_at=timezone.now() - timedelta(days=2))
+        archive = self.enterContext(tempfile.TemporaryDirectory()) + "/expired.jsonl"
+
+        out = StringIO()
+        call_command("expire_invitations", archive=archive, retention_days=30, stdout=out)
+        self.assertIn("1 invitation(s) archivée(s)", out.getvalue())
+        self.assertFalse(StudentInvitation.objects.filter(pk=old.pk).exists())
+        self.assertEqual(StudentInvitation.objects.get(pk=recent.pk).status, StudentInvitation.Status.EXPIRED)
+        with open(archive, encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual([(row["id"], row["email"]) for row in rows], [(str(old.pk), old.email)])
+
+
+class InvitationUploadFormTest(SimpleTestCase):
+    def test_rows_are_read_with_bounded_memory(self):
+        """Verify iter_rows memory stays at chunk size, not file size."""
+        lines = [f"etudiant{n}@test.com,Alice,Martin,BUT Info,BUT2,2025-2026" for n in range(40_000)]
+        content = (CSV_HEADER + "\n".join(lines)).encode("utf-8")
+        form = InvitationUploadForm(files={"csv_file": SimpleUploadedFile("etudiants.csv", content)})
+        self.assertTrue(form.is_valid(), form.errors)
+
+        tracemalloc.start()
+        try:
+            count = sum(len(chunk) for chunk in form.iter_rows(chunk_size=500))
+            _current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(count, 40_000)
+        # le fichier fait ~2,4 Mo ; toutes les lignes en dicts en prendraient bien plus
+        self.assertLess(peak, len(content) // 2)
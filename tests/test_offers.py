@@ -0,0 +1,556 @@
+import json
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import CompanyProfile, InstitutionProfile, Offer, User
+from offers import cache as search_cache
+from offers.facets import facet_counts, parse_filters
+from offers.pagination import encode_cursor
+from offers.query_parser import parse_duration_months, parse_query
+from offers.views import OffersListView
+
+
+def create_company(name="Acme", email="acme@test.com", country_code="FR", role=User.Role.COMPANY):
+    user = User.objects.create(username=email, email=email, role=role)
+    profile_model = CompanyProfile if role == User.Role.COMPANY else InstitutionProfile
+    profile_model.objects.create(
+        user=user, organisation_name=name, country_code=country_code, is_approved=True
+    )
+    return user
+
+
+class OfferTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        search_cache.get_cache().clear()
+
+
+def create_offer(company, **kwargs):
+    data = {
+        "title": "Stage",
+        "location": "Paris",
+        "duration": "6 mois",
+        "description": "Une offre.",
+    }
+    data.update(kwargs)
+    return Offer.objects.create(company=company, **data)
+
+
+class OfferSearchTest(OfferTestCase):
+    def setUp(self):
+        super().setUp()
+        self.company = create_company("Capgemini", "capgemini@test.com")
+        self.school = create_company(
+            "Université de Limoges", "unilim@test.com", role=User.Role.INSTITUTION
+        )
+
+    def search(self, **params):
+        response = self.client.get(reverse("offers:list"), params)
+        self.assertEqual(response.status_code, 200)
+        return [item["offer"].title for item in response.context["offers"]]
+
+    def test_search_vector_is_filled_on_save(self):
+        """Verify that saving an offer fills its weighted search vector."""
+        offer = create_offer(self.company, title="Développeur Python")
+        offer.refresh_from_db()
+        self.assertIn("python", str(offer.search_vector))
+
+    def test_search_matches_prefix_and_stemming(self):
+        """Verify that word prefixes and French plurals still match."""
+        create_offer(self.company, title="Développeurs web")
+        self.assertEqual(self.search(q="dévelop"), ["Développeurs web"])
+        self.assertEqual(self.search(q="développeur"), ["Développeurs web"])
+
+    def test_search_matches_every_field_of_the_legacy_chain(self):
+        """Verify title, skills, description, contract type and both organisation kinds."""
+        create_offer(self.company, title="Data", skills="Django SQL")
+        create_offer(self.school, title="Recherche", description="Laboratoire de robotique")
+        create_offer(self.company, title="Apprenti", contract_type=Offer.ContractType.ALTERNANCE)
+        self.assertEqual(self.search(q="django"), ["Data"])
+        self.assertEqual(self.search(q="robotique"), ["Recherche"])
+        self.assertEqual(self.search(q="alternance"), ["Apprenti"])
+        self.assertEqual(self.search(q="limoges"), ["Recherche"])
+        self.assertEqual(sorted(self.search(q="capgemini")), ["Apprenti", "Data"])
+
+    def test_search_matches_inside_words_like_the_legacy_chain(self):
+        """Verify mid-word matches in title, skills and organisation, but not in the description."""
+        create_offer(self.company, title="Développeur JavaScript")
+        create_offer(self.company, title="Intégrateur", skills="TypeScript, CSS")
+        create_offer(self.company, title="Support", description="Outils en JavaScript")
+        self.assertEqual(sorted(self.search(q="script")), ["Développeur JavaScript", "Intégrateur"])
+        self.assertEqual(sorted(self.search(q="gemini")), ["Développeur JavaScript", "Intégrateur", "Support"])
+
+    def test_search_ignores_case_and_accents(self):
+        """Verify queries with or without accents find the same offers."""
+        create_offer(self.company, title="Ingénieur Sécurité")
+        self.assertEqual(self.search(q="ingenieur securite"), ["Ingénieur Sécurité"])
+        self.assertEqual(self.search(q="INGÉNIEUR"), ["Ingénieur Sécurité"])
+
+    def test_search_ranks_title_above_description(self):
+        """Verify ts_rank ordering follows the field weights."""
+        create_offer(self.company, title="Stage comptable", description="Python requis")
+        create_offer(self.company, title="Stage Python")
+        self.assertEqual(self.search(q="python"), ["Stage Python", "Stage comptable"])
+
+    def test_stopword_only_query_matches_the_phrase(self):
+        """Verify that a query of French stopwords falls back to a plain match."""
+        create_offer(self.company, title="Chargé de communication")
+        create_offer(self.company, title="Comptable")
+        self.assertEqual(self.search(q="de"), ["Chargé de communication"])
+        self.assertEqual(self.search(q="De la"), [])
+
+    def test_unrelated_profile_change_does_not_touch_offers(self):
+        """Verify that only a new name or country re-indexes the organisation's offers."""
+        create_offer(self.company, title="Consultant")
+        profile = CompanyProfile.objects.get(user=self.company)
+        profile.description = "Nouvelle description"
+        with CaptureQueriesContext(connection) as queries:
+            profile.save()
+        self.assertFalse(any('"accounts_offer"' in query["sql"] for query in queries))
+        profile.organisation_name = "Sopra Steria"
+        with CaptureQueriesContext(connection) as queries:
+            profile.save()
+        self.assertTrue(any('"accounts_offer"' in query["sql"] for query in queries))
+
+    def test_organisation_rename_refreshes_vectors(self):
+        """Verify that renaming an organisation updates the vectors of its offers."""
+        create_offer(self.company, title="Consultant")
+        profile = self.company.company_profile
+        profile.organisation_name = "Sopra Steria"
+        profile.save()
+        self.assertEqual(self.search(q="sopra"), ["Consultant"])
+        self.assertEqual(self.search(q="capgemini"), [])
+
+
+class OfferLocationSearchTest(OfferTestCase):
+    def setUp(self):
+        super().setUp()
+        self.german = create_company("Siemens", "siemens@test.com", country_code="DE")
+        self.french = create_company("Thales", "thales@test.com", country_code="FR")
+
+    def search(self, location):
+        response = self.client.get(reverse("offers:list"), {"location": location})
+        return sorted(item["offer"].title for item in response.context["offers"])
+
+    def test_location_matches_offer_location_and_country_aliases(self):
+        """Verify that the city and every country alias are stored on the offer."""
+        create_offer(self.german, title="Munich", location="München")
+        create_offer(self.french, title="Lyon", location="Lyon")
+        self.assertEqual(self.search("allemagne"), ["Munich"])
+        self.assertEqual(self.search("Germany"), ["Munich"])
+        self.assertEqual(self.search("lyon france"), ["Lyon"])
+        self.assertEqual(self.search("lyon allemagne"), [])
+
+    def test_country_change_refreshes_offers(self):
+        """Verify that changing the organisation country re-indexes its offers."""
+        create_offer(self.french, title="Lyon", location="Lyon")
+        profile = self.french.company_profile
+        profile.country_code = "AE"
+        profile.save()
+        self.assertEqual(self.search("dubai"), ["Lyon"])
+        self.assertEqual(self.search("france"), [])
+
+    def test_location_ignores_case_and_accents(self):
+        """Verify that "emirats" and "ÉMIRATS" both match the "émirats" alias."""
+        dubai = create_company("Emaar", "emaar@test.com", country_code="AE")
+        create_offer(dubai, title="Dubai", location="Dubaï Marina")
+        self.assertEqual(self.search("emirats"), ["Dubai"])
+        self.assertEqual(self.search("ÉMIRATS"), ["Dubai"])
+        self.assertEqual(self.search("dubai marina"), ["Dubai"])
+
+    def test_location_tokens_are_stored_lowercase(self):
+        """Verify that the searchable location is computed once, at save time."""
+        offer = create_offer(self.german, location="Berlin")
+        offer.refresh_from_db()
+        self.assertTrue(offer.location_search.startswith("berlin "))
+        self.assertIn("allemagne", offer.location_search)
+
+
+@override_settings(OFFERS_PAGE_SIZE=2)
+class OfferPaginationTest(OfferTestCase):
+    def setUp(self):
+        super().setUp()
+        self.company = create_company()
+        self.offers = [create_offer(self.company, title=f"Offre {index}") for index in range(5)]
+
+    def test_first_page_and_cursor(self):
+        """Verify that only one page is rendered, with an exact count and a cursor."""
+        response = self.client.get(reverse("offers:list"))
+        titles = [item["offer"].title for item in response.context["offers"]]
+        self.assertEqual(titles, ["Offre 4", "Offre 3"])
+        self.assertEqual(response.context["count"], 5)
+        self.assertFalse(response.context["count_is_estimate"])
+        self.assertIn("after=", response.context["next_querystring"])
+
+    def test_load_more_walks_every_offer_once(self):
+        """Verify that following the cursors returns every offer exactly once."""
+        url = reverse("offers:list")
+        titles = []
+        querystring = ""
+        while True:
+            response = self.client.get(f"{url}?{querystring}")
+            titles += [item["offer"].title for item in response.context["offers"]]
+            querystring = response.context["next_querystring"]
+            if not querystring:
+                break
+            url = reverse("offers:list_more")
+        self.assertEqual(titles, [f"Offre {index}" for index in range(4, -1, -1)])
+
+    def test_load_more_keeps_search_params(self):
+        """Verify that the fragment endpoint paginates within the ranked search."""
+        response = self.client.get(reverse("offers:list"), {"q": "offre"})
+        querystring = response.context["next_querystring"]
+        self.assertIn("q=offre", querystring)
+        response = self.client.get(f"{reverse('offers:list_more')}?{querystring}")
+        self.assertTemplateUsed(response, "offers/partials/offer_cards.html")
+        self.assertNotIn("count", response.context)
+        self.assertEqual(len(response.context["offers"]), 2)
+
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        """Verify that a tampered cursor is ignored instead of raising."""
+        response = self.client.get(reverse("offers:list"), {"after": "not-a-cursor"})
+        self.assertEqual(len(response.context["offers"]), 2)
+
+    def test_cursor_with_unparsable_values_falls_back_to_first_page(self):
+        """Verify that well-formed cursors with bad values do not reach the query."""
+        for values in (["x", "y"], ["x", "y", "z"], ["2026-01-01T00:00:00", str(self.offers[0].pk)]):
+            with self.subTest(values=values):
+                response = self.client.get(reverse("offers:list"), {"after": encode_cursor(values)})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.context["offers"]), 2)
+        response = self.client.get(
+            reverse("offers:list"), {"q": "offre", "after": encode_cursor(["nan", "x", "y"])}
+        )
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(OFFERS_EXACT_COUNT_LIMIT=3)
+    def test_large_sets_use_an_estimate(self):
+        """Verify that counting stops at the limit and switches to the planner estimate."""
+        response = self.client.get(reverse("offers:list"))
+        self.assertTrue(response.context["count_is_estimate"])
+        self.assertGreater(response.context["count"], 3)
+
+
+class OfferCardQueryTest(OfferTestCase):
+    def setUp(self):
+        super().setUp()
+        self.company = create_company("Acme", "acme@test.com")
+        self.school = create_company("IUT", "iut@test.com", role=User.Role.INSTITUTION)
+
+    def count_list_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("offers:list"))
+        return len(queries), response
+
+    def test_list_query_count_is_constant(self):
+        """Verify that cards need no per-offer profile lookups."""
+        create_offer(self.company)
+        baseline, _ = self.count_list_queries()
+        for index in range(6):
+            create_offer(self.company if index % 2 else self.school, title=f"Offre {index}")
+        with self.assertNumQueries(baseline):
+            response = self.client.get(reverse("offers:list"))
+        names = {item["company_name"] for item in response.context["offers"]}
+        self.assertEqual(names, {"Acme", "IUT"})
+
+    def test_cards_do_not_load_description(self):
+        """Verify that the 10 000-char description stays deferred."""
+        create_offer(self.company, description="x" * 10000)
+        _, response = self.count_list_queries()
+        offer = response.context["offers"][0]["offer"]
+        self.assertIn("description", offer.get_deferred_fields())
+
+    def test_public_detail_is_one_query(self):
+        """Verify that the detail page fetches the offer and its profile together."""
+        offer = create_offer(self.school)
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("offers:detail_public", args=[offer.pk]))
+        self.assertEqual(response.context["company"].organisation_name, "IUT")
+
+    def test_my_offers_query_count_is_constant(self):
+        """Verify that the "Mes offres" tab renders without N+1 lookups."""
+        self.client.force_login(self.company)
+        create_offer(self.company)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse("profiles:tab_offers"))
+        for index in range(5):
+            create_offer(self.company, title=f"Offre {index}")
+        with self.assertNumQueries(len(queries)):
+            response = self.client.get(reverse("profiles:tab_offers"))
+        self.assertContains(response, "Acme", count=6)
+
+
+class OfferSearchCacheTest(OfferTestCase):
+    def setUp(self):
+        super().setUp()
+        self.company = create_company()
+        create_offer(self.company, title="Développeur Python")
+
+    def list_titles(self, **params):
+        response = self.client.get(reverse("offers:list"), params)
+        return [item["offer"].title for item in response.context["offers"]]
+
+    def test_repeated_search_skips_the_search_queries(self):
+        """Verify that a cache hit only reloads the cards by primary key."""
+        with CaptureQueriesContext(connection) as miss:
+            self.list_titles(q="python")
+        with CaptureQueriesContext(connection) as hit:
+            titles = self.list_titles(q="  PYTHON ")
+        self.assertEqual(titles, ["Développeur Python"])
+        self.assertEqual(len(hit), 1)
+        self.assertLess(len(hit), len(miss))
+        self.assertEqual(search_cache.get_stats()["hits"], 1)
+        self.assertEqual(search_cache.get_stats()["misses"], 1)
+
+    def test_offer_creation_invalidates(self):
+        """Verify that a new offer shows up despite the cached bare list."""
+        self.assertEqual(self.list_titles(), ["Développeur Python"])
+        create_offer(self.company, title="Data analyst")
+        self.assertEqual(self.list_titles(), ["Data analyst", "Développeur Python"])
+
+    def test_write_during_search_is_not_served_afterwards(self):
+        """Verify that a page computed while an offer is saved is cached under the old generation."""
+        search = OffersListView._search
+
+        def search_then_write(view, *args):
+            page = search(view, *args)
+            create_offer(self.company, title="Data analyst")
+            return page
+
+        with mock.patch.object(OffersListView, "_search", search_then_write):
+            self.assertEqual(self.list_titles(), ["Développeur Python"])
+        self.assertEqual(self.list_titles(), ["Data analyst", "Développeur Python"])
+
+    def test_offer_edit_through_view_invalidates(self):
+        """Verify that EditOfferView changes are visible on the next search."""
+        offer = Offer.objects.get()
+        self.assertEqual(self.list_titles(q="python"), ["Développeur Python"])
+        self.client.force_login(self.company)
+        self.client.post(reverse("offers:edit", args=[offer.pk]), {
+            "title": "Développeur Rust",
+            "contract_type": Offer.ContractType.STAGE,
+            "location": "Paris",
+            "duration": "6 mois",
+            "description": "Une offre.",
+        })
+        self.assertEqual(self.list_titles(q="python"), [])
+
+    def test_organisation_change_invalidates(self):
+        """Verify that renaming the organisation invalidates cached searches."""
+        self.assertEqual(self.list_titles(q="acme"), ["Développeur Python"])
+        profile = self.company.company_profile
+        profile.organisation_name = "Globex"
+        profile.save()
+        self.assertEqual(self.list_titles(q="acme"), [])
+
+    def test_stats_endpoint_is_staff_only(self):
+        """Verify that hit/miss counters are exposed to staff only."""
+        self.list_titles()
+        self.assertEqual(self.client.get(reverse("offers:cache_stats")).status_code, 404)
+        staff = User.objects.create(username="staff", email="staff@test.com", is_staff=True)
+        self.client.force_login(staff)
+        response = self.client.get(reverse("offers:cache_stats"))
+        self.assertEqual(response.json()["misses"], 1)
+
+
+class OfferFacetTest(OfferTestCase):
+    def setUp(self):
+        super().setUp()
+        self.french = create_company("Thales", "thales@test.com", country_code="FR")
+        self.german = create_company("Siemens", "siemens@test.com", country_code="DE")
+        create_offer(self.french, title="Stage Paris")
+        create_offer(self.french, title="Alternance Lyon", contract_type=Offer.ContractType.ALTERNANCE, remote=True)
+        create_offer(self.german, title="Stage Berlin", remote=True)
+        old = create_offer(self.german, title="Ancienne offre")
+        Offer.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=60))
+
+    def get(self, **params):
+        return self.client.get(reverse("offers:list"), params).context
+
+    def titles(self, **params):
+        return sorted(item["offer"].title for item in self.get(**params)["offers"])
+
+    def test_filters_are_applied(self):
+        """Verify each filter narrows the list through the querystring."""
+        self.assertEqual(self.titles(contract="alternance"), ["Alternance Lyon"])
+        self.assertEqual(self.titles(remote="1"), ["Alternance Lyon", "Stage Berlin"])
+        self.assertEqual(self.titles(country="de", recency="30"), ["Stage Berlin"])
+        self.assertEqual(self.get(contract="cdi")["filters"]["contract"], "")
+
+    def test_facet_counts(self):
+        """Verify the counts, each ignoring its own filter but not the others."""
+        facets = self.get(country="FR")["facets"]
+        self.assertEqual(facets["contract"], [("stage", "Stage", 1), ("alternance", "Alternance", 1)])
+        self.assertEqual(facets["remote"], 1)
+        self.assertEqual([total for _, _, total in facets["recency"]], [2, 2, 2])
+        countries = {code: total for code, _, total in facets["country"]}
+        self.assertEqual(countries, {"FR": 2, "DE": 2})
+
+    def test_facet_counts_take_one_query(self):
+        """Verify all facets are computed by a single aggregate query."""
+        now = timezone.now()
+        filters = parse_filters({"contract": "stage", "remote": "1"})
+        with self.assertNumQueries(1):
+            facets = facet_counts(Offer.objects.all(), filters, now)
+        self.assertEqual(dict((code, total) for code, _, total in facets["country"]), {"DE": 1})
+
+
+class OfferQueryParserTest(OfferTestCase):
+    def test_parse_placeholder_example(self):
+        """Verify the example shown in the search box is fully understood."""
+        parsed = parse_query("Développeur web - Allemagne - 6 mois")
+        self.assertEqual(parsed, {
+            "text": "developpeur web",
+            "countries": ["DE"],
+            "country_hints": [],
+            "contract": "",
+            "duration_months": 6,
+        })
+
+    def test_parse_contract_aliases_and_multiword_countries(self):
+        """Verify keyword synonyms, hyphenated country names and years."""
+        parsed = parse_query("Alternance data au Royaume-Uni 1 an")
+        self.assertEqual(parsed["contract"], Offer.ContractType.ALTERNANCE)
+        self.assertEqual(parsed["countries"], ["GB"])
+        self.assertEqual(parsed["duration_months"], 12)
+        self.assertEqual(parsed["text"], "data")
+
+    def test_country_codes_are_not_matched_in_free_text(self):
+        """Verify that French words such as "de" are not read as country codes."""
+        parsed = parse_query("stage de comptabilité")
+        self.assertEqual(parsed["countries"], [])
+        self.assertEqual(parsed["text"], "de comptabilite")
+
+    def test_country_words_in_free_text_are_only_hints(self):
+        """Verify that country names outside a location phrase stay search text."""
+        for query, text, hint in [
+            ("réunion client", "reunion client", "RE"),
+            ("Maurice Dupont", "maurice dupont", "MU"),
+            ("georgia tech", "georgia tech", "GE"),
+            ("canada dry", "canada dry", "CA"),
+            ("jersey bleu", "jersey bleu", "JE"),
+            ("panama papers", "panama papers", "PA"),
+        ]:
+            with self.subTest(query=query):
+                parsed = parse_query(query)
+                self.assertEqual(parsed["countries"], [])
+                self.assertEqual(parsed["country_hints"], [hint])
+                self.assertEqual(parsed["text"], text)
+
+    def test_country_after_a_preposition_or_alone_is_a_filter(self):
+        """Verify "en Allemagne", "à Maurice" and a bare country name are locations."""
+        self.assertEqual(parse_query("stage en Allemagne")["countries"], ["DE"])
+        self.assertEqual(parse_query("comptable à Maurice")["countries"], ["MU"])
+        self.assertEqual(parse_query("Canada")["countries"], ["CA"])
+        self.assertEqual(parse_query("Canada")["text"], "")
+
+    def test_parse_duration_months(self):
+        """Verify weeks and years are converted to months."""
+        self.assertEqual(parse_duration_months("6 mois"), 6)
+        self.assertEqual(parse_duration_months("12 semaines"), 3)
+        self.assertEqual(parse_duration_months("2 ans"), 24)
+        self.assertIsNone(parse_duration_months("à définir"))
+
+    def test_structured_search_uses_filters(self):
+        """Verify the parsed parts filter the list and only the rest is text-searched."""
+        german = create_company("Siemens", "siemens@test.com", country_code="DE")
+        french = create_company("Thales", "thales@test.com", country_code="FR")
+        create_offer(german, title="Développeur web", location="Berlin, Allemagne", duration="6 mois")
+        create_offer(german, title="Développeur web junior", location="Berlin, Allemagne", duration="3 mois")
+        create_offer(french, title="Développeur web", location="Paris", duration="6 mois")
+        response = self.client.get(reverse("offers:list"), {"q": "Développeur web - Allemagne - 6 mois"})
+        offers = [item["offer"] for item in response.context["offers"]]
+        self.assertEqual(len(offers), 1)
+        self.assertEqual(offers[0].company_id, german.pk)
+        self.assertEqual(Offer.objects.get(pk=offers[0].pk).duration_months, 6)
+
+    def test_country_filter_uses_the_offer_location(self):
+        """Verify a country in the query matches where the offer is, not the organisation."""
+        german = create_company("Siemens", "siemens@test.com", country_code="DE")
+        french = create_company("Thales", "thales@test.com", country_code="FR")
+        create_offer(french, title="Munich", location="München, Germany")
+        create_offer(german, title="Paris", location="Paris, France")
+        response = self.client.get(reverse("offers:list"), {"q": "stage en Allemagne"})
+        self.assertEqual([item["offer"].title for item in response.context["offers"]], ["Munich"])
+
+    def test_country_hint_ranks_offers_in_that_country_first(self):
+        """Verify an incidental country name keeps matching text and only boosts ranking."""
+        company = create_company("Acme", "acme@test.com")
+        create_offer(company, title="Chef de projet Canada", location="Montréal, Canada")
+        create_offer(company, title="Chef de projet Canada", location="Paris")
+        response = self.client.get(reverse("offers:list"), {"q": "projet canada"})
+        offers = [item["offer"].location for item in response.context["offers"]]
+        self.assertEqual(offers, ["Montréal, Canada", "Paris"])
+
+
+class OfferFuzzySearchTest(OfferTestCase):
+    def setUp(self):
+        super().setUp()
+        self.company = create_company("Capgemini", "capgemini@test.com")
+        create_offer(self.company, title="Développeur Python", skills="Django")
+        create_offer(self.company, title="Comptable")
+
+    def search(self, **params):
+        return self.client.get(reverse("offers:list"), params).context
+
+    def test_typo_in_skill_falls_back_to_trigrams(self):
+        """Verify that "pyhton" finds the Python offer through similarity."""
+        context = self.search(q="pyhton")
+        self.assertTrue(context["fuzzy"])
+        self.assertEqual([item["offer"].title for item in context["offers"]], ["Développeur Python"])
+
+    def test_typo_in_organisation_name(self):
+        """Verify that a misspelled organisation name finds its offers."""
+        context = self.search(q="Capgemeni")
+        self.assertTrue(context["fuzzy"])
+        self.assertEqual(context["count"], 2)
+
+    def test_exact_results_skip_fuzzy_mode(self):
+        """Verify the common path stays on the full-text index."""
+        create_offer(self.company, title="Python junior")
+        create_offer(self.company, title="Python senior")
+        context = self.search(q="python")
+        self.assertFalse(context["fuzzy"])
+        self.assertEqual(context["count"], 3)
+
+    @override_settings(OFFERS_PAGE_SIZE=1)
+    def test_fuzzy_mode_is_kept_when_loading_more(self):
+        """Verify the next page cursor stays in fuzzy mode."""
+        create_offer(self.company, title="Data analyst Pyton")
+        context = self.search(q="pyhton")
+        self.assertIn("fuzzy=1", context["next_querystring"])
+        response = self.client.get(f"{reverse('offers:list_more')}?{context['next_querystring']}")
+        self.assertTrue(response.context["fuzzy"])
+        self.assertEqual(len(response.context["offers"]), 1)
+
+
+class OfferBenchmarkCommandTest(OfferTestCase):
+    def test_benchmark_reports_every_strategy_and_rolls_back(self):
+        """Verify the benchmark writes a JSON report and leaves no seeded offer."""
+        output = StringIO()
+        call_command("benchmark_search", sizes="60", repeat=2, stdout=output, stderr=StringIO())
+        report = json.loads(output.getvalue())
+        results = report["sizes"]["60"]
+        self.assertEqual(set(results), {"database", "database_cached", "fuzzy", "more"})
+        for query in ("bare", "q", "location", "q_location", "no_hit"):
+            self.assertEqual(
+                set(results["database"][query]), {"p50_ms", "p95_ms", "queries", "peak_kib"}
+            )
+        # « Voir plus » ne compte ni les résultats ni les facettes
+        self.assertLess(results["more"]["q"]["queries"], results["database"]["q"]["queries"])
+        self.assertFalse(Offer.objects.exists())
+        self.assertFalse(User.objects.exists())
+
+    def test_benchmark_leaves_the_offers_cache_alone(self):
+        """Verify the benchmark runs on a private cache instead of clearing the real one."""
+        search_cache.get_cache().set("sentinel", 1)
+        call_command("benchmark_search", sizes="20", repeat=1, stdout=StringIO(), stderr=StringIO())
+        self.assertEqual(search_cache.get_cache().get("sentinel"), 1)